@@ -3,14 +3,16 @@ Example usage for sec_company_lookup package.
 Demonstrates basic lookups, search, batch operations, and cache info.
 """
 
-from typing import Dict, Any, cast
+from typing import Dict, Any, List, cast
 from sec_company_lookup import (
     set_user_email,
     get_company,
+    get_companies,
     get_companies_by_tickers,
     get_companies_by_ciks,
     get_companies_by_names,
     search_companies,
+    search_companies_multi,
     search_companies_by_ticker,
     search_companies_by_company_name,
     update_data,
@@ -56,6 +58,17 @@ companies = get_company("Microsoft Corporation")  # Name
 # BATCH LOOKUPS
 # ============================================================================
 
+# Smart batch lookup - auto-detects each input (returns Dict[input, List[CompanyData]])
+# Prefer this over calling get_company() in a loop: results match get_company(),
+# but CIKs and tickers are each resolved with a single batch query.
+smart_results = get_companies(["AAPL", 789019, "Alphabet Inc.", "INVALID"])
+# Returns: {
+#   "AAPL": [{'cik': 320193, 'ticker': 'AAPL', 'name': 'Apple Inc.'}],
+#   789019: [{'cik': 789019, 'ticker': 'MSFT', 'name': 'MICROSOFT CORP'}],
+#   "Alphabet Inc.": [{'cik': 1652044, 'ticker': 'GOOGL', 'name': 'Alphabet Inc.'}],
+#   "INVALID": []
+# }
+
 # Batch ticker lookup (returns Dict[str, BatchLookupResponse])
 batch_results = get_companies_by_tickers(["AAPL", "MSFT", "GOOGL", "INVALID"])
 # Returns: {
@@ -86,6 +99,19 @@ batch_results_cik = get_companies_by_ciks([320193, 789019, 1652044])
 #   1652044: {"success": True, "data": [{'cik': 1652044, 'ticker': 'GOOGL', 'name': 'Alphabet Inc.'}]}
 # }
 
+# Process batch CIK results - for several CIKs, one batch call like this is
+# preferred over calling get_companies_by_ciks(cik) in a loop
+if isinstance(batch_results_cik, dict):
+    for cik, response in batch_results_cik.items():
+        response_dict = cast(Dict[str, Any], response)
+        if response_dict["success"]:
+            filers = cast(List[CompanyData], response_dict.get("data"))
+            # Process every company registered under the CIK: filers[0]['name'], ...
+            pass
+        else:
+            # Handle error: response_dict['error'], response_dict['error_code']
+            pass
+
 # Batch name lookup (returns Dict[str, BatchLookupResponse])
 # Note: Returns single best match per name (same structure as ticker batch lookup)
 batch_results_names = get_companies_by_names(["Apple Inc.", "Microsoft Corporation"])
@@ -127,6 +153,10 @@ results = search_companies_by_company_name("Micros", limit=5, fuzzy=True)
 # Exact search (no fuzzy matching)
 results = search_companies_by_company_name("Apple Inc.", fuzzy=False)
 
+# Several searches at once (instead of calling search_companies in a loop)
+sector_results = search_companies_multi(["bank", "energy", "software"], limit=3)
+# Returns: {'bank': [...], 'energy': [...], 'software': [...]}
+
 
 # ============================================================================
 # CACHE MANAGEMENT
@@ -135,17 +165,30 @@ results = search_companies_by_company_name("Apple Inc.", fuzzy=False)
 # Get cache information
 cache_info = get_cache_info()
 # Returns: {
-#   'memory_cache_loaded': True,
-#   'memory_companies_count': 13000,
-#   'last_update_human': '2024-10-30 12:00:00',
+#   'companies_cached': 13000,
+#   'last_update': 1730289600.0,
 #   'cache_age_hours': 0.5,
 #   'cache_expired': False,
 #   'db_exists': True,
 #   'db_companies_count': 13000,
-#   'cache_dir': '/path/to/.sec_company_lookup'
+#   'cache_dir': '/path/to/.sec_company_lookup',
+#   'lookup_caches': {
+#     'name': {'hits': 950, 'misses': 50, 'hit_rate': 0.95, 'entries': 50,
+#              'protected_entries': 40, 'bytes': 41000, 'max_bytes': 8388608,
+#              'negative': {'hits': 3, 'misses': 50, 'hit_rate': 0.06, 'entries': 2}},
+#   },
+#   'search_scans': {'column': 12, 'name_buffer': 10},
+#   ...
 # }
 
-# Manually update data from SEC API (optional, auto-updates on import)
+# Print lookup cache metrics (useful when tuning SECCOMPANYLOOKUP_CACHE_MB)
+for cache_name, stats in cache_info["lookup_caches"].items():
+    print(
+        f"{cache_name}: hit rate {stats['hit_rate']:.0%}, "
+        f"{stats['entries']} entries, {stats['bytes']} / {stats['max_bytes']} bytes"
+    )
+
+# Manually update data from SEC API (optional, data is loaded on first lookup)
 success = update_data()
 
 # Clear all cache (forces re-download on next lookup)
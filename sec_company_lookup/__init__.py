@@ -22,10 +22,12 @@ Alternative configuration via environment variable:
 
 from .api.api import (
     get_company,
+    get_companies,
     get_companies_by_tickers,
     get_companies_by_ciks,
     get_companies_by_names,
     search_companies,
+    search_companies_multi,
     search_companies_by_ticker,
     search_companies_by_company_name,
     update_data,
@@ -50,10 +52,12 @@ __email__ = "jpnewman167@gmail.com"
 __all__ = [
     # Main lookup functions
     "get_company",
+    "get_companies",
     "get_companies_by_tickers",
     "get_companies_by_ciks",
     "get_companies_by_names",
     "search_companies",
+    "search_companies_multi",
     "search_companies_by_ticker",
     "search_companies_by_company_name",
     # Data management
@@ -69,43 +73,3 @@ __all__ = [
     "SECCompanyInfo",
     "CacheStructure",
 ]
-
-
-# Auto-initialize data on import
-def _auto_initialize() -> None:
-    """Automatically ensure data is available on package import."""
-    import logging
-    from .utils import load_from_cache, is_cache_expired
-
-    logger = logging.getLogger(__name__)
-
-    try:
-        # Check if we have cached data and if it's still valid
-        cached_data, cached_timestamp = load_from_cache()
-
-        if not cached_data or is_cache_expired(cached_timestamp):
-            logger.info(
-                "No cached data found or cache expired. "
-                "Downloading latest SEC data..."
-            )
-            # Only update if we don't have data or it's expired
-            success = update_data()
-            if success:
-                logger.info("SEC data successfully downloaded and cached.")
-            else:
-                logger.warning(
-                    "Failed to download SEC data. " "Some functionality may be limited."
-                )
-        else:
-            logger.debug("Using existing cached SEC data.")
-
-    except Exception as e:
-        # Don't fail the import if data download fails
-        logger.warning(
-            f"Failed to auto-initialize SEC data: {e}. "
-            "You may need to call update_data() manually."
-        )
-
-
-# Run auto-initialization
-_auto_initialize()
@@ -4,10 +4,12 @@ API module for sec-company-lookup.
 
 from .api import (
     get_company,
+    get_companies,
     get_companies_by_tickers,
     get_companies_by_ciks,
     get_companies_by_names,
     search_companies,
+    search_companies_multi,
     search_companies_by_ticker,
     search_companies_by_company_name,
     update_data,
@@ -17,10 +19,12 @@ from .api import (
 
 __all__ = [
     "get_company",
+    "get_companies",
     "get_companies_by_tickers",
     "get_companies_by_ciks",
     "get_companies_by_names",
     "search_companies",
+    "search_companies_multi",
     "search_companies_by_ticker",
     "search_companies_by_company_name",
     "update_data",
@@ -5,8 +5,10 @@ This module provides the public API for company lookups, delegating to the
 backend for data management and caching.
 """
 
-from typing import Dict, List, Optional, Union, Any, Sequence
+from typing import Callable, Dict, List, Optional, Tuple, Union, Any, Sequence
 import logging
+import re
+import time
 
 from ..types import (
     CompanyData,
@@ -14,14 +16,15 @@ from ..types import (
     MultipleLookupResponse,
 )
 from ..sec_company_lookup import (
-    get_company_by_ticker_single,
-    get_company_by_cik_single,
+    find_company_by_ticker,
+    find_companies_by_cik,
     get_company_by_name_single,
     ensure_data_loaded,
     get_companies_by_tickers_batch,
     get_companies_by_ciks_batch,
     get_companies_by_names_batch,
     search_companies_impl,
+    search_companies_multi_impl,
     search_companies_by_company_name_impl,
     update_data_impl,
     clear_cache_impl,
@@ -30,6 +33,20 @@ from ..sec_company_lookup import (
 
 logger = logging.getLogger(__name__)
 
+# Short-lived memo for get_cache_info(); values only change on update/clear
+_CACHE_INFO_TTL_SECONDS = 1.0
+_cache_info_cache: Dict[str, Any] = {"t": 0.0, "v": None}
+
+# Inputs up to this length without spaces are tried as tickers first
+_TICKER_MAX_LENGTH = 5
+
+# Classifies an identifier in one pass: group 1 is a CIK (digits), group 2 a
+# ticker-shaped token, group 3 anything else (a company name). Surrounding
+# whitespace is excluded from the groups; whitespace-only input does not match.
+_IDENT_RE = re.compile(
+    rf"\s*(?:(\d+)|(\S{{1,{_TICKER_MAX_LENGTH}}})|(\S.*?))\s*", re.DOTALL
+)
+
 
 def get_companies_by_tickers(
     ticker: Union[str, Sequence[str]],
@@ -38,14 +55,15 @@ def get_companies_by_tickers(
     Look up company information by ticker symbol(s).
 
     Supports both single and batch lookups:
-    - Single ticker: Uses memory cache with LRU (fast), returns CompanyData or None
-    - Multiple tickers: Uses database (efficient for batches), returns structured responses
+    - Single ticker: Uses memory cache (fast), returns CompanyData or None
+    - Multiple tickers: Uses the memory cache index, returns structured responses
 
     Args:
         ticker: Single ticker string or sequence of ticker strings
 
     Returns:
-        For single ticker: CompanyData or None
+        For single ticker: CompanyData or None (shared with the cache and
+            read-only; copy with dict() before modifying)
         For multiple tickers: Dict mapping each ticker to BatchLookupResponse
             {
                 "success": bool,
@@ -66,13 +84,12 @@ def get_companies_by_tickers(
         >>> #   "INVALID": {"success": False, "error": "Ticker 'INVALID' not found", "error_code": "NOT_FOUND"}
         >>> # }
     """
-    # Batch input - route directly to database
+    # Batch input - resolve every ticker against the memory index
     if not isinstance(ticker, str):
         return get_companies_by_tickers_batch(ticker)
 
-    # Single ticker lookup - use LRU cached function, unwrap structured response
-    response = get_company_by_ticker_single(ticker)
-    return response.get("data") if response["success"] else None
+    # Single ticker lookup - return the shared row directly from memory
+    return find_company_by_ticker(ticker)
 
 
 def get_companies_by_ciks(
@@ -82,14 +99,16 @@ def get_companies_by_ciks(
     Look up company information by CIK identifier(s).
 
     Supports both single and batch lookups:
-    - Single CIK: Uses memory cache with LRU (fast), returns list of CompanyData
-    - Multiple CIKs: Uses database (efficient for batches), returns structured responses
+    - Single CIK: Uses memory cache (fast), returns list of CompanyData
+    - Multiple CIKs: Uses the memory cache index, returns structured responses
 
     Args:
         cik: Single CIK (int or string) or sequence of CIKs
 
     Returns:
-        For single CIK: List of CompanyData (CIKs can have multiple tickers)
+        For single CIK: List of CompanyData (CIKs can have multiple tickers; the
+            dicts are shared with the cache and read-only, copy with dict()
+            before modifying)
         For multiple CIKs: Dict mapping each CIK to MultipleLookupResponse
             {
                 "success": bool,
@@ -110,13 +129,12 @@ def get_companies_by_ciks(
         >>> #   "invalid": {"success": False, "error": "Invalid CIK: 'invalid' could not be normalized", "error_code": "INVALID_INPUT"}
         >>> # }
     """
-    # Batch input - route directly to database
+    # Batch input - resolve every CIK against the memory index
     if not isinstance(cik, (int, str)):
         return get_companies_by_ciks_batch(cik)
 
-    # Single CIK lookup - use LRU cached function, unwrap structured response
-    response = get_company_by_cik_single(cik)
-    return response.get("data", []) if response["success"] else []
+    # Single CIK lookup - return the shared rows directly from memory
+    return find_companies_by_cik(cik)
 
 
 def get_companies_by_names(
@@ -195,6 +213,79 @@ def search_companies_by_ticker(
     return search_companies_impl(ticker_query, limit, fuzzy)
 
 
+def _classify(identifier: str) -> Optional[Tuple[str, str]]:
+    """
+    Classify an identifier as "cik", "ticker", or "name".
+
+    Digits are CIKs, short single tokens are tickers, everything else is
+    treated as a company name.
+
+    Returns:
+        Tuple of (kind, stripped identifier), or None for empty/whitespace input
+    """
+    match = _IDENT_RE.fullmatch(identifier)
+    if match is None:
+        return None
+    if match.group(1) is not None:
+        return "cik", match.group(1)
+    if match.group(2) is not None:
+        return "ticker", match.group(2)
+    return "name", match.group(3)
+
+
+def _get_company_by_int(identifier: int) -> List[CompanyData]:
+    """get_company() for integers, which are always CIKs."""
+    return find_companies_by_cik(identifier)
+
+
+def _get_company_by_name(name: str) -> List[CompanyData]:
+    """Fuzzy single-name lookup wrapped as a get_company() result."""
+    response = get_company_by_name_single(name, fuzzy=True)
+    if response["success"] and "data" in response:
+        return [response["data"]]
+    return []
+
+
+def _get_company_by_str(identifier: str) -> List[CompanyData]:
+    """get_company() for strings: classify once, then call the backend finder."""
+    # Empty or whitespace-only strings don't classify
+    classified = _classify(identifier)
+    if classified is None:
+        return []
+    kind, identifier_stripped = classified
+
+    # CIKs are numeric - no point trying ticker or name lookups
+    if kind == "cik":
+        return find_companies_by_cik(identifier_stripped)
+
+    if kind == "ticker":
+        # Ticker-shaped input: exact ticker first, fuzzy name on miss
+        company = find_company_by_ticker(identifier_stripped)
+        if company is not None:
+            return [company]
+        return _get_company_by_name(identifier_stripped)
+
+    # Name-shaped input: fuzzy name first
+    name_result = _get_company_by_name(identifier_stripped)
+    if name_result:
+        return name_result
+
+    # Long single-token input may still be a ticker (e.g. "AAPL-WT")
+    if " " not in identifier_stripped:
+        company = find_company_by_ticker(identifier_stripped)
+        if company is not None:
+            return [company]
+    return []
+
+
+# get_company() handlers keyed on the exact identifier type; one dict probe
+# replaces the isinstance chain for the common int and str inputs
+_GET_COMPANY_BY_TYPE: Dict[type, Callable[[Any], List[CompanyData]]] = {
+    int: _get_company_by_int,
+    str: _get_company_by_str,
+}
+
+
 def get_company(identifier: Any) -> List[CompanyData]:
     """
     Smart lookup that tries to determine the type of identifier.
@@ -209,40 +300,105 @@ def get_company(identifier: Any) -> List[CompanyData]:
     """
     ensure_data_loaded()
 
-    if identifier is None:
-        return []
+    lookup = _GET_COMPANY_BY_TYPE.get(type(identifier))
+    if lookup is not None:
+        return lookup(identifier)
 
-    # Handle integers as CIKs
-    if isinstance(identifier, int):
-        result = get_companies_by_ciks(identifier)
-        return result  # type: ignore[return-value]
+    # Subclasses of int and str (e.g. IntEnum members) use their base handler
+    for base, lookup in _GET_COMPANY_BY_TYPE.items():
+        if isinstance(identifier, base):
+            return lookup(identifier)
+    return []
 
-    # Must be str at this point - check if it's actually a string
-    if not isinstance(identifier, str):
-        return []
 
-    # Check for empty or whitespace-only strings
-    if not identifier.strip():
-        return []
+def get_companies(identifiers: Sequence[Any]) -> Dict[Any, List[CompanyData]]:
+    """
+    Smart batch lookup for a mix of tickers, CIKs, and company names.
 
-    identifier_stripped = identifier.strip()
+    Returns the same result as get_company() for every identifier. CIKs and
+    tickers are resolved with one batch call per group; names use the same
+    in-memory fuzzy match as get_company(), once per unique name.
 
-    # Try CIK first if it's all digits (CIKs are numeric)
-    if identifier_stripped.isdigit():
-        cik_result = get_companies_by_ciks(identifier_stripped)
-        if cik_result:  # type: ignore[truthy-bool]
-            return cik_result  # type: ignore[return-value]
+    Args:
+        identifiers: Sequence of tickers, CIKs, or company names
 
-    # Try ticker second (common case, exact match)
-    ticker_result = get_companies_by_tickers(identifier_stripped)
-    if ticker_result:
-        return [ticker_result]  # type: ignore[list-item]
+    Returns:
+        Dict mapping each identifier (in input order) to a list of matching
+        companies, or an empty list if not found.
 
-    # Finally try company name with fuzzy matching
-    name_result = get_companies_by_names(identifier_stripped, fuzzy=True)
-    if name_result:
-        return [name_result]  # type: ignore[list-item]
-    return []
+    Examples:
+        >>> results = get_companies(["AAPL", 789019, "Alphabet", "INVALID"])
+        >>> # Returns: {
+        >>> #   "AAPL": [{...}],
+        >>> #   789019: [{...}],
+        >>> #   "Alphabet": [{...}],
+        >>> #   "INVALID": []
+        >>> # }
+    """
+    ensure_data_loaded()
+
+    results: Dict[Any, List[CompanyData]] = {}
+    # Each query maps to every original identifier that strips to it
+    cik_inputs: Dict[Union[int, str], List[Any]] = {}  # CIK query
+    ticker_inputs: Dict[str, List[Any]] = {}  # ticker-first query
+    name_inputs: Dict[str, List[Any]] = {}  # name-first query
+
+    # Classify every identifier once, keeping input order in results
+    for identifier in identifiers:
+        results[identifier] = []
+        if isinstance(identifier, int):
+            cik_inputs.setdefault(identifier, []).append(identifier)
+        elif isinstance(identifier, str):
+            classified = _classify(identifier)
+            if classified is None:
+                continue
+            kind, identifier_stripped = classified
+            if kind == "cik":
+                inputs: Dict[Any, List[Any]] = cik_inputs
+            elif kind == "ticker":
+                inputs = ticker_inputs
+            else:
+                inputs = name_inputs
+            inputs.setdefault(identifier_stripped, []).append(identifier)
+
+    if cik_inputs:
+        cik_responses = get_companies_by_ciks_batch(list(cik_inputs))
+        for cik, cik_response in cik_responses.items():
+            if cik_response["success"]:
+                for identifier in cik_inputs[cik]:
+                    results[identifier] = list(cik_response.get("data", []))
+
+    # One ticker query covers ticker-shaped inputs and single-token names
+    ticker_queries = list(ticker_inputs)
+    ticker_queries.extend(n for n in name_inputs if " " not in n)
+    ticker_hits: Dict[str, CompanyData] = {}
+    if ticker_queries:
+        ticker_responses = get_companies_by_tickers_batch(ticker_queries)
+        for ticker, ticker_response in ticker_responses.items():
+            if ticker_response["success"] and "data" in ticker_response:
+                ticker_hits[ticker] = ticker_response["data"]
+
+    # Names and ticker misses use get_company()'s memoized in-memory matcher,
+    # so each unique query resolves exactly as it would on its own
+    name_queries = [t for t in ticker_inputs if t not in ticker_hits]
+    name_queries.extend(name_inputs)
+    name_hits: Dict[str, List[CompanyData]] = {}
+    for name in name_queries:
+        name_result = _get_company_by_name(name)
+        if name_result:
+            name_hits[name] = name_result
+
+    for query, originals in {**ticker_inputs, **name_inputs}.items():
+        if query in name_hits:
+            companies = name_hits[query]
+        elif query in ticker_hits:
+            companies = [ticker_hits[query]]
+        else:
+            continue
+        for identifier in originals:
+            results[identifier] = list(companies)
+
+    return results
 
 
 def search_companies(
@@ -262,6 +418,29 @@ def search_companies(
     return search_companies_impl(query, limit, fuzzy)
 
 
+def search_companies_multi(
+    queries: Sequence[str], limit: int = 10, fuzzy: bool = True
+) -> Dict[str, List[CompanyData]]:
+    """
+    Search for companies matching any of several queries in one call.
+
+    Prefer this over calling search_companies in a loop; duplicate queries are
+    only searched once.
+
+    Args:
+        queries: Sequence of search queries
+        limit: Maximum number of results to return per query
+        fuzzy: If True, perform fuzzy matching; if False, exact matching only
+
+    Returns:
+        Dict mapping each query to its list of matching company dictionaries
+
+    Example:
+        >>> results = search_companies_multi(["bank", "energy", "software"], limit=3)
+    """
+    return search_companies_multi_impl(queries, limit, fuzzy)
+
+
 def search_companies_by_company_name(
     company_name_query: str, limit: int = 10, fuzzy: bool = True
 ) -> List[CompanyData]:
@@ -286,11 +465,13 @@ def update_data() -> bool:
     Returns:
         bool: True if data was successfully updated, False otherwise.
     """
+    _cache_info_cache["v"] = None
     return update_data_impl()
 
 
 def clear_cache() -> None:
     """Clear all cached data including database."""
+    _cache_info_cache["v"] = None
     clear_cache_impl()
 
 
@@ -298,7 +479,18 @@ def get_cache_info() -> Dict[str, Any]:
     """
     Get information about the current cache status.
 
+    Results are memoized for a short TTL so repeated polling does not re-query
+    the database and filesystem; update_data() and clear_cache() invalidate it.
+
     Returns:
         Dict with cache statistics and status.
     """
-    return get_cache_info_impl()
+    now = time.monotonic()
+    cached = _cache_info_cache["v"]
+    if cached is not None and now - _cache_info_cache["t"] < _CACHE_INFO_TTL_SECONDS:
+        return cached  # type: ignore[no-any-return]
+
+    info = get_cache_info_impl()
+    _cache_info_cache["t"] = now
+    _cache_info_cache["v"] = info
+    return info
@@ -0,0 +1,13 @@
+"""Cache module for sec-company-lookup package."""
+
+from .cache import (
+    LRUKCache,
+    TTLCache,
+    estimate_size,
+)
+
+__all__ = [
+    "LRUKCache",
+    "TTLCache",
+    "estimate_size",
+]
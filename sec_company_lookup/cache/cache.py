@@ -0,0 +1,277 @@
+"""
+Lookup result caching for sec-company-lookup package.
+
+This module provides a memory-budgeted LRU-2 cache used to memoize single
+lookups. Entries seen only once live in a probation segment and are evicted
+before entries that have been accessed at least twice, so one-off lookups
+cannot push frequently used entries out of the cache. Negative results (e.g.
+"not found") can be kept in a separate short-lived cache so that repeated
+invalid input stays cheap without competing with real hits for space.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar, cast
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_MISSING = object()
+
+
+def _hit_rate(hits: int, misses: int) -> float:
+    """Fraction of lookups that were hits (0.0 before any lookup)."""
+    total = hits + misses
+    return hits / total if total else 0.0
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory footprint of a cached value in bytes.
+
+    Args:
+        value: Value to measure (dicts, lists and tuples are measured recursively)
+
+    Returns:
+        int: Approximate size in bytes
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for k, v in cast(Dict[Any, Any], value).items():
+            size += estimate_size(k) + estimate_size(v)
+    elif isinstance(value, (list, tuple)):
+        for item in cast(Tuple[Any, ...], value):
+            size += estimate_size(item)
+    return size
+
+
+class TTLCache:
+    """
+    Small cache whose entries expire a fixed time after insertion.
+
+    Bounded by entry count; the oldest entries are dropped first.
+    """
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._hits += 1
+                    return entry[1]
+                del self._entries[key]
+            self._misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Insert or replace a value, dropping the oldest entries over the limit."""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters, hit rate and entry count for this cache."""
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": _hit_rate(self._hits, self._misses),
+            "entries": len(self._entries),
+        }
+
+
+class LRUKCache:
+    """
+    LRU-k (k=2) cache bounded by an approximate memory budget.
+
+    Keys accessed fewer than k times are kept in a probation segment; once a
+    key reaches k accesses it is promoted to the protected segment. Eviction
+    always drains the probation segment (least recently used first) before
+    touching protected entries. The protected segment is capped at
+    protected_ratio of the budget; promotions beyond that demote the least
+    recently used protected entry back to probation, so new keys always have
+    room to earn their second access.
+
+    When is_negative is given, memoized results for which it returns True are
+    stored in a separate TTL cache instead, so they never evict real hits.
+
+    Example:
+        >>> cache = LRUKCache(max_bytes=1024 * 1024, name="ticker")
+        >>> @cache.memoize
+        >>> def lookup(ticker: str) -> dict: ...
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        k: int = 2,
+        name: str = "",
+        protected_ratio: float = 0.8,
+        is_negative: Optional[Callable[[Any], bool]] = None,
+        negative_ttl: float = 60.0,
+        negative_max_entries: int = 1024,
+    ) -> None:
+        self.name = name
+        self.max_bytes = max_bytes
+        self.k = k
+        self.max_protected_bytes = int(max_bytes * protected_ratio)
+        self.is_negative = is_negative
+        self.negative: Optional[TTLCache] = (
+            TTLCache(negative_ttl, negative_max_entries)
+            if is_negative is not None
+            else None
+        )
+        self._probation: "OrderedDict[Hashable, Tuple[Any, int, int]]" = OrderedDict()
+        self._protected: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._protected_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._probation) + len(self._protected)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if absent."""
+        with self._lock:
+            entry = self._protected.get(key)
+            if entry is not None:
+                self._protected.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+
+            probation_entry = self._probation.get(key)
+            if probation_entry is None:
+                self._misses += 1
+                return default
+
+            value, size, accesses = probation_entry
+            accesses += 1
+            if accesses >= self.k:
+                # Promote on the k-th access
+                del self._probation[key]
+                self._protected[key] = (value, size)
+                self._protected_bytes += size
+                while self._protected_bytes > self.max_protected_bytes:
+                    self._demote_one()
+            else:
+                self._probation[key] = (value, size, accesses)
+                self._probation.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Insert or replace a cached value, evicting entries over budget."""
+        size = estimate_size(value)
+        with self._lock:
+            self._discard(key)
+            if size > self.max_bytes:
+                return
+            self._probation[key] = (value, size, 1)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._evict_one()
+
+    def clear(self) -> None:
+        """Remove all entries (statistics are kept)."""
+        with self._lock:
+            self._probation.clear()
+            self._protected.clear()
+            self._bytes = 0
+            self._protected_bytes = 0
+        if self.negative is not None:
+            self.negative.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return usage metrics for this cache.
+
+        Returns:
+            Dict with hits, misses, hit_rate, entries, protected_entries, bytes,
+            max_bytes and, when a negative cache is configured, its stats under
+            "negative"
+        """
+        with self._lock:
+            stats: Dict[str, Any] = {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": _hit_rate(self._hits, self._misses),
+                "entries": len(self._probation) + len(self._protected),
+                "protected_entries": len(self._protected),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+        if self.negative is not None:
+            stats["negative"] = self.negative.stats()
+        return stats
+
+    def memoize(self, func: F) -> F:
+        """Decorator caching func results keyed by its positional arguments."""
+
+        negative = self.negative
+        is_negative = self.is_negative
+
+        @wraps(func)
+        def wrapper(*args: Any) -> Any:
+            if negative is not None:
+                result = negative.get(args, _MISSING)
+                if result is not _MISSING:
+                    return result
+            result = self.get(args, _MISSING)
+            if result is _MISSING:
+                result = func(*args)
+                if negative is not None and is_negative is not None:
+                    if is_negative(result):
+                        negative.put(args, result)
+                        return result
+                self.put(args, result)
+            return result
+
+        wrapper.cache = self  # type: ignore[attr-defined]
+        return cast(F, wrapper)
+
+    def _discard(self, key: Hashable) -> None:
+        """Remove key from either segment. Caller must hold the lock."""
+        probation_entry = self._probation.pop(key, None)
+        if probation_entry is not None:
+            self._bytes -= probation_entry[1]
+        protected_entry = self._protected.pop(key, None)
+        if protected_entry is not None:
+            self._bytes -= protected_entry[1]
+            self._protected_bytes -= protected_entry[1]
+
+    def _demote_one(self) -> None:
+        """Move the LRU protected entry to probation. Caller must hold the lock."""
+        key, (value, size) = self._protected.popitem(last=False)
+        self._protected_bytes -= size
+        self._probation[key] = (value, size, 1)
+
+    def _evict_one(self) -> None:
+        """Evict the least valuable entry. Caller must hold the lock."""
+        if self._probation:
+            _, (_, size, _) = self._probation.popitem(last=False)
+        else:
+            _, (_, size) = self._protected.popitem(last=False)
+            self._protected_bytes -= size
+        self._bytes -= size
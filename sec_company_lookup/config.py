@@ -6,11 +6,22 @@ This module handles user configuration including email settings for SEC API comp
 
 import os
 import re
-from typing import Optional
+from typing import Optional, Tuple
 
 # Global configuration
 _user_email: Optional[str] = None
 
+# Validated email read from the environment, and the User-Agent built for an
+# email; both are reset whenever the configured email changes
+_env_email: Optional[str] = None
+_user_agent_cache: Optional[Tuple[str, str]] = None
+
+# Default memory budget for the single-lookup (name) cache, in megabytes
+DEFAULT_CACHE_MB = 8
+
+# Basic email shape check: something@domain.tld
+_EMAIL_RE = re.compile(r"^[^@]+@[^@]+\.[^@]+$")
+
 
 def set_user_email(email: str) -> None:
     """
@@ -28,16 +39,27 @@ def set_user_email(email: str) -> None:
     """
     global _user_email
 
+    _validate_email(email)
+    _user_email = email
+    _reset_derived()
+
+
+def _validate_email(email: str) -> None:
+    """Raise ValueError if email is not a plausible email address."""
     # Basic validation
     if "@" not in email:
         raise ValueError("Invalid email: must contain '@' symbol")
 
     # More thorough email validation
-    pattern = r"^[^@]+@[^@]+\.[^@]+$"
-    if not re.match(pattern, email):
+    if not _EMAIL_RE.match(email):
         raise ValueError("Invalid email format")
 
-    _user_email = email
+
+def _reset_derived() -> None:
+    """Drop values derived from the configured email."""
+    global _env_email, _user_agent_cache
+    _env_email = None
+    _user_agent_cache = None
 
 
 def get_user_email() -> Optional[str]:
@@ -48,19 +70,26 @@ def get_user_email() -> Optional[str]:
     1. Email set via set_user_email()
     2. SECCOMPANYLOOKUP_USER_EMAIL environment variable
 
+    A valid environment email is read and validated once and then reused.
+
     Returns:
         str: User email if configured, None otherwise
     """
+    global _env_email
+
     # First check if email was set via function
     if _user_email:
         return _user_email
+    if _env_email:
+        return _env_email
 
     # Fallback to environment variable
     env_email = os.getenv("SECCOMPANYLOOKUP_USER_EMAIL")
     if env_email:
         try:
             # Validate the environment email
-            set_user_email(env_email)
+            _validate_email(env_email)
+            _env_email = env_email
             return env_email
         except ValueError:
             # Invalid email in environment variable, ignore it
@@ -79,7 +108,11 @@ def get_user_agent() -> str:
     Raises:
         ValueError: If no email is configured
     """
+    global _user_agent_cache
+
     email = get_user_email()
+    if _user_agent_cache is not None and _user_agent_cache[0] == email:
+        return _user_agent_cache[1]
     if not email:
         raise ValueError(
             "User email is required for SEC API requests. "
@@ -88,10 +121,33 @@ def get_user_agent() -> str:
             "2. Set SECCOMPANYLOOKUP_USER_EMAIL environment variable"
         )
 
-    return f"sec-company-lookup/0.1.0 ({email})"
+    user_agent = f"sec-company-lookup/0.1.0 ({email})"
+    _user_agent_cache = (email, user_agent)
+    return user_agent
 
 
 def clear_user_email() -> None:
     """Clear the configured user email."""
     global _user_email
     _user_email = None
+    _reset_derived()
+
+
+def get_cache_budget_bytes() -> int:
+    """
+    Get the memory budget for the single-lookup (name) cache.
+
+    Reads the SECCOMPANYLOOKUP_CACHE_MB environment variable, falling back to
+    DEFAULT_CACHE_MB if it is unset or invalid.
+
+    Returns:
+        int: Cache budget in bytes
+    """
+    env_mb = os.getenv("SECCOMPANYLOOKUP_CACHE_MB")
+    try:
+        cache_mb = float(env_mb) if env_mb else DEFAULT_CACHE_MB
+    except ValueError:
+        cache_mb = DEFAULT_CACHE_MB
+    if cache_mb <= 0:
+        cache_mb = DEFAULT_CACHE_MB
+    return int(cache_mb * 1024 * 1024)
@@ -1,8 +1,10 @@
 """Database module for sec-company-lookup package."""
 
 from .db import (
+    close_db_connections,
     init_database,
     load_data_to_db,
+    load_columns_to_db,
     search_companies_db,
     get_companies_by_ciks_db,
     get_companies_by_company_names_db,
@@ -13,8 +15,10 @@ from .db import (
 )
 
 __all__ = [
+    "close_db_connections",
     "init_database",
     "load_data_to_db",
+    "load_columns_to_db",
     "search_companies_db",
     "get_companies_by_ciks_db",
     "get_companies_by_company_names_db",
@@ -5,10 +5,27 @@ This module handles all SQLite database operations including schema creation,
 data loading, and complex search queries.
 """
 
+import re
 import sqlite3
+import threading
 import time
 import logging
-from typing import Dict, List, Any, cast, Tuple
+from collections import defaultdict
+from functools import lru_cache
+from itertools import chain, islice, repeat
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    cast,
+)
 from contextlib import contextmanager
 
 from ..types import SECCompanyInfo, CompanyData
@@ -20,14 +37,146 @@ logger = logging.getLogger(__name__)
 # Database path
 DB_PATH = CACHE_DIR / "sec_company_lookup.db"
 
+# Stay under SQLite's default limit of 999 bound parameters per statement
+MAX_SQL_VARIABLES = 900
+
+# Bumped whenever the companies schema changes; older databases are rebuilt
+SCHEMA_VERSION = 4
+
+# FTS5 rank function: cik is unindexed, ticker hits outweigh title hits
+_FTS_RANK = "bm25(0.0, 10.0, 1.0)"
+
+# Queries shorter than this are ordered by ticker instead of by rank
+_FTS_MIN_RANKED_QUERY = 3
+
+# Most FTS matches ranked per query; bounds the sort for very common terms
+_FTS_RANK_CANDIDATES = 1000
+
+# Splits user input into the word tokens passed to FTS5 MATCH
+_FTS_SPLIT = re.compile(r"\W+")
+
+# Secondary indexes on companies, dropped and rebuilt around bulk loads. The
+# table itself has no UNIQUE constraint: its automatic index could not be
+# dropped, so every loaded row would update it. idx_cik covers (cik, ticker)
+# instead.
+_COMPANY_INDEXES = {
+    "idx_ticker": "companies(ticker)",
+    "idx_title_lc": "companies(title_lc)",
+    "idx_cik": "companies(cik, ticker)",
+}
+
+# Batch lookups with more keys than this join a temp table of keys instead of
+# binding them all into an IN list
+_TEMP_TABLE_MIN_KEYS = 100
+
+# Rows per multi-row INSERT statement (5 bound parameters per company row)
+_INSERT_BATCH_ROWS = MAX_SQL_VARIABLES // 5
+
+# Reloads that add or remove more than this fraction of the rows rebuild the
+# tables from scratch; smaller changes are applied row by row
+_INCREMENTAL_MAX_CHANGE = 0.25
+
+# Per-connection tuning: 64 MiB page cache, 256 MiB memory map, temp tables in RAM
+_CONNECTION_PRAGMAS = (
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Database page size in bytes (SQLite defaults to 4096); larger pages mean
+# fewer page reads for the FTS and index scans behind searches
+_PAGE_SIZE = 8192
+
+# Prepared statements kept per connection (sqlite3 defaults to 128). Batch
+# lookups generate one statement text per IN-list size bucket, so leave
+# headroom for them next to the fixed search queries.
+_CACHED_STATEMENTS = 512
+
+# Smallest IN list a batch lookup binds; longer lists are padded up to the
+# next power of two so only a handful of statement texts are ever prepared
+_IN_LIST_MIN_SIZE = 8
+
+# Connections are reused per thread, keyed by (database path, read_only).
+# close_db_connections() bumps the generation; each thread then closes and
+# replaces its stale connections on next use.
+_local = threading.local()
+_generation = 0
+
+T = TypeVar("T")
+
+
+def _chunked(
+    values: Sequence[T], size: int = MAX_SQL_VARIABLES
+) -> Iterator[Sequence[T]]:
+    """Yield consecutive slices of values holding at most size items."""
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def _in_list(values: Sequence[T]) -> Tuple[str, List[T]]:
+    """
+    Return IN-list placeholders and parameters for a non-empty values list.
+
+    The list is padded by repeating its last value up to a power-of-two size
+    (capped at MAX_SQL_VARIABLES), so lookups of similar size share one
+    prepared statement. Repeated values do not change what IN matches.
+    """
+    size = _IN_LIST_MIN_SIZE
+    while size < len(values):
+        size *= 2
+    size = max(len(values), min(size, MAX_SQL_VARIABLES))
+    params = list(values)
+    params.extend(repeat(values[-1], size - len(values)))
+    return ",".join("?" * size), params
+
+
+def _connect(read_only: bool) -> sqlite3.Connection:
+    """Open and configure a new database connection."""
+    if read_only:
+        uri = Path(DB_PATH).absolute().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, cached_statements=_CACHED_STATEMENTS)
+    else:
+        conn = sqlite3.connect(DB_PATH, cached_statements=_CACHED_STATEMENTS)
+    try:
+        if not read_only:
+            # Only takes effect while the file is still empty, i.e. before the
+            # first table is created; existing databases keep their page size
+            conn.execute(f"PRAGMA page_size={_PAGE_SIZE}")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn
+
+
+def _thread_connections() -> Dict[Tuple[str, bool], sqlite3.Connection]:
+    """Get this thread's pooled connections, closing them if they are stale."""
+    if getattr(_local, "generation", None) != _generation:
+        for conn in getattr(_local, "connections", {}).values():
+            conn.close()
+        _local.connections = {}
+        _local.generation = _generation
+    return cast(Dict[Tuple[str, bool], sqlite3.Connection], _local.connections)
+
 
 @contextmanager
-def get_db_connection(row_factory: bool = True):
+def get_db_connection(
+    row_factory: bool = True, read_only: bool = False
+) -> Iterator[sqlite3.Connection]:
     """
     Context manager for database connections.
 
+    Connections are pooled per thread and reused across calls, so the schema
+    and page cache stay warm. Writable connections use WAL journaling with
+    synchronous=NORMAL, so readers never block on the writer and commits avoid
+    a full fsync. Read-only connections open the existing file with mode=ro.
+
     Args:
         row_factory: If True, set row_factory to sqlite3.Row for dict-like access
+        read_only: If True, open the database read-only (it must already exist)
 
     Yields:
         sqlite3.Connection: Database connection
@@ -37,13 +186,26 @@ def get_db_connection(row_factory: bool = True):
         >>>     cursor = conn.execute("SELECT * FROM companies")
         >>>     results = cursor.fetchall()
     """
-    conn = sqlite3.connect(DB_PATH)
-    if row_factory:
-        conn.row_factory = sqlite3.Row
-    try:
-        yield conn
-    finally:
-        conn.close()
+    connections = _thread_connections()
+    key = (str(DB_PATH), read_only)
+    conn = connections.get(key)
+    if conn is None:
+        conn = _connect(read_only)
+        connections[key] = conn
+    conn.row_factory = sqlite3.Row if row_factory else None
+    yield conn
+
+
+def close_db_connections() -> None:
+    """
+    Close pooled database connections.
+
+    The calling thread's connections are closed immediately; other threads
+    close theirs the next time they use the database.
+    """
+    global _generation
+    _generation += 1
+    _thread_connections()
 
 
 def init_database() -> None:
@@ -53,6 +215,16 @@ def init_database() -> None:
     ensure_cache_dir()
 
     with get_db_connection(row_factory=False) as conn:
+        # The database only caches SEC data, so an outdated schema is simply
+        # dropped and recreated (the next load repopulates it)
+        if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS companies_fts")
+            conn.execute("DROP TABLE IF EXISTS companies")
+            conn.execute("DROP TABLE IF EXISTS meta")
+
+        # title_lc holds the lowercased title so case-insensitive lookups
+        # compare against an indexed column instead of calling LOWER() per row;
+        # NOCASE lets SQLite use its index for prefix LIKE patterns as well
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS companies (
@@ -60,81 +232,371 @@ def init_database() -> None:
                 cik INTEGER,
                 ticker TEXT,
                 title TEXT,
-                last_updated REAL,
-                UNIQUE(cik, ticker)
+                title_lc TEXT COLLATE NOCASE,
+                last_updated REAL
             )
         """
         )
 
         # Create indexes optimized for search operations
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_ticker ON companies(ticker)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_title ON companies(title)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_cik ON companies(cik)")
+        _create_indexes(conn)
 
         # Enable FTS (Full Text Search) for company names
+        _create_fts_table(conn)
+
+        # Small key/value facts about the loaded data (e.g. companies_count)
         conn.execute(
-            """
-            CREATE VIRTUAL TABLE IF NOT EXISTS companies_fts USING fts5(
-                id, ticker, title, content='companies', content_rowid='id'
-            )
-        """
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)"
         )
 
+        conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
         conn.commit()
 
 
+def _create_fts_table(conn: sqlite3.Connection) -> None:
+    """
+    Create the companies_fts full text index if it is missing.
+
+    The table stores its own copy of cik, ticker and title so searches never
+    join companies.
+    """
+    # Rewriting the rank config of an existing table invalidates the ranked
+    # MATCH statements cached by every other open connection
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='companies_fts'"
+    ).fetchone()
+    if exists:
+        return
+
+    conn.execute(
+        """
+        CREATE VIRTUAL TABLE companies_fts USING fts5(
+            cik UNINDEXED, ticker, title
+        )
+    """
+    )
+    conn.execute(
+        "INSERT INTO companies_fts(companies_fts, rank) VALUES('rank', ?)",
+        (_FTS_RANK,),
+    )
+
+
+def _create_indexes(conn: sqlite3.Connection) -> None:
+    """Create the secondary indexes on companies if they are missing."""
+    for name, target in _COMPANY_INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+def _drop_indexes(conn: sqlite3.Connection) -> None:
+    """Drop the secondary indexes on companies."""
+    for name in _COMPANY_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+@lru_cache(maxsize=None)
+def _insert_companies_sql(row_count: int) -> str:
+    """Build a multi-row INSERT statement for row_count company rows."""
+    values = ",".join(["(?, ?, ?, ?, ?)"] * row_count)
+    return (
+        "INSERT INTO companies (cik, ticker, title, title_lc, last_updated) "
+        f"VALUES {values}"
+    )
+
+
+def _insert_companies(
+    conn: sqlite3.Connection, rows: Iterable[Tuple[int, str, str, str, float]]
+) -> int:
+    """
+    Insert company rows using multi-row VALUES statements.
+
+    Returns:
+        int: Number of rows inserted
+    """
+    inserted = 0
+    row_iter = iter(rows)
+    while True:
+        batch = list(islice(row_iter, _INSERT_BATCH_ROWS))
+        if not batch:
+            return inserted
+        conn.execute(
+            _insert_companies_sql(len(batch)), list(chain.from_iterable(batch))
+        )
+        inserted += len(batch)
+
+
+def _company_rows(
+    data: Dict[str, Any], last_updated: float
+) -> Iterator[Tuple[int, str, str, str, float]]:
+    """Yield (cik, ticker, title, title_lc, last_updated) rows for valid entries."""
+    for company_info in data.values():
+        if not isinstance(company_info, dict):
+            continue
+        # Type cast to get proper typing support
+        sec_info = cast(SECCompanyInfo, company_info)
+        ticker = sec_info.get("ticker")
+        title = sec_info.get("title")
+        if not (ticker and title):
+            continue
+
+        # normalize_cik returns None for missing or malformed values
+        cik_int = normalize_cik(sec_info.get("cik_str"))
+        if cik_int is not None:
+            yield cik_int, ticker.upper(), title, title.lower(), last_updated
+
+
 def load_data_to_db(data: Dict[str, Any]) -> None:
     """Load company data into SQLite database optimized for search operations."""
+    _load_rows_to_db(_company_rows(data, time.time()))
+
+
+def load_columns_to_db(
+    ciks: Sequence[int],
+    tickers: Sequence[str],
+    names: Sequence[str],
+    names_lower: Sequence[str],
+) -> None:
+    """
+    Load already-parsed company columns into the SQLite database.
+
+    Lets callers that have built the in-memory columns reuse them instead of
+    walking the raw SEC data a second time.
+
+    Args:
+        ciks: Normalized CIKs
+        tickers: Upper-cased tickers
+        names: Company titles
+        names_lower: Lower-cased company titles
+    """
+    _load_rows_to_db(zip(ciks, tickers, names, names_lower, repeat(time.time())))
+
+
+def _load_rows_to_db(rows: Iterable[Tuple[int, str, str, str, float]]) -> None:
+    """
+    Make the companies table (and its indexes and FTS table) hold rows.
+
+    An empty table, or one that would change a lot, is rebuilt in bulk.
+    Otherwise only the rows that were added or removed since the last load
+    are written, which leaves the FTS index almost untouched.
+    """
     init_database()
 
     with get_db_connection(row_factory=False) as conn:
+        # The database is a cache rebuilt from the SEC data, so the bulk load
+        # skips fsyncs entirely; the pooled connection returns to NORMAL after
+        conn.execute("PRAGMA synchronous=OFF")
         # Use transaction for better performance
         conn.execute("BEGIN TRANSACTION")
 
         try:
-            # Clear existing data
-            conn.execute("DELETE FROM companies")
-            conn.execute("DELETE FROM companies_fts")
-
-            # Insert new data in batches for better performance
-            companies: List[Tuple[int, str, str, float]] = []
-
-            for _, company_info in data.items():
-                if isinstance(company_info, dict):
-                    # Type cast to get proper typing support
-                    sec_info = cast(SECCompanyInfo, company_info)
-                    cik_raw: str = sec_info.get("cik_str", "") or ""
-                    ticker: str = sec_info.get("ticker", "") or ""
-                    title: str = sec_info.get("title", "") or ""
-
-                    cik_int = normalize_cik(cik_raw)
-
-                    if cik_int is not None and ticker and title:
-                        companies.append((cik_int, ticker.upper(), title, time.time()))
-
-            # Batch insert for better performance - let ID auto-increment
-            conn.executemany(
-                "INSERT INTO companies (cik, ticker, title, last_updated) VALUES (?, ?, ?, ?)",
-                companies,
-            )
+            existing = conn.execute(
+                "SELECT id, cik, ticker, title FROM companies"
+            ).fetchall()
+            inserted = None
+            if existing:
+                rows = list(rows)
+                inserted = _sync_companies(conn, rows, existing)
+            if inserted is None:
+                inserted = _replace_companies(conn, rows)
 
-            # Insert into FTS table - this will use the auto-generated IDs
             conn.execute(
-                """
-                INSERT INTO companies_fts (id, ticker, title)
-                SELECT id, ticker, title FROM companies
-            """
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                ("companies_count", inserted),
             )
 
             conn.execute("COMMIT")
-            logger.info(
-                f"Loaded {len(companies)} companies into database with FTS support"
-            )
+            logger.info(f"Loaded {inserted} companies into database with FTS support")
 
         except Exception as e:
             conn.execute("ROLLBACK")
             logger.error(f"Failed to load data to database: {e}")
             raise
+        finally:
+            conn.execute("PRAGMA synchronous=NORMAL")
+
+
+def _replace_companies(
+    conn: sqlite3.Connection, rows: Iterable[Tuple[int, str, str, str, float]]
+) -> int:
+    """
+    Replace every company row, rebuilding indexes and the FTS table in bulk.
+
+    Returns:
+        int: Number of rows inserted
+    """
+    # Drop indexes so they are built once, in bulk, after the load
+    # instead of being updated row by row
+    _drop_indexes(conn)
+
+    # Clear existing data
+    conn.execute("DELETE FROM companies")
+
+    # Stream rows into multi-row inserts - let ID auto-increment
+    inserted = _insert_companies(conn, rows)
+    _create_indexes(conn)
+
+    # Repopulate the FTS index from companies in one pass. Dropping and
+    # recreating the table is far cheaper than DELETE, which removes
+    # every row's tokens from the index one row at a time.
+    conn.execute("DROP TABLE companies_fts")
+    _create_fts_table(conn)
+    conn.execute(
+        """
+        INSERT INTO companies_fts(rowid, cik, ticker, title)
+        SELECT id, cik, ticker, title FROM companies
+    """
+    )
+    return inserted
+
+
+def _sync_companies(
+    conn: sqlite3.Connection,
+    rows: List[Tuple[int, str, str, str, float]],
+    existing: List[Tuple[int, int, str, str]],
+) -> Optional[int]:
+    """
+    Apply only the differences between existing rows and rows.
+
+    Rows are matched on (cik, ticker, title); unchanged rows keep their id
+    and FTS entry. Changed titles show up as one removed and one added row.
+
+    Args:
+        conn: Writable connection inside an open transaction
+        rows: Complete new contents of the companies table
+        existing: (id, cik, ticker, title) of every current row
+
+    Returns:
+        Number of rows now in the table, or None (having written nothing) if
+        too many rows changed for an incremental update to pay off
+    """
+    ids_by_key: "defaultdict[Tuple[int, str, str], List[int]]" = defaultdict(list)
+    for company_id, cik, ticker, title in existing:
+        ids_by_key[(cik, ticker, title)].append(company_id)
+
+    added: List[Tuple[int, str, str, str, float]] = []
+    for row in rows:
+        # Each current row can match one new row; duplicates match in turn
+        ids = ids_by_key.get(row[:3])
+        if ids:
+            ids.pop()
+        else:
+            added.append(row)
+    removed = [(company_id,) for ids in ids_by_key.values() for company_id in ids]
+
+    if len(added) + len(removed) > len(rows) * _INCREMENTAL_MAX_CHANGE:
+        return None
+
+    conn.executemany("DELETE FROM companies_fts WHERE rowid = ?", removed)
+    conn.executemany("DELETE FROM companies WHERE id = ?", removed)
+    # AUTOINCREMENT ids only grow, so the added rows are exactly those
+    # above the largest id seen before inserting them
+    last_id = max(company_id for company_id, *_ in existing)
+    _insert_companies(conn, added)
+    conn.execute(
+        """
+        INSERT INTO companies_fts(rowid, cik, ticker, title)
+        SELECT id, cik, ticker, title FROM companies WHERE id > ?
+    """,
+        (last_id,),
+    )
+    return len(rows)
+
+
+def _sanitize_fts(query: str) -> str:
+    """
+    Turn free text into a safe FTS5 expression of quoted prefix tokens.
+
+    Punctuation never reaches the FTS5 parser, so input like "AT&T" cannot
+    raise a syntax error; input without any word characters matches nothing.
+    """
+    tokens = [f'"{token}"*' for token in _FTS_SPLIT.split(query) if token]
+    return " ".join(tokens) or '""'
+
+
+def _fts_prefix_query(query: str) -> str:
+    """Build an FTS5 expression matching query as a prefix of ticker or title."""
+    phrase = query.strip().replace('"', '""')
+    return f'{{ticker title}} : "{phrase}"*'
+
+
+# Plain FTS matches, ordered by rank over a bounded candidate set
+_FTS_RANKED_HITS = """
+    SELECT cik, ticker, title, rank AS score
+    FROM (
+        SELECT cik, ticker, title, rank
+        FROM companies_fts
+        WHERE companies_fts MATCH :match
+        LIMIT :candidates
+    )
+    ORDER BY score
+    LIMIT :limit
+"""
+
+# Plain FTS matches for short queries, ordered by ticker
+_FTS_TICKER_HITS = """
+    SELECT cik, ticker, title, 0 AS score
+    FROM companies_fts
+    WHERE companies_fts MATCH :match
+    ORDER BY ticker
+    LIMIT :limit
+"""
+
+# Fuzzy search in one statement. Each source only contributes companies not
+# found by an earlier one, and later sources are skipped entirely once the
+# plain FTS matches fill the limit. The LIKE scan only runs when the FTS
+# prefix query finds nothing new either.
+_FUZZY_SEARCH_SQL = """
+    WITH
+    fts_hits AS ({fts_hits}),
+    prefix_hits AS (
+        SELECT cik, ticker, title,
+            CASE
+                WHEN ticker LIKE :prefix THEN 1
+                WHEN title LIKE :prefix THEN 2
+                ELSE 3
+            END AS tier,
+            rank AS score
+        FROM companies_fts p
+        WHERE (SELECT COUNT(*) FROM fts_hits) < :limit
+            AND companies_fts MATCH :prefix_match
+            AND NOT EXISTS (
+                SELECT 1 FROM fts_hits f
+                WHERE f.cik = p.cik AND f.ticker = p.ticker
+            )
+        ORDER BY tier, score
+        LIMIT :limit
+    ),
+    like_hits AS (
+        SELECT cik, ticker, title,
+            CASE
+                WHEN ticker LIKE :prefix THEN 1
+                WHEN title LIKE :prefix THEN 2
+                ELSE 3
+            END AS tier
+        FROM companies c
+        WHERE (SELECT COUNT(*) FROM fts_hits) < :limit
+            AND NOT EXISTS (SELECT 1 FROM prefix_hits)
+            AND (ticker LIKE :substring OR title LIKE :substring)
+            AND NOT EXISTS (
+                SELECT 1 FROM fts_hits f
+                WHERE f.cik = c.cik AND f.ticker = c.ticker
+            )
+        ORDER BY tier, ticker
+        LIMIT :limit
+    )
+    SELECT cik, ticker, title FROM (
+        SELECT 1 AS source, 0 AS tier, score, cik, ticker, title FROM fts_hits
+        UNION ALL
+        SELECT 2, tier, score, cik, ticker, title FROM prefix_hits
+        UNION ALL
+        SELECT 3, tier, 0, cik, ticker, title FROM like_hits
+    )
+    ORDER BY source, tier, score, ticker
+    LIMIT :limit
+"""
+
+# Both variants are formatted once at import rather than on every search
+_FUZZY_SEARCH_RANKED_SQL = _FUZZY_SEARCH_SQL.format(fts_hits=_FTS_RANKED_HITS)
+_FUZZY_SEARCH_BY_TICKER_SQL = _FUZZY_SEARCH_SQL.format(fts_hits=_FTS_TICKER_HITS)
 
 
 def search_companies_db(
@@ -143,6 +605,10 @@ def search_companies_db(
     """
     Search for companies in database using FTS and LIKE queries.
 
+    Fuzzy search returns plain FTS matches first, then FTS prefix matches,
+    and falls back to a LIKE substring scan only when neither helps.
+    Single-character queries list the tickers starting with that character.
+
     Args:
         query: Search query string
         limit: Maximum number of results to return
@@ -151,113 +617,124 @@ def search_companies_db(
     Returns:
         List of matching company dictionaries
     """
-    if not query or not query.strip():
+    query = query.strip() if query else ""
+    if not query:
         return []
 
-    with get_db_connection() as conn:
+    with get_db_connection(row_factory=False, read_only=True) as conn:
         try:
-            results: List[CompanyData] = []
-
-            if fuzzy:
-                # Fuzzy search using FTS and LIKE queries
-                # First try FTS for intelligent search
+            if fuzzy and len(query) == 1:
+                # A single character is too short for useful FTS matching;
+                # list tickers starting with it via a range scan on idx_ticker
+                first = query.upper()
                 cursor = conn.execute(
                     """
-                    SELECT c.cik, c.ticker, c.title
-                    FROM companies_fts fts
-                    JOIN companies c ON c.id = fts.id
-                    WHERE companies_fts MATCH ?
-                    ORDER BY rank
+                    SELECT cik, ticker, title
+                    FROM companies
+                    WHERE ticker >= ? AND ticker < ?
+                    ORDER BY ticker
                     LIMIT ?
                 """,
-                    (query, limit),
+                    (first, chr(ord(first) + 1), limit),
+                )
+            elif fuzzy:
+                # Ranking every match of a very short or common term is slow,
+                # so short queries are ordered by ticker instead of by rank
+                if len(query) < _FTS_MIN_RANKED_QUERY:
+                    sql = _FUZZY_SEARCH_BY_TICKER_SQL
+                else:
+                    sql = _FUZZY_SEARCH_RANKED_SQL
+                cursor = conn.execute(
+                    sql,
+                    {
+                        "match": _sanitize_fts(query),
+                        "prefix_match": _fts_prefix_query(query),
+                        "prefix": f"{query}%",
+                        "substring": f"%{query}%",
+                        "candidates": _FTS_RANK_CANDIDATES,
+                        "limit": limit,
+                    },
                 )
-
-                for row in cursor:
-                    results.append(
-                        {
-                            "cik": row["cik"],
-                            "ticker": row["ticker"],
-                            "name": row["title"],
-                        }
-                    )
-
-                # If FTS didn't return enough results, fall back to LIKE search
-                if len(results) < limit:
-                    remaining_limit = limit - len(results)
-                    seen_pairs = {(r["cik"], r["ticker"]) for r in results}
-
-                    # Search by ticker and name with LIKE, excluding already found results
-                    cursor = conn.execute(
-                        """
-                        SELECT cik, ticker, title
-                        FROM companies
-                        WHERE (ticker LIKE ? OR title LIKE ?)
-                        ORDER BY
-                            CASE
-                                WHEN ticker LIKE ? THEN 1
-                                WHEN title LIKE ? THEN 2
-                                ELSE 3
-                            END,
-                            ticker
-                        LIMIT ?
-                    """,
-                        (
-                            f"%{query}%",
-                            f"%{query}%",
-                            f"{query}%",
-                            f"{query}%",
-                            remaining_limit
-                            * 2,  # Get more results to filter out duplicates
-                        ),
-                    )
-
-                    added = 0
-                    for row in cursor:
-                        if added >= remaining_limit:
-                            break
-
-                        # Skip if we already have this company from FTS results
-                        if (row["cik"], row["ticker"]) not in seen_pairs:
-                            results.append(
-                                {
-                                    "cik": row["cik"],
-                                    "ticker": row["ticker"],
-                                    "name": row["title"],
-                                }
-                            )
-                            seen_pairs.add((row["cik"], row["ticker"]))
-                            added += 1
             else:
                 # Exact matching only
                 cursor = conn.execute(
                     """
                     SELECT cik, ticker, title
                     FROM companies
-                    WHERE LOWER(ticker) = LOWER(?) OR LOWER(title) = LOWER(?)
+                    WHERE ticker = ? OR title_lc = ?
                     ORDER BY ticker
                     LIMIT ?
                 """,
-                    (query, query, limit),
+                    (query.upper(), query.lower(), limit),
                 )
 
-                for row in cursor:
-                    results.append(
-                        {
-                            "cik": row["cik"],
-                            "ticker": row["ticker"],
-                            "name": row["title"],
-                        }
-                    )
-
-            return results
+            # Callers get CompanyData dicts; a dict display per row is faster
+            # than dict(zip(...)) and avoids converting via namedtuples
+            return [
+                {"cik": cik, "ticker": ticker, "name": title}
+                for cik, ticker, title in cursor
+            ]
 
         except sqlite3.Error as e:
             logger.warning(f"Database search failed: {e}")
             raise
 
 
-def get_companies_by_ciks_db(ciks: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+def _companies_by_keys(
+    conn: sqlite3.Connection, column: str, keys: Sequence[Any]
+) -> List[Tuple[int, str, str]]:
+    """
+    Fetch (cik, ticker, title) rows whose column value is one of keys.
+
+    Small batches use an IN list; larger ones are loaded into a temp table and
+    joined, which has no bound parameter limit and lets SQLite plan a join.
+
+    Args:
+        conn: Connection to query (may be read-only)
+        column: Trusted column name to match ("cik" or "ticker")
+        keys: Values to look up
+
+    Returns:
+        Matching rows ordered by column, then ticker
+    """
+    if len(keys) <= _TEMP_TABLE_MIN_KEYS:
+        placeholders, params = _in_list(keys)
+        return conn.execute(
+            f"""
+            SELECT cik, ticker, title
+            FROM companies
+            WHERE {column} IN ({placeholders})
+            ORDER BY {column}, ticker
+        """,
+            params,
+        ).fetchall()
+
+    # WITHOUT ROWID keeps the keys in their primary key B-tree alone, instead
+    # of a rowid table plus a separate index that every insert has to update
+    table = f"_batch_{column}"
+    conn.execute(
+        f"CREATE TEMP TABLE IF NOT EXISTS {table} (v PRIMARY KEY) WITHOUT ROWID"
+    )
+    try:
+        conn.executemany(
+            f"INSERT OR IGNORE INTO {table} VALUES (?)", ((key,) for key in keys)
+        )
+        return conn.execute(
+            f"""
+            SELECT c.cik, c.ticker, c.title
+            FROM {table} b
+            JOIN companies c ON c.{column} = b.v
+            ORDER BY c.{column}, c.ticker
+        """
+        ).fetchall()
+    finally:
+        # Empty the key table and end the implicit transaction its writes
+        # opened, so the pooled connection does not keep a read snapshot
+        conn.execute(f"DELETE FROM {table}")
+        conn.commit()
+
+
+def get_companies_by_ciks_db(ciks: List[int]) -> Dict[int, List[CompanyData]]:
     """
     Batch lookup companies by multiple CIK identifiers using database.
 
@@ -270,36 +747,12 @@ def get_companies_by_ciks_db(ciks: List[int]) -> Dict[int, List[Dict[str, Any]]]
     if not ciks:
         return {}
 
-    with get_db_connection() as conn:
+    with get_db_connection(row_factory=False, read_only=True) as conn:
         try:
-            # Batch query with IN clause
-            placeholders = ",".join("?" * len(ciks))
-            cursor = conn.execute(
-                f"""
-                SELECT cik, ticker, title
-                FROM companies
-                WHERE cik IN ({placeholders})
-                ORDER BY cik, ticker
-            """,
-                ciks,
-            )
-
-            results: Dict[int, List[Dict[str, Any]]] = {}
-            for row in cursor:
-                company = {
-                    "cik": row["cik"],
-                    "ticker": row["ticker"],
-                    "name": row["title"],
-                }
-
-                if row["cik"] not in results:
-                    results[row["cik"]] = []
-                results[row["cik"]].append(company)
-
-            # Ensure all requested CIKs are in the result (even if empty)
-            for cik in ciks:
-                if cik not in results:
-                    results[cik] = []
+            # Every requested CIK gets a list up front (empty if not found)
+            results: Dict[int, List[CompanyData]] = {cik: [] for cik in ciks}
+            for cik, ticker, title in _companies_by_keys(conn, "cik", ciks):
+                results[cik].append({"cik": cik, "ticker": ticker, "name": title})
 
             return results
 
@@ -310,10 +763,14 @@ def get_companies_by_ciks_db(ciks: List[int]) -> Dict[int, List[Dict[str, Any]]]
 
 def get_companies_by_company_names_db(
     company_names: List[str], fuzzy: bool = True
-) -> Dict[str, List[Dict[str, Any]]]:
+) -> Dict[str, List[CompanyData]]:
     """
     Batch lookup companies by multiple company names using database.
 
+    Exact (case-insensitive) title matches for all names are resolved with a
+    single IN query. With fuzzy matching, names without an exact match are
+    then resolved together by one LIKE join against a VALUES list of patterns.
+
     Args:
         company_names: List of company names
         fuzzy: If True, perform fuzzy matching; if False, exact matching only
@@ -324,59 +781,76 @@ def get_companies_by_company_names_db(
     if not company_names:
         return {}
 
-    with get_db_connection() as conn:
+    with get_db_connection(row_factory=False, read_only=True) as conn:
         try:
-            results: Dict[str, List[Dict[str, Any]]] = {}
-
-            for company_name in company_names:
-                if not company_name or not company_name.strip():
-                    results[company_name] = []
-                    continue
+            results: Dict[str, List[CompanyData]] = {}
+
+            # Normalize each distinct name once; names differing only in case or
+            # surrounding whitespace share one key and are looked up once
+            normalized = {
+                name: name.strip().lower()
+                for name in company_names
+                if name and name.strip()
+            }
+            keys = list(set(normalized.values()))
+
+            # Exact matches for every name in one pass
+            exact_matches: "defaultdict[str, List[CompanyData]]" = defaultdict(list)
+            for chunk in _chunked(keys):
+                placeholders, in_params = _in_list(chunk)
+                cursor = conn.execute(
+                    f"""
+                    SELECT cik, ticker, title, title_lc
+                    FROM companies
+                    WHERE title_lc IN ({placeholders})
+                    ORDER BY ticker
+                """,
+                    in_params,
+                )
+                for cik, ticker, title, key in cursor:
+                    exact_matches[key].append(
+                        {"cik": cik, "ticker": ticker, "name": title}
+                    )
 
-                if fuzzy:
-                    # Fuzzy matching with LIKE queries
+            # Fuzzy matches for the remaining names, all in one join per chunk
+            fuzzy_matches: "defaultdict[str, List[CompanyData]]" = defaultdict(list)
+            if fuzzy:
+                misses = [key for key in keys if key not in exact_matches]
+                # 3 bound parameters per name
+                for chunk in _chunked(misses, MAX_SQL_VARIABLES // 3):
+                    values = ",".join(["(?, ?, ?)"] * len(chunk))
+                    params: List[Any] = []
+                    for position, key in enumerate(chunk):
+                        params.extend((position, f"%{key}%", f"{key}%"))
                     cursor = conn.execute(
-                        """
-                        SELECT cik, ticker, title
-                        FROM companies
-                        WHERE LOWER(title) LIKE LOWER(?)
+                        f"""
+                        WITH q(position, pattern, prefix) AS (VALUES {values})
+                        SELECT q.position, c.cik, c.ticker, c.title
+                        FROM q
+                        JOIN companies c ON c.title_lc LIKE q.pattern
                         ORDER BY
+                            q.position,
                             CASE
-                                WHEN LOWER(title) = LOWER(?) THEN 1
-                                WHEN LOWER(title) LIKE LOWER(?) THEN 2
-                                ELSE 3
+                                WHEN c.title_lc LIKE q.prefix THEN 1
+                                ELSE 2
                             END,
-                            ticker
-                    """,
-                        (
-                            f"%{company_name.strip()}%",
-                            company_name.strip(),
-                            f"{company_name.strip()}%",
-                        ),
-                    )
-                else:
-                    # Exact matching only
-                    cursor = conn.execute(
-                        """
-                        SELECT cik, ticker, title
-                        FROM companies
-                        WHERE LOWER(title) = LOWER(?)
-                        ORDER BY ticker
+                            c.ticker
                     """,
-                        (company_name.strip(),),
-                    )
-
-                matches: List[Dict[str, Any]] = []
-                for row in cursor:
-                    matches.append(
-                        {
-                            "cik": row["cik"],
-                            "ticker": row["ticker"],
-                            "name": row["title"],
-                        }
+                        params,
                     )
+                    for position, cik, ticker, title in cursor:
+                        fuzzy_matches[chunk[position]].append(
+                            {"cik": cik, "ticker": ticker, "name": title}
+                        )
 
-                results[company_name] = matches
+            for company_name in company_names:
+                key = normalized.get(company_name)
+                if key is None:
+                    results[company_name] = []
+                elif key in exact_matches:
+                    results[company_name] = list(exact_matches[key])
+                else:
+                    results[company_name] = list(fuzzy_matches.get(key, []))
 
             return results
 
@@ -385,7 +859,7 @@ def get_companies_by_company_names_db(
             raise
 
 
-def get_companies_by_tickers_db(tickers: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+def get_companies_by_tickers_db(tickers: List[str]) -> Dict[str, List[CompanyData]]:
     """
     Batch lookup companies by multiple tickers using database.
 
@@ -398,36 +872,16 @@ def get_companies_by_tickers_db(tickers: List[str]) -> Dict[str, List[Dict[str,
     if not tickers:
         return {}
 
-    with get_db_connection() as conn:
+    with get_db_connection(row_factory=False, read_only=True) as conn:
         try:
-            # Batch query with IN clause
-            placeholders = ",".join("?" * len(tickers))
-            cursor = conn.execute(
-                f"""
-                SELECT cik, ticker, title
-                FROM companies
-                WHERE ticker IN ({placeholders})
-                ORDER BY ticker
-            """,
-                tickers,
-            )
-
-            results: Dict[str, List[Dict[str, Any]]] = {}
-            for row in cursor:
-                company = {
-                    "cik": row["cik"],
-                    "ticker": row["ticker"],
-                    "name": row["title"],
-                }
-
-                if row["ticker"] not in results:
-                    results[row["ticker"]] = []
-                results[row["ticker"]].append(company)
+            grouped: "defaultdict[str, List[CompanyData]]" = defaultdict(list)
+            for cik, ticker, title in _companies_by_keys(conn, "ticker", tickers):
+                grouped[ticker].append({"cik": cik, "ticker": ticker, "name": title})
 
             # Ensure all requested tickers are in the result (even if empty)
+            results = dict(grouped)
             for ticker in tickers:
-                if ticker not in results:
-                    results[ticker] = []
+                results.setdefault(ticker, [])
 
             return results
 
@@ -436,9 +890,33 @@ def get_companies_by_tickers_db(tickers: List[str]) -> Dict[str, List[Dict[str,
             raise
 
 
+# Fuzzy name search runs in two steps. Exact and prefix matches are index
+# lookups on title_lc; the substring scan over the whole table only runs when
+# they do not already fill the limit.
+_NAME_SEARCH_HEAD_SQL = """
+    SELECT cik, ticker, title, 1 AS rank
+    FROM companies
+    WHERE title_lc = :name
+    UNION ALL
+    SELECT cik, ticker, title, 2
+    FROM companies
+    WHERE title_lc LIKE :prefix AND title_lc != :name
+    ORDER BY rank, ticker
+    LIMIT :limit
+"""
+
+_NAME_SEARCH_SUBSTRING_SQL = """
+    SELECT cik, ticker, title
+    FROM companies
+    WHERE title_lc LIKE :substring AND title_lc NOT LIKE :prefix
+    ORDER BY ticker
+    LIMIT :limit
+"""
+
+
 def search_companies_by_company_name_db(
     company_name_query: str, limit: int = 10, fuzzy: bool = True
-) -> List[Dict[str, Any]]:
+) -> List[CompanyData]:
     """
     Search for companies by company name using database with various matching options.
 
@@ -453,53 +931,37 @@ def search_companies_by_company_name_db(
     if not company_name_query or not company_name_query.strip():
         return []
 
-    with get_db_connection() as conn:
+    with get_db_connection(row_factory=False, read_only=True) as conn:
         try:
-            results: List[Dict[str, Any]] = []
-
             if not fuzzy:
                 # Exact match search
-                cursor = conn.execute(
+                rows = conn.execute(
                     """
                     SELECT cik, ticker, title
                     FROM companies
-                    WHERE LOWER(title) = LOWER(?)
+                    WHERE title_lc = ?
                     ORDER BY ticker
                     LIMIT ?
                 """,
-                    (company_name_query.strip(), limit),
-                )
+                    (company_name_query.strip().lower(), limit),
+                ).fetchall()
             else:
-                # Fuzzy search with ranking
-                cursor = conn.execute(
-                    """
-                    SELECT cik, ticker, title,
-                        CASE
-                            WHEN LOWER(title) = LOWER(?) THEN 1
-                            WHEN LOWER(title) LIKE LOWER(?) THEN 2
-                            WHEN LOWER(title) LIKE LOWER(?) THEN 3
-                            ELSE 4
-                        END as rank
-                    FROM companies
-                    WHERE LOWER(title) LIKE LOWER(?)
-                    ORDER BY rank, ticker
-                    LIMIT ?
-                """,
-                    (
-                        company_name_query.strip(),
-                        f"{company_name_query.strip()}%",
-                        f"%{company_name_query.strip()}%",
-                        f"%{company_name_query.strip()}%",
-                        limit,
-                    ),
-                )
-
-            for row in cursor:
-                results.append(
-                    {"cik": row["cik"], "ticker": row["ticker"], "name": row["title"]}
-                )
+                query_lc = company_name_query.strip().lower()
+                params: Dict[str, Any] = {
+                    "name": query_lc,
+                    "prefix": f"{query_lc}%",
+                    "substring": f"%{query_lc}%",
+                    "limit": limit,
+                }
+                rows = [row[:3] for row in conn.execute(_NAME_SEARCH_HEAD_SQL, params)]
+                if len(rows) < limit:
+                    params["limit"] = limit - len(rows)
+                    rows.extend(conn.execute(_NAME_SEARCH_SUBSTRING_SQL, params))
 
-            return results
+            return [
+                {"cik": cik, "ticker": ticker, "name": title}
+                for cik, ticker, title in rows
+            ]
 
         except sqlite3.Error as e:
             logger.error(f"Company name search failed: {e}")
@@ -510,29 +972,42 @@ def get_db_stats() -> Dict[str, Any]:
     """Get database statistics."""
     from ..utils.utils import CACHE_DIR
 
+    db_exists = DB_PATH.exists()
     stats: Dict[str, Any] = {
-        "db_exists": DB_PATH.exists(),
+        "db_exists": db_exists,
         "db_companies_count": 0,
         "db_fts_enabled": False,
         "cache_dir": str(CACHE_DIR),
     }
 
-    if DB_PATH.exists():
+    if db_exists:
         try:
-            with get_db_connection(row_factory=False) as conn:
-                cursor = conn.execute("SELECT COUNT(*) FROM companies")
-                stats["db_companies_count"] = cursor.fetchone()[0]
+            with get_db_connection(row_factory=False, read_only=True) as conn:
+                tables = {
+                    name
+                    for (name,) in conn.execute(
+                        """
+                        SELECT name FROM sqlite_master
+                        WHERE type='table' AND name IN ('meta', 'companies_fts')
+                    """
+                    )
+                }
+
+                # The row count is recorded at load time; only count rows for
+                # databases that have not been loaded since meta was added
+                row = None
+                if "meta" in tables:
+                    row = conn.execute(
+                        "SELECT value FROM meta WHERE key = 'companies_count'"
+                    ).fetchone()
+                if row is None:
+                    row = conn.execute("SELECT COUNT(*) FROM companies").fetchone()
+                stats["db_companies_count"] = row[0]
 
                 # Check if FTS table exists and has data
-                cursor = conn.execute(
-                    """
-                    SELECT COUNT(*) FROM sqlite_master
-                    WHERE type='table' AND name='companies_fts'
-                """
-                )
-                if cursor.fetchone()[0] > 0:
-                    cursor = conn.execute("SELECT COUNT(*) FROM companies_fts")
-                    if cursor.fetchone()[0] > 0:
+                if "companies_fts" in tables:
+                    cursor = conn.execute("SELECT 1 FROM companies_fts LIMIT 1")
+                    if cursor.fetchone() is not None:
                         stats["db_fts_enabled"] = True
 
         except sqlite3.Error as e:
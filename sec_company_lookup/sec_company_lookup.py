@@ -5,8 +5,29 @@ This module provides fast, cached lookups between stock tickers, CIK identifiers
 and company names using the official SEC company_tickers.json dataset.
 """
 
+import re
 import sqlite3
-from typing import Dict, List, Union, Any, Sequence, Set, cast
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from itertools import accumulate, compress, count, islice, repeat
+from operator import contains
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NoReturn,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 import time
 import logging
 
@@ -19,18 +40,22 @@ from .types import (
     MultipleLookupResponse,
 )
 from .utils import (
+    CACHE_EXPIRY_HOURS,
     download_sec_data,
     is_cache_expired,
     load_from_cache,
+    load_packed_from_cache,
+    save_packed_to_cache,
     normalize_cik,
+    normalize_ciks,
     clear_cache_files,
 )
+from .cache import LRUKCache
+from .config import get_cache_budget_bytes
 from .db import (
-    load_data_to_db,
+    load_columns_to_db,
     search_companies_db,
-    get_companies_by_ciks_db,
     get_companies_by_company_names_db,
-    get_companies_by_tickers_db,
     search_companies_by_company_name_db,
     get_db_stats,
 )
@@ -39,74 +64,159 @@ from .db import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Splits lowercased names into the words indexed by by_word
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+# Largest word-index candidate set checked row by row; larger sets are
+# cheaper to find with a scan of the joined name buffer
+_WORD_CANDIDATES_MAX = 256
+
+
+def _empty_memory_cache() -> CacheStructure:
+    """Create an empty in-memory cache structure."""
+    return {
+        "ciks": array("q"),
+        "tickers": [],
+        "tickers_blob": "",
+        "tickers_starts": array("q", [0]),
+        "names": [],
+        "names_lower": [],
+        "names_blob": "",
+        "names_starts": array("q", [0]),
+        "names_sorted": [],
+        "rows": [],
+        "by_ticker": {},
+        "by_cik": {},
+        "by_name": {},
+        "by_word": {},
+    }
+
+
 # Global in-memory cache
-_memory_cache: CacheStructure = {
-    "companies": {},
-    "by_ticker": {},
-    "by_cik": {},
-    "by_name": {},
-}
+_memory_cache: CacheStructure = _empty_memory_cache()
 _last_update: float = 0
+# time.monotonic() value until which the loaded data is known to be fresh
+_expiry_deadline: float = 0.0
+# Longest stretch the deadline is trusted before the wall clock is consulted
+# again; monotonic time stops while the machine sleeps, the data's age does not
+_EXPIRY_RECHECK_SECONDS = 60.0
+_load_lock = threading.Lock()
+
+# Number of in-memory substring scans run, reported by get_cache_info
+_scan_counts: Dict[str, int] = {
+    "column": 0,
+    "ticker_buffer": 0,
+    "name_buffer": 0,
+    "word_index": 0,
+}
 
 
-def _load_data_to_memory(data: Dict[str, Any]) -> None:
-    """Load company data into memory cache with optimized structure supporting multiple matches."""
-    global _memory_cache, _last_update
-
-    # Use a more memory-efficient structure
-    # Store each company once and reference by ID
-    companies: Dict[str, CompanyData] = {}  # id -> company_data
-    ticker_index: Dict[str, str] = {}  # ticker -> id (one-to-one for tickers)
-    cik_index: Dict[int, List[str]] = {}  # cik -> list of ids (one-to-many for CIKs)
-    name_index: Dict[str, List[str]] = {}  # name -> list of ids (one-to-many for names)
-
-    company_id_counter = 0
-    for _, company_info in data.items():
-        if isinstance(company_info, dict):
-            # Type cast to handle the fact that we know the structure from SEC API
-            sec_info = cast(SECCompanyInfo, company_info)
-            cik_raw: str = sec_info.get("cik_str", "") or ""
-            ticker_raw: str = sec_info.get("ticker", "") or ""
-            ticker: str = ticker_raw.upper()
-            title: str = sec_info.get("title", "") or ""
-
-            cik_int = normalize_cik(cik_raw)
-
-            if cik_int is not None and ticker and title:
-                company_id = str(company_id_counter)
-                company_data: CompanyData = {
-                    "cik": cik_int,
-                    "ticker": ticker,
-                    "name": title,
-                }
+def _is_missing(company: Optional[CompanyData]) -> bool:
+    """True for memoized row lookups that did not find a company."""
+    return company is None
 
-                companies[company_id] = company_data
 
-                # Ticker index remains one-to-one (tickers should be unique)
-                ticker_index[ticker] = company_id
+# Memoized name lookups, invalidated whenever the memory cache changes. Entries
+# are keyed on the normalized name; failed lookups go to the short-lived
+# negative cache instead. Ticker and CIK lookups are single dict probes, which
+# are cheaper than a memo probe, so they are not memoized.
+_name_cache = LRUKCache(get_cache_budget_bytes(), name="name", is_negative=_is_missing)
 
-                # CIK index supports multiple companies per CIK
-                if cik_int not in cik_index:
-                    cik_index[cik_int] = []
-                cik_index[cik_int].append(company_id)
 
-                # Name index supports multiple companies per name (case insensitive)
-                name_lower = title.lower()
-                if name_lower not in name_index:
-                    name_index[name_lower] = []
-                name_index[name_lower].append(company_id)
+def _clear_lookup_caches() -> None:
+    """Drop memoized single-lookup results."""
+    _name_cache.clear()
 
-                company_id_counter += 1
+
+def _load_data_to_memory(data: Dict[str, Any]) -> None:
+    """Load company data into memory cache as parallel column arrays plus indexes."""
+    # Struct-of-arrays layout: row i is (ciks[i], tickers[i], names[i])
+    ciks = array("q")
+    tickers: List[str] = []
+    names: List[str] = []
+
+    for company_info in data.values():
+        if not isinstance(company_info, dict):
+            continue
+        # Type cast to handle the fact that we know the structure from SEC API
+        sec_info = cast(SECCompanyInfo, company_info)
+        ticker = sec_info.get("ticker")
+        title = sec_info.get("title")
+        if not (ticker and title):
+            continue
+
+        cik_int = normalize_cik(sec_info.get("cik_str"))
+        if cik_int is not None:
+            ciks.append(cik_int)
+            tickers.append(ticker.upper())
+            names.append(title)
+
+    _load_columns_to_memory(ciks, tickers, names)
+
+
+def _load_columns_to_memory(
+    ciks: "array[int]", tickers: List[str], names: List[str]
+) -> None:
+    """Install company columns as the memory cache and build lookup indexes."""
+    global _memory_cache
+
+    # A refresh that brought the same rows keeps the built indexes, the shared
+    # row dicts and the memoized lookups; only the freshness deadline moves
+    current = _memory_cache
+    if (
+        len(tickers) == len(current["tickers"])
+        and ciks == current["ciks"]
+        and tickers == current["tickers"]
+        and names == current["names"]
+    ):
+        _set_last_update(time.time())
+        logger.debug("SEC data unchanged; keeping the memory cache")
+        return
+
+    # Interned tickers are shared by the column, the ticker index and every
+    # returned row, and compare by identity against other interned strings
+    tickers = list(map(sys.intern, tickers))
+    names_lower = [name.lower() for name in names]
+    tickers_blob, tickers_starts = _join_column(tickers)
+    names_blob, names_starts = _join_column(names_lower)
+    # Ticker index remains one-to-one (tickers should be unique; last row wins)
+    ticker_index: Dict[str, int] = dict(zip(tickers, count()))
+
+    # CIK and (case insensitive) name indexes map to every matching row. Rows
+    # are grouped column by column; the defaultdicts are frozen into plain
+    # dicts so lookups of missing keys never insert empty lists.
+    cik_groups: "defaultdict[int, List[int]]" = defaultdict(list)
+    for company_id, cik_int in enumerate(ciks):
+        cik_groups[cik_int].append(company_id)
+    name_groups: "defaultdict[str, List[int]]" = defaultdict(list)
+    word_groups: "defaultdict[str, List[int]]" = defaultdict(list)
+    for company_id, name_lower in enumerate(names_lower):
+        name_groups[name_lower].append(company_id)
+        for word in set(_NON_WORD.split(name_lower)):
+            word_groups[word].append(company_id)
+    word_groups.pop("", None)
+    cik_index: Dict[int, List[int]] = dict(cik_groups)
+    name_index: Dict[str, List[int]] = dict(name_groups)
 
     _memory_cache = {
-        "companies": companies,
+        "ciks": ciks,
+        "tickers": tickers,
+        "tickers_blob": tickers_blob,
+        "tickers_starts": tickers_starts,
+        "names": names,
+        "names_lower": names_lower,
+        "names_blob": names_blob,
+        "names_starts": names_starts,
+        "names_sorted": sorted(name_index),
+        "rows": [None] * len(tickers),
         "by_ticker": ticker_index,
         "by_cik": cik_index,
         "by_name": name_index,
+        "by_word": dict(word_groups),
     }
 
-    _last_update = time.time()
-    logger.info(f"Loaded {len(companies)} companies into optimized memory cache")
+    _set_last_update(time.time())
+    _clear_lookup_caches()
+    logger.info(f"Loaded {len(tickers)} companies into optimized memory cache")
 
     # Log statistics about multiple matches
     multi_cik_count = sum(1 for ids in cik_index.values() if len(ids) > 1)
@@ -117,24 +227,268 @@ def _load_data_to_memory(data: Dict[str, Any]) -> None:
     )
 
 
-def ensure_data_loaded() -> None:
-    """Ensure data is loaded, updating if necessary. Public for API layer."""
+def _join_column(column: List[str]) -> Tuple[str, "array[int]"]:
+    """
+    Join a string column into one NUL-separated string for buffer-wide search.
+
+    Returns the string and the offset of each row into it, with a final
+    sentinel one past the end of the string.
+    """
+    starts = array("q", [0])
+    starts.extend(accumulate(len(value) + 1 for value in column))
+    return "\0".join(column), starts
+
+
+def _scan_column(column: Iterable[str], needle: str, limit: int) -> List[int]:
+    """
+    Return up to limit row ids whose column value contains needle.
+
+    The containment test and id selection run in C (map/compress), so the
+    per-row work never enters the Python interpreter loop.
+    """
+    _scan_counts["column"] += 1
+    hits = compress(count(), map(contains, column, repeat(needle)))
+    return list(islice(hits, limit))
+
+
+def _scan_joined(
+    column: List[str],
+    blob: str,
+    starts: "array[int]",
+    needle: str,
+    limit: int,
+    counter: str,
+) -> List[int]:
+    """
+    Return up to limit row ids whose column value contains needle.
+
+    Searches blob, the column joined by _join_column, with str.find, which
+    skips over non-matching rows entirely in C. Each hit is mapped back to its
+    row with a binary search on the row offsets, and the next search resumes
+    at the following row so a row is reported at most once.
+    """
+    if not column or "\0" in needle:
+        return _scan_column(column, needle, limit)
+
+    _scan_counts[counter] += 1
+    company_ids: List[int] = []
+    position = blob.find(needle)
+    while position != -1 and len(company_ids) < limit:
+        company_id = bisect_right(starts, position) - 1
+        company_ids.append(company_id)
+        position = blob.find(needle, starts[company_id + 1])
+    return company_ids
+
+
+def _scan_tickers(needle: str, limit: int) -> List[int]:
+    """Return up to limit row ids whose (uppercase) ticker contains needle."""
+    cache = _memory_cache
+    return _scan_joined(
+        cache["tickers"],
+        cache["tickers_blob"],
+        cache["tickers_starts"],
+        needle,
+        limit,
+        "ticker_buffer",
+    )
+
+
+def _word_candidates(needle: str) -> Optional[Set[int]]:
+    """
+    Return the row ids whose name could contain needle, or None if unknown.
+
+    Only the words with a separator on both sides inside needle must be whole
+    words of a matching name; the first and last pieces may be fragments of
+    longer words, so they are not looked up.
+    """
+    words = _NON_WORD.split(needle)[1:-1]
+    if not words:
+        return None
+
+    by_word = _memory_cache["by_word"]
+    postings = sorted((by_word.get(word, ()) for word in words), key=len)
+    candidate_ids = set(postings[0])
+    for posting in postings[1:]:
+        candidate_ids.intersection_update(posting)
+    return candidate_ids
+
+
+def _scan_names(needle: str, limit: int) -> List[int]:
+    """
+    Return up to limit row ids whose lowercased name contains needle.
+
+    When the word index narrows the search to a few rows only those are
+    checked; otherwise the joined name buffer is scanned. The scan runs in
+    C and takes a fraction of a millisecond, so no character n-gram index is
+    kept: building one would add ~100 ms and ~5 MB to every load.
+    """
+    cache = _memory_cache
+    candidate_ids = _word_candidates(needle)
+    if candidate_ids is not None and len(candidate_ids) <= _WORD_CANDIDATES_MAX:
+        _scan_counts["word_index"] += 1
+        names_lower = cache["names_lower"]
+        hits = (i for i in sorted(candidate_ids) if needle in names_lower[i])
+        return list(islice(hits, limit))
+
+    return _scan_joined(
+        cache["names_lower"],
+        cache["names_blob"],
+        cache["names_starts"],
+        needle,
+        limit,
+        "name_buffer",
+    )
+
+
+def _prefix_name_ids(prefix: str) -> Iterator[List[int]]:
+    """
+    Yield the row ids of each distinct lowercased name starting with prefix.
+
+    Names are visited in sorted order; a binary search on names_sorted finds
+    the first candidate, so only matching names are ever touched.
+    """
+    names_sorted = _memory_cache["names_sorted"]
+    by_name = _memory_cache["by_name"]
+    for index in range(bisect_left(names_sorted, prefix), len(names_sorted)):
+        name_lower = names_sorted[index]
+        if not name_lower.startswith(prefix):
+            break
+        yield by_name[name_lower]
+
+
+class _ReadOnlyRow(Dict[str, Any]):
+    """
+    Company row shared between the memory cache and every caller.
+
+    A plain dict for reading, comparing and JSON encoding, but mutation raises
+    TypeError so one caller cannot change what later lookups return. dict(row)
+    and copy.copy(row) give a mutable copy.
+    """
+
+    __slots__ = ()
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError(
+            "company rows are shared with the cache; copy with dict(row) to modify"
+        )
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Copies and unpickled rows are plain, mutable dicts
+        return dict, (dict(self),)
+
+
+def _company(company_id: int) -> CompanyData:
+    """
+    Return the company row at company_id.
+
+    Each row is built from the column arrays on first access and then shared
+    by every later lookup; it is read-only so callers cannot corrupt the cache.
+    """
+    cache = _memory_cache
+    row = cache["rows"][company_id]
+    if row is None:
+        row = cast(
+            CompanyData,
+            _ReadOnlyRow(
+                cik=cache["ciks"][company_id],
+                ticker=cache["tickers"][company_id],
+                name=cache["names"][company_id],
+            ),
+        )
+        cache["rows"][company_id] = row
+    return row
+
+
+def _companies(company_ids: Iterable[int]) -> List[CompanyData]:
+    """
+    Return the shared company rows for company_ids, in order.
+
+    The rows column is bound once for the whole batch; rows that have not
+    been built yet are filled in by _company.
+    """
+    rows = _memory_cache["rows"]
+    return [rows[company_id] or _company(company_id) for company_id in company_ids]
+
+
+def _set_last_update(timestamp: float) -> None:
+    """Record when the loaded data was fetched and when it goes stale."""
     global _last_update
 
-    if not _memory_cache or is_cache_expired(_last_update):
-        cached_data, cached_timestamp = load_from_cache()
-        if cached_data:
-            _load_data_to_memory(cached_data)
-            _last_update = cached_timestamp
-        else:
-            try:
-                if not update_data_impl():
-                    raise RuntimeError(
-                        "Unable to load SEC company data. Please check your internet connection."
-                    )
-            except ValueError:
-                # Re-raise configuration errors (like missing User-Agent)
-                raise
+    _last_update = timestamp
+    _refresh_expiry_deadline()
+
+
+def _refresh_expiry_deadline() -> None:
+    """Derive the monotonic freshness deadline from the data's wall-clock age."""
+    global _expiry_deadline
+
+    if _last_update:
+        # Convert the wall-clock age into a monotonic deadline, so the hot
+        # path in ensure_data_loaded is a single float comparison
+        remaining = CACHE_EXPIRY_HOURS * 3600 - (time.time() - _last_update)
+        _expiry_deadline = time.monotonic() + min(remaining, _EXPIRY_RECHECK_SECONDS)
+    else:
+        _expiry_deadline = 0.0
+
+
+def ensure_data_loaded() -> None:
+    """
+    Ensure data is loaded, updating if necessary. Public for API layer.
+
+    Data is loaded lazily on first use rather than at import time. Loading runs
+    under a lock so concurrent first lookups only read or download the data once.
+    """
+    if time.monotonic() < _expiry_deadline:
+        return
+    if _memory_cache["ciks"] and not is_cache_expired(_last_update):
+        _refresh_expiry_deadline()
+        return
+
+    with _load_lock:
+        # Another thread may have finished loading while we waited
+        if _memory_cache["ciks"] and not is_cache_expired(_last_update):
+            return
+        _load_data()
+
+
+def _load_data() -> None:
+    """Load data from the file cache, downloading it if missing or expired."""
+    # The packed column file skips JSON parsing entirely
+    columns, packed_timestamp = load_packed_from_cache()
+    if columns:
+        _load_columns_to_memory(*columns)
+        _set_last_update(packed_timestamp)
+        logger.debug("Using existing packed SEC data.")
+        return
+
+    cached_data, cached_timestamp = load_from_cache()
+    if cached_data:
+        _load_data_to_memory(cached_data)
+        del cached_data  # Release the parsed JSON before writing the packed file
+        _save_packed_columns(cached_timestamp)
+        _set_last_update(cached_timestamp)
+        logger.debug("Using existing cached SEC data.")
+        return
+
+    logger.info("No cached data found or cache expired. Downloading latest SEC data...")
+    try:
+        if not update_data_impl():
+            raise RuntimeError(
+                "Unable to load SEC company data. Please check your internet connection."
+            )
+    except ValueError:
+        # Re-raise configuration errors (like missing User-Agent)
+        raise
+    logger.info("SEC data successfully downloaded and cached.")
+
+
+def _save_packed_columns(last_update: Optional[float] = None) -> None:
+    """Persist the in-memory columns so the next cold start can skip JSON parsing."""
+    cache = _memory_cache
+    save_packed_to_cache(cache["ciks"], cache["tickers"], cache["names"], last_update)
 
 
 def update_data_impl() -> bool:
@@ -145,9 +499,19 @@ def update_data_impl() -> bool:
         bool: True if data was successfully updated, False otherwise.
     """
     try:
-        data = download_sec_data()
-        _load_data_to_memory(data)
-        load_data_to_db(data)  # Database for search operations
+        # The parsed JSON is only referenced by this call, so it is freed as
+        # soon as the columns are built instead of staying alive (alongside
+        # them) while the packed file and database are written
+        _load_data_to_memory(download_sec_data())
+        _save_packed_columns()
+        # Database for search operations, fed from the columns parsed above.
+        # This stays on the calling thread: the body must be complete before
+        # it can be parsed, and overlapping the insert with the index build
+        # above gains little since both mostly hold the GIL.
+        cache = _memory_cache
+        load_columns_to_db(
+            cache["ciks"], cache["tickers"], cache["names"], cache["names_lower"]
+        )
 
         return True
     except ValueError as e:
@@ -169,14 +533,9 @@ def get_company_by_ticker_single(ticker: str) -> SingleLookupResponse:
         }
 
     ensure_data_loaded()
-    company_id = _memory_cache["by_ticker"].get(
-        ticker.strip().upper()
-    )  # type: ignore[attr-defined]
+    company_id = _memory_cache["by_ticker"].get(ticker.strip().upper())
     if company_id is not None:
-        return {
-            "success": True,
-            "data": _memory_cache["companies"][company_id],  # type: ignore[typeddict-item]
-        }
+        return {"success": True, "data": _company(company_id)}
     return {
         "success": False,
         "error": f"Ticker '{ticker}' not found",
@@ -184,12 +543,25 @@ def get_company_by_ticker_single(ticker: str) -> SingleLookupResponse:
     }
 
 
+def find_company_by_ticker(ticker: str) -> Optional[CompanyData]:
+    """Internal: Single ticker lookup returning the bare company row or None."""
+    if not ticker or not ticker.strip():
+        return None
+
+    ensure_data_loaded()
+    company_id = _memory_cache["by_ticker"].get(ticker.strip().upper())
+    return None if company_id is None else _company(company_id)
+
+
 def get_companies_by_tickers_batch(
     tickers: Sequence[str],
 ) -> Dict[str, BatchLookupResponse]:
     """
     Backend implementation: Batch ticker lookup.
 
+    Tickers are resolved with dict probes against the in-memory ticker index;
+    the database is not involved since it could not answer anything faster.
+
     Args:
         tickers: Sequence of ticker strings
 
@@ -200,12 +572,8 @@ def get_companies_by_tickers_batch(
         return {}
 
     ensure_data_loaded()
+    by_ticker = _memory_cache["by_ticker"]
 
-    # Normalize tickers and track invalid inputs
-    ticker_map = {t.strip().upper(): t for t in tickers if t and t.strip()}
-    normalized_tickers = list(ticker_map.keys())
-
-    # Handle empty/invalid tickers
     results: Dict[str, BatchLookupResponse] = {}
     for t in tickers:
         if not t or not t.strip():
@@ -214,31 +582,17 @@ def get_companies_by_tickers_batch(
                 "error": "Invalid ticker: empty or whitespace",
                 "error_code": "INVALID_INPUT",
             }
+            continue
 
-    # Use database for batch operations
-    try:
-        db_results = get_companies_by_tickers_db(normalized_tickers)
-        # Map back to original ticker format with structured responses
-        for ticker_upper, companies in db_results.items():
-            original_ticker = ticker_map[ticker_upper]
-            if companies:
-                results[original_ticker] = {
-                    "success": True,
-                    "data": cast(CompanyData, companies[0]),
-                }
-            else:
-                results[original_ticker] = {
-                    "success": False,
-                    "error": f"Ticker '{original_ticker}' not found",
-                    "error_code": "NOT_FOUND",
-                }
-    except (sqlite3.Error, Exception) as e:
-        logger.warning(f"Database ticker lookup failed: {e}")
-        # Fallback to individual memory lookups
-        for ticker_upper in normalized_tickers:
-            original_ticker = ticker_map[ticker_upper]
-            single_response = get_company_by_ticker_single(ticker_upper)
-            results[original_ticker] = cast(BatchLookupResponse, single_response)
+        company_id = by_ticker.get(t.strip().upper())
+        if company_id is not None:
+            results[t] = {"success": True, "data": _company(company_id)}
+        else:
+            results[t] = {
+                "success": False,
+                "error": f"Ticker '{t}' not found",
+                "error_code": "NOT_FOUND",
+            }
 
     return results
 
@@ -254,11 +608,7 @@ def get_company_by_cik_single(cik: Union[int, str]) -> MultipleLookupResponse:
         }
 
     ensure_data_loaded()
-    company_ids = _memory_cache["by_cik"].get(cik_int, [])  # type: ignore[attr-defined]
-    company_list: List[CompanyData] = [
-        _memory_cache["companies"][company_id] for company_id in company_ids
-    ]  # type: ignore[misc]
-
+    company_list = _companies(_memory_cache["by_cik"].get(cik_int, ()))
     if company_list:
         return {"success": True, "data": company_list}
     return {
@@ -268,12 +618,25 @@ def get_company_by_cik_single(cik: Union[int, str]) -> MultipleLookupResponse:
     }
 
 
+def find_companies_by_cik(cik: Union[int, str]) -> List[CompanyData]:
+    """Internal: Single CIK lookup returning the bare company rows."""
+    cik_int = normalize_cik(cik)
+    if cik_int is None:
+        return []
+
+    ensure_data_loaded()
+    return _companies(_memory_cache["by_cik"].get(cik_int, ()))
+
+
 def get_companies_by_ciks_batch(
     ciks: Sequence[Union[int, str]],
 ) -> Dict[Union[int, str], MultipleLookupResponse]:
     """
     Backend implementation: Batch CIK lookup.
 
+    CIKs are normalized in one pass and resolved with dict probes against the
+    in-memory CIK index; like ticker batches, the database is not involved.
+
     Args:
         ciks: Sequence of CIK identifiers
 
@@ -284,63 +647,34 @@ def get_companies_by_ciks_batch(
         return {}
 
     ensure_data_loaded()
+    by_cik = _memory_cache["by_cik"]
 
-    # Normalize CIKs
-    normalized_ciks: List[int] = []
-    cik_map: Dict[int, Union[int, str]] = {}
-    invalid_ciks: List[Union[int, str]] = []
-
-    for c in ciks:
-        cik_int = normalize_cik(c)
-        if cik_int is not None:
-            normalized_ciks.append(cik_int)
-            cik_map[cik_int] = c
-        else:
-            invalid_ciks.append(c)
-
-    # Initialize results with errors for invalid CIKs
+    # Spellings of the same CIK (320193, "0000320193") share one resolved list
+    resolved: Dict[int, List[CompanyData]] = {}
     results: Dict[Union[int, str], MultipleLookupResponse] = {}
-    for c in invalid_ciks:
-        results[c] = {
-            "success": False,
-            "error": f"Invalid CIK: '{c}' could not be normalized",
-            "error_code": "INVALID_INPUT",
-        }
-
-    # Use database for batch operations
-    try:
-        db_results = get_companies_by_ciks_db(normalized_ciks)
-        # Map back to original CIK format with structured responses
-        for cik_int, companies in db_results.items():
-            original_cik = cik_map[cik_int]
-            company_list = [cast(CompanyData, c) for c in companies]
-            if company_list:
-                results[original_cik] = {"success": True, "data": company_list}
-            else:
-                results[original_cik] = {
-                    "success": False,
-                    "error": f"CIK '{original_cik}' not found",
-                    "error_code": "NOT_FOUND",
-                }
-
-        # Ensure all valid CIKs are in results (even if not in db_results)
-        for original_cik in cik_map.values():
-            if original_cik not in results:
-                results[original_cik] = {
-                    "success": False,
-                    "error": f"CIK '{original_cik}' not found",
-                    "error_code": "NOT_FOUND",
-                }
+    for c, cik_int in zip(ciks, normalize_ciks(ciks)):
+        if cik_int is None:
+            results[c] = {
+                "success": False,
+                "error": f"Invalid CIK: '{c}' could not be normalized",
+                "error_code": "INVALID_INPUT",
+            }
+            continue
+
+        company_list = resolved.get(cik_int)
+        if company_list is None:
+            company_list = resolved[cik_int] = _companies(by_cik.get(cik_int, ()))
+        if company_list:
+            # Each spelling gets its own list; only the rows are shared
+            results[c] = {"success": True, "data": list(company_list)}
+        else:
+            results[c] = {
+                "success": False,
+                "error": f"CIK '{c}' not found",
+                "error_code": "NOT_FOUND",
+            }
 
-        return results
-    except (sqlite3.Error, Exception) as e:
-        logger.warning(f"Database CIK lookup failed: {e}")
-        # Fallback to individual memory lookups
-        for cik_int in normalized_ciks:
-            original_cik = cik_map[cik_int]
-            single_response = get_company_by_cik_single(cik_map[cik_int])
-            results[original_cik] = single_response
-        return results
+    return results
 
 
 def get_company_by_name_single(name: str, fuzzy: bool = False) -> SingleLookupResponse:
@@ -353,65 +687,53 @@ def get_company_by_name_single(name: str, fuzzy: bool = False) -> SingleLookupRe
         }
 
     ensure_data_loaded()
-    name_stripped = name.strip()
-    name_lower = name_stripped.lower()
-
-    # Try exact match first
-    company_ids = _memory_cache["by_name"].get(name_lower, [])  # type: ignore[attr-defined]
-    if len(company_ids) == 1:
-        # Exact match found with single result
-        return {
-            "success": True,
-            "data": _memory_cache["companies"][company_ids[0]],  # type: ignore[index]
-        }
-    elif len(company_ids) > 1:
-        # Multiple exact matches - return first one
+    # Memoized on the normalized name so case and whitespace variants of the
+    # same query share one cache entry; the error still echoes the input
+    company = _find_company_by_name(name.strip().lower(), fuzzy)
+    if company is not None:
+        return {"success": True, "data": company}
+    if fuzzy:
         return {
-            "success": True,
-            "data": _memory_cache["companies"][company_ids[0]],  # type: ignore[index]
+            "success": False,
+            "error": f"Company name '{name}' does not match any name",
+            "error_code": "NOT_FOUND",
         }
+    return {
+        "success": False,
+        "error": f"Company name '{name}' not found",
+        "error_code": "NOT_FOUND",
+    }
+
+
+@_name_cache.memoize
+def _find_company_by_name(name_lower: str, fuzzy: bool) -> Optional[CompanyData]:
+    """Memoized name lookup of a stripped, lowercased name in the memory cache."""
+    # Try exact match first; with several exact matches the first one wins
+    company_ids = _memory_cache["by_name"].get(name_lower, ())
+    if company_ids:
+        return _company(company_ids[0])
 
     # No exact match - progressively shorten name from the end until we find exactly one result
     if fuzzy:
-        words = name_stripped.split()
+        words = name_lower.split()
 
         while len(words) > 0:
-            # Try current shortened name
-            shortened = " ".join(words).lower()
-            matching_companies: List[CompanyData] = []
-
-            for cached_name, comp_ids in _memory_cache["by_name"].items():  # type: ignore[attr-defined]
-                if shortened in cached_name:
-                    for comp_id in comp_ids:
-                        matching_companies.append(_memory_cache["companies"][comp_id])  # type: ignore[index]
+            # Try current shortened name; two matching rows are enough to know
+            # the result is ambiguous
+            matching_ids = _scan_names(" ".join(words), 2)
 
             # If we found exactly one result, return it
-            if len(matching_companies) == 1:
-                return {"success": True, "data": matching_companies[0]}
+            if len(matching_ids) == 1:
+                return _company(matching_ids[0])
 
             # If we found multiple results, quit - shortening further won't help
-            if len(matching_companies) > 1:
-                return {
-                    "success": False,
-                    "error": f"Company name '{name}' does not match any name",
-                    "error_code": "NOT_FOUND",
-                }
+            if len(matching_ids) > 1:
+                return None
 
             # Remove last word and try again
             words.pop()
 
-        # If we've exhausted all words without finding any match, return error
-        return {
-            "success": False,
-            "error": f"Company name '{name}' does not match any name",
-            "error_code": "NOT_FOUND",
-        }
-
-    return {
-        "success": False,
-        "error": f"Company name '{name}' not found",
-        "error_code": "NOT_FOUND",
-    }
+    return None
 
 
 def get_companies_by_names_batch(
@@ -450,10 +772,9 @@ def get_companies_by_names_batch(
     try:
         db_results = get_companies_by_company_names_db(valid_names, fuzzy=fuzzy)
         for name, companies in db_results.items():
-            company_list = [cast(CompanyData, c) for c in companies]
-            if company_list:
+            if companies:
                 # Return only the first (best) match
-                results[name] = {"success": True, "data": company_list[0]}
+                results[name] = {"success": True, "data": companies[0]}
             else:
                 results[name] = {
                     "success": False,
@@ -462,13 +783,19 @@ def get_companies_by_names_batch(
                 }
 
         # Ensure all valid names are in results
-        for name in valid_names:
-            if name not in results:
-                results[name] = {
-                    "success": False,
-                    "error": f"Company name '{name}' not found",
-                    "error_code": "NOT_FOUND",
+        missing_names = set(valid_names) - results.keys()
+        if missing_names:
+            results.update(
+                {
+                    name: {
+                        "success": False,
+                        "error": f"Company name '{name}' not found",
+                        "error_code": "NOT_FOUND",
+                    }
+                    for name in valid_names
+                    if name in missing_names
                 }
+            )
 
         return results
     except (sqlite3.Error, Exception) as e:
@@ -500,23 +827,27 @@ def search_companies_impl(
 
     # First check in-memory cache for exact matches
     results: List[CompanyData] = []
-    seen_ids: Set[str] = set()
+    seen_ids: Set[int] = set()
     query_stripped = query.strip()
     query_upper = query_stripped.upper()
     query_lower = query_stripped.lower()
 
+    cache = _memory_cache
+
     # Check for exact ticker match first
-    company_id = _memory_cache["by_ticker"].get(query_upper)  # type: ignore[attr-defined]
+    company_id = cache["by_ticker"].get(query_upper)
     if company_id is not None:
-        results.append(_memory_cache["companies"][company_id])  # type: ignore[index]
+        results.append(_company(company_id))
         seen_ids.add(company_id)
 
     # Check for exact company name match
-    company_ids = _memory_cache["by_name"].get(query_lower, [])  # type: ignore[attr-defined]
-    for company_id in company_ids:
-        if company_id not in seen_ids:
-            results.append(_memory_cache["companies"][company_id])  # type: ignore[index]
-            seen_ids.add(company_id)
+    company_ids = cache["by_name"].get(query_lower, ())
+    results.extend(
+        _companies(
+            company_id for company_id in company_ids if company_id not in seen_ids
+        )
+    )
+    seen_ids.update(company_ids)
 
     # If we have enough results from exact matches and fuzzy is disabled, return early
     if len(results) >= limit and not fuzzy:
@@ -524,6 +855,8 @@ def search_companies_impl(
 
     # If we need more results or fuzzy is enabled, use database search
     if len(results) < limit:
+        # Results are identified by (cik, ticker) for de-duplication
+        seen_keys = {(r["cik"], r["ticker"]) for r in results}
         try:
             db_results = search_companies_db(query_stripped, limit, fuzzy)
 
@@ -531,12 +864,9 @@ def search_companies_impl(
             for db_result in db_results:
                 if len(results) >= limit:
                     break
-                # Check if this result is already in our results (by cik and ticker)
-                is_duplicate = any(
-                    r["cik"] == db_result["cik"] and r["ticker"] == db_result["ticker"]
-                    for r in results
-                )
-                if not is_duplicate:
+                key = (db_result["cik"], db_result["ticker"])
+                if key not in seen_keys:
+                    seen_keys.add(key)
                     results.append(db_result)
 
         except sqlite3.Error as e:
@@ -550,12 +880,9 @@ def search_companies_impl(
             for mem_result in memory_results:
                 if len(results) >= limit:
                     break
-                is_duplicate = any(
-                    r["cik"] == mem_result["cik"]
-                    and r["ticker"] == mem_result["ticker"]
-                    for r in results
-                )
-                if not is_duplicate:
+                key = (mem_result["cik"], mem_result["ticker"])
+                if key not in seen_keys:
+                    seen_keys.add(key)
                     results.append(mem_result)
 
     return results[:limit]
@@ -566,31 +893,30 @@ def _search_companies_memory(
 ) -> List[CompanyData]:
     """Fallback in-memory search for companies."""
     results: List[CompanyData] = []
-    seen_ids: Set[str] = set()
     query_lower = query.lower()
-    companies = _memory_cache["companies"]
 
     if fuzzy:
-        # Fuzzy search: partial matching
-        # Search by ticker first
-        for ticker, company_id in _memory_cache["by_ticker"].items():  # type: ignore[attr-defined]
-            if query_lower in ticker.lower() and company_id not in seen_ids:
-                results.append(companies[company_id])  # type: ignore[index]
-                seen_ids.add(company_id)
-                if len(results) >= limit:
+        # Fuzzy search: partial matching, scanning the ticker column first
+        # (tickers are stored uppercase, so compare against the uppercased query)
+        matched = _scan_tickers(query.upper(), limit)
+
+        # Names starting with the query come next, as in the database
+        # ranking; the sorted name list answers those with a binary search
+        if len(matched) < limit:
+            seen_ids: Set[int] = set(matched)
+            for company_ids in _prefix_name_ids(query_lower):
+                matched.extend(i for i in company_ids if i not in seen_ids)
+                if len(matched) >= limit:
                     break
+            seen_ids.update(matched)
 
-        # Search by company name if we need more results
-        if len(results) < limit:
-            for name, company_ids in _memory_cache["by_name"].items():  # type: ignore[attr-defined]
-                for company_id in company_ids:
-                    if company_id not in seen_ids and query_lower in name:
-                        results.append(companies[company_id])  # type: ignore[index]
-                        seen_ids.add(company_id)
-                        if len(results) >= limit:
-                            break
-                if len(results) >= limit:
-                    break
+            # Scan the lowercased name column only if we still need more
+            if len(matched) < limit:
+                name_hits = _scan_names(query_lower, limit + len(matched))
+                matched.extend(i for i in name_hits if i not in seen_ids)
+            del matched[limit:]
+
+        results = _companies(matched)
     else:
         # Exact matching only - already handled in the main function
         # This case should rarely be reached since exact matches are checked first
@@ -599,6 +925,73 @@ def _search_companies_memory(
     return results
 
 
+def search_companies_multi_impl(
+    queries: Sequence[str], limit: int = 10, fuzzy: bool = True
+) -> Dict[str, List[CompanyData]]:
+    """
+    Backend implementation: Search for several queries against the memory cache.
+
+    Queries that normalize to the same text share a single scan, so loops over
+    overlapping keywords do not rescan the columns.
+
+    Args:
+        queries: Sequence of search queries
+        limit: Maximum number of results to return per query
+        fuzzy: If True, perform fuzzy matching; if False, exact matching only
+
+    Returns:
+        Dict mapping each query to its list of matching company dictionaries
+    """
+    if not queries:
+        return {}
+
+    ensure_data_loaded()
+
+    results: Dict[str, List[CompanyData]] = {}
+    ids_by_query: Dict[str, List[int]] = {}
+    for query in queries:
+        if query in results:
+            continue
+        query_stripped = query.strip() if query else ""
+        key = query_stripped.lower()
+        if key not in ids_by_query:
+            ids_by_query[key] = (
+                _search_ids_memory(query_stripped, limit, fuzzy) if key else []
+            )
+        results[query] = _companies(ids_by_query[key])
+
+    return results
+
+
+def _search_ids_memory(query: str, limit: int, fuzzy: bool) -> List[int]:
+    """Rank row ids for query: exact ticker, exact name, then ticker and name scans."""
+    cache = _memory_cache
+    query_upper = query.upper()
+    query_lower = query.lower()
+
+    matched: List[int] = []
+    seen_ids: Set[int] = set()
+
+    def add(company_ids: Iterable[int]) -> None:
+        for company_id in company_ids:
+            if company_id not in seen_ids:
+                seen_ids.add(company_id)
+                matched.append(company_id)
+
+    company_id = cache["by_ticker"].get(query_upper)
+    if company_id is not None:
+        add((company_id,))
+    add(cache["by_name"].get(query_lower, ()))
+
+    if fuzzy:
+        if len(matched) < limit:
+            add(_scan_tickers(query_upper, limit + len(matched)))
+        if len(matched) < limit:
+            add(_scan_names(query_lower, limit + len(matched)))
+
+    return matched[:limit]
+
+
 def search_companies_by_company_name_impl(
     company_name_query: str, limit: int = 10, fuzzy: bool = True
 ) -> List[CompanyData]:
@@ -618,24 +1011,38 @@ def search_companies_by_company_name_impl(
 
     ensure_data_loaded()
 
-    # First check in-memory cache for exact matches
-    results: List[CompanyData] = []
-    seen_ids: Set[str] = set()
     query_stripped = company_name_query.strip()
     query_lower = query_stripped.lower()
 
-    # Check for exact company name match first
-    company_ids = _memory_cache["by_name"].get(query_lower, [])  # type: ignore[attr-defined]
-    for company_id in company_ids:
-        results.append(_memory_cache["companies"][company_id])  # type: ignore[index]
-        seen_ids.add(company_id)
+    # First check in-memory cache for exact company name matches
+    company_ids = _memory_cache["by_name"].get(query_lower, ())
+    results: List[CompanyData] = _companies(company_ids)
+    seen_ids: Set[int] = set(company_ids)
 
     # If we have enough results from exact matches and fuzzy is disabled, return early
     if len(results) >= limit and not fuzzy:
         return results[:limit]
 
+    # Names starting with the query rank right after exact matches (ordered by
+    # ticker, like the database). When they fill the limit, the database's
+    # substring matches could never be returned, so skip the round trip.
+    if fuzzy and len(results) < limit:
+        prefix_ids = [
+            company_id
+            for company_ids in _prefix_name_ids(query_lower)
+            for company_id in company_ids
+            if company_id not in seen_ids
+        ]
+        if len(results) + len(prefix_ids) >= limit:
+            tickers = _memory_cache["tickers"]
+            prefix_ids.sort(key=tickers.__getitem__)
+            results.extend(_companies(prefix_ids[: limit - len(results)]))
+            return results
+
     # If we need more results or fuzzy is enabled, use database search
     if len(results) < limit:
+        # Results are identified by (cik, ticker) for de-duplication
+        seen_keys = {(r["cik"], r["ticker"]) for r in results}
         try:
             db_results = search_companies_by_company_name_db(
                 query_stripped, limit, fuzzy
@@ -645,13 +1052,10 @@ def search_companies_by_company_name_impl(
             for db_result in db_results:
                 if len(results) >= limit:
                     break
-                # Check if this result is already in our results (by cik and ticker)
-                is_duplicate = any(
-                    r["cik"] == db_result["cik"] and r["ticker"] == db_result["ticker"]
-                    for r in results
-                )
-                if not is_duplicate:
-                    results.append(cast(CompanyData, db_result))
+                key = (db_result["cik"], db_result["ticker"])
+                if key not in seen_keys:
+                    seen_keys.add(key)
+                    results.append(db_result)
 
         except sqlite3.Error as e:
             logger.warning(
@@ -663,29 +1067,20 @@ def search_companies_by_company_name_impl(
                 fallback_result = fallback_response["data"]
 
                 # Add fallback result if not duplicate and we haven't hit limit
-                if len(results) < limit:
-                    is_duplicate = any(
-                        r["cik"] == fallback_result["cik"]
-                        and r["ticker"] == fallback_result["ticker"]
-                        for r in results
-                    )
-                    if not is_duplicate:
-                        results.append(fallback_result)
+                key = (fallback_result["cik"], fallback_result["ticker"])
+                if len(results) < limit and key not in seen_keys:
+                    results.append(fallback_result)
 
     return results[:limit]
 
 
 def clear_cache_impl() -> None:
     """Backend implementation: Clear all cached data including database."""
-    global _memory_cache, _last_update
+    global _memory_cache
 
-    _memory_cache = {
-        "companies": {},
-        "by_ticker": {},
-        "by_cik": {},
-        "by_name": {},
-    }
-    _last_update = 0
+    _memory_cache = _empty_memory_cache()
+    _set_last_update(0)
+    _clear_lookup_caches()
 
     # Remove cache files
     clear_cache_files()
@@ -705,8 +1100,11 @@ def get_cache_info_impl() -> Dict[str, Any]:
     # Get database stats
     db_stats = get_db_stats()
 
+    cache = _memory_cache
+    companies = len(cache["ciks"])
+
     return {
-        "companies_cached": len(_memory_cache.get("companies", {})),  # type: ignore[arg-type]
+        "companies_cached": companies,
         "last_update": _last_update,
         "cache_age_hours": (
             (time.time() - _last_update) / 3600 if _last_update else None
@@ -716,9 +1114,11 @@ def get_cache_info_impl() -> Dict[str, Any]:
         "data_file_exists": True,  # Will be checked in utils
         **db_stats,
         "memory_cache_structure": {
-            "companies": len(_memory_cache.get("companies", {})),  # type: ignore[arg-type]
-            "tickers_indexed": len(_memory_cache.get("by_ticker", {})),  # type: ignore[arg-type]
-            "ciks_indexed": len(_memory_cache.get("by_cik", {})),  # type: ignore[arg-type]
-            "names_indexed": len(_memory_cache.get("by_name", {})),  # type: ignore[arg-type]
+            "companies": companies,
+            "tickers_indexed": len(cache["by_ticker"]),
+            "ciks_indexed": len(cache["by_cik"]),
+            "names_indexed": len(cache["by_name"]),
         },
+        "lookup_caches": {"name": _name_cache.stats()},
+        "search_scans": dict(_scan_counts),
     }
@@ -5,7 +5,8 @@ This module contains all TypedDict definitions and type aliases used throughout
 the package for better type safety and code organization.
 """
 
-from typing import Dict, List, TypedDict
+from array import array
+from typing import Dict, List, Optional, TypedDict
 from typing_extensions import NotRequired
 
 
@@ -26,12 +27,32 @@ class SECCompanyInfo(TypedDict):
 
 
 class CacheStructure(TypedDict):
-    """Type definition for the memory cache structure."""
+    """Type definition for the memory cache structure.
+
+    Company rows are stored as parallel columns; row ids index into each
+    column and are what the by_* indexes point to. tickers_blob and names_blob
+    join tickers and names_lower with NUL separators for buffer-wide substring
+    search, with tickers_starts and names_starts holding each row's offset
+    into them. names_sorted lists the distinct lowercased names in sorted
+    order for prefix search. rows holds the shared CompanyData dict for each
+    row, built on first access. by_word maps each word of the lowercased
+    names to the rows containing it.
+    """
 
-    companies: Dict[str, CompanyData]
-    by_ticker: Dict[str, str]
-    by_cik: Dict[int, List[str]]
-    by_name: Dict[str, List[str]]
+    ciks: "array[int]"
+    tickers: List[str]
+    tickers_blob: str
+    tickers_starts: "array[int]"
+    names: List[str]
+    names_lower: List[str]
+    names_blob: str
+    names_starts: "array[int]"
+    names_sorted: List[str]
+    rows: List[Optional[CompanyData]]
+    by_ticker: Dict[str, int]
+    by_cik: Dict[int, List[int]]
+    by_name: Dict[str, List[int]]
+    by_word: Dict[str, List[int]]
 
 
 class SingleLookupResponse(TypedDict):
@@ -4,12 +4,19 @@ from .utils import (
     ensure_cache_dir,
     download_sec_data,
     is_cache_expired,
+    check_cache_fresh,
     load_from_cache,
+    save_packed,
+    load_packed,
+    save_packed_to_cache,
+    load_packed_from_cache,
     normalize_cik,
+    normalize_ciks,
     clear_cache_files,
     SEC_DATA_URL,
     CACHE_DIR,
     DATA_FILE,
+    PACKED_FILE,
     CACHE_EXPIRY_HOURS,
 )
 
@@ -17,11 +24,18 @@ __all__ = [
     "ensure_cache_dir",
     "download_sec_data",
     "is_cache_expired",
+    "check_cache_fresh",
     "load_from_cache",
+    "save_packed",
+    "load_packed",
+    "save_packed_to_cache",
+    "load_packed_from_cache",
     "normalize_cik",
+    "normalize_ciks",
     "clear_cache_files",
     "SEC_DATA_URL",
     "CACHE_DIR",
     "DATA_FILE",
+    "PACKED_FILE",
     "CACHE_EXPIRY_HOURS",
 ]
@@ -5,12 +5,24 @@ This module contains utility functions for data fetching, cache management,
 and common operations used across the sec-company-lookup package.
 """
 
+import gzip
 import json
+import mmap
+import os
 import requests
+import struct
+import sys
+import threading
 import time
 import logging
+from array import array
 from pathlib import Path
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, Iterable, List, Sequence, Tuple, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -18,8 +30,71 @@ logger = logging.getLogger(__name__)
 # Constants
 SEC_DATA_URL = "https://www.sec.gov/files/company_tickers.json"
 CACHE_DIR = Path.home() / ".sec_company_lookup"
-DATA_FILE = CACHE_DIR / "company_data.json"
+DATA_FILE = CACHE_DIR / "company_data.json.gz"
+PACKED_FILE = CACHE_DIR / "company_data.bin"
 CACHE_EXPIRY_HOURS = 24  # Refresh data every 24 hours
+SEC_MAX_REQUESTS_PER_SECOND = 10  # SEC fair access policy limit
+_DOWNLOAD_CHUNK_BYTES = 64 * 1024
+# The JSON cache is gzipped at the fastest level: it still shrinks several-fold,
+# so cold reloads read far fewer bytes, while compressing costs little
+_DATA_FILE_COMPRESSLEVEL = 1
+
+# Packed column file layout (little-endian):
+#   magic | n (uint32) | ciks (int64 x n)
+#   | tickers length (uint32) | NUL-joined UTF-8 tickers
+#   | names length (uint32) | NUL-joined UTF-8 names
+PACKED_MAGIC = b"SECPACK1"
+_COUNT = struct.Struct("<I")
+
+PackedColumns = Tuple["array[int]", List[str], List[str]]
+
+
+class _RateLimiter:
+    """Thread-safe token bucket limiting how often requests may be issued."""
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self._tokens = rate
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request token is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens < 1:
+                time.sleep((1 - self._tokens) / self.rate)
+                self._last = time.monotonic()
+                self._tokens = 0
+            else:
+                self._tokens -= 1
+
+
+_rate_limiter = _RateLimiter(SEC_MAX_REQUESTS_PER_SECOND)
+_session: Optional[requests.Session] = None
+
+
+def _json_loads(raw: Union[bytes, bytearray, str]) -> Any:
+    """Parse JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _get_session() -> requests.Session:
+    """Get the shared HTTP session, reusing its connection pool across requests."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    return _session
+
+
+def _read_data_file() -> Any:
+    """Read and parse the gzipped JSON cache file."""
+    with gzip.open(DATA_FILE, "rb") as f:
+        return _json_loads(f.read())
 
 
 def ensure_cache_dir() -> None:
@@ -43,19 +118,52 @@ def download_sec_data() -> Dict[str, Any]:
         "User-Agent": user_agent,
         "Accept": "application/json",
         "Accept-Encoding": "gzip, deflate",
-        "Connection": "close",
         "Host": "www.sec.gov",
     }
 
     try:
-        response = requests.get(SEC_DATA_URL, headers=headers, timeout=30)
-        response.raise_for_status()
-        data = response.json()  # type: ignore[no-any-return]
+        _rate_limiter.acquire()
+        response = _get_session().get(
+            SEC_DATA_URL, headers=headers, timeout=30, stream=True
+        )
+        try:
+            response.raise_for_status()
 
-        # Save raw data to file
-        ensure_cache_dir()
-        with open(DATA_FILE, "w") as f:
-            json.dump(data, f)
+            # Write the raw body to disk as it arrives (no need to re-serialize),
+            # gzipping it on the way. It goes to a temporary file that only
+            # replaces the cache once the whole body has arrived and parsed, so
+            # a dropped connection or a bad payload never clobbers a good cache.
+            ensure_cache_dir()
+            tmp_path = DATA_FILE.with_suffix(DATA_FILE.suffix + ".tmp")
+            # Chunks are appended to one growing buffer rather than collected
+            # and joined, so the body is never held in memory twice
+            body = bytearray()
+            try:
+                with gzip.open(
+                    tmp_path, "wb", compresslevel=_DATA_FILE_COMPRESSLEVEL
+                ) as f:
+                    for chunk in response.iter_content(
+                        chunk_size=_DOWNLOAD_CHUNK_BYTES
+                    ):
+                        f.write(chunk)
+                        body += chunk
+                try:
+                    data = _json_loads(body)
+                except ValueError as e:
+                    # A non-JSON body (e.g. an HTML maintenance page) is a bad
+                    # response, not a configuration error
+                    raise requests.RequestException(
+                        f"SEC response is not valid JSON: {e}"
+                    ) from e
+            except BaseException:
+                try:
+                    tmp_path.unlink()
+                except FileNotFoundError:
+                    pass
+                raise
+            tmp_path.replace(DATA_FILE)
+        finally:
+            response.close()
 
         logger.info(f"Downloaded data for {len(data)} companies")
         return data  # type: ignore[no-any-return]
@@ -65,8 +173,7 @@ def download_sec_data() -> Dict[str, Any]:
         # Try to load from cache if available
         if DATA_FILE.exists():
             logger.info("Loading from cached file...")
-            with open(DATA_FILE, "r") as f:
-                return json.load(f)  # type: ignore[no-any-return]
+            return _read_data_file()  # type: ignore[no-any-return]
         raise
 
 
@@ -79,6 +186,24 @@ def is_cache_expired(last_update: Optional[float]) -> bool:
     return age_hours > CACHE_EXPIRY_HOURS
 
 
+def check_cache_fresh(path: Path) -> Tuple[bool, float]:
+    """
+    Check whether a cache file exists and has not expired, with a single stat.
+
+    Args:
+        path: Cache file to check
+
+    Returns:
+        Tuple of (is_fresh, modification_time), with a time of 0 if the file
+        is missing
+    """
+    try:
+        last_update = path.stat().st_mtime
+    except OSError:
+        return False, 0
+    return not is_cache_expired(last_update), last_update
+
+
 def load_from_cache() -> Tuple[Optional[Dict[str, Any]], float]:
     """
     Load data from cache if available and not expired.
@@ -86,23 +211,133 @@ def load_from_cache() -> Tuple[Optional[Dict[str, Any]], float]:
     Returns:
         Tuple of (data, last_update_timestamp) or (None, 0) if no valid cache
     """
-    # Try to load from file cache first (faster than DB)
-    if DATA_FILE.exists():
+    # Expiry is decided from the file's mtime before any of it is read
+    is_fresh, last_update = check_cache_fresh(DATA_FILE)
+    if is_fresh:
         try:
-            # Check file modification time for expiry
-            file_age_hours = (time.time() - DATA_FILE.stat().st_mtime) / 3600
-            if file_age_hours <= CACHE_EXPIRY_HOURS:
-                with open(DATA_FILE, "r") as f:
-                    data = json.load(f)  # type: ignore[no-any-return]
-                last_update = DATA_FILE.stat().st_mtime
-                logger.info("Loaded data from file cache")
-                return data, last_update
-        except (json.JSONDecodeError, IOError, OSError) as e:
+            data = _read_data_file()
+            logger.info("Loaded data from file cache")
+            return data, last_update
+        # A truncated gzip stream raises EOFError; a corrupt one, OSError
+        except (json.JSONDecodeError, EOFError, OSError) as e:
             logger.warning(f"Failed to load from cache file: {e}")
 
     return None, 0
 
 
+def save_packed(
+    path: Path, ciks: Sequence[int], tickers: Sequence[str], names: Sequence[str]
+) -> None:
+    """
+    Write the company columns to a packed binary file.
+
+    Args:
+        path: Destination file
+        ciks: CIK column
+        tickers: Ticker column (same length as ciks)
+        names: Company name column (same length as ciks)
+    """
+    cik_array = array("q", ciks)
+    if sys.byteorder != "little":
+        cik_array.byteswap()
+    ticker_bytes = "\0".join(tickers).encode("utf-8")
+    name_bytes = "\0".join(names).encode("utf-8")
+
+    # Write to a temporary file and rename so readers never see a partial file
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(PACKED_MAGIC)
+        f.write(_COUNT.pack(len(cik_array)))
+        f.write(cik_array.tobytes())
+        f.write(_COUNT.pack(len(ticker_bytes)))
+        f.write(ticker_bytes)
+        f.write(_COUNT.pack(len(name_bytes)))
+        f.write(name_bytes)
+    tmp_path.replace(path)
+
+
+def load_packed(path: Path) -> Optional[PackedColumns]:
+    """
+    Read company columns from a packed binary file via mmap.
+
+    Args:
+        path: File written by save_packed
+
+    Returns:
+        Tuple of (ciks, tickers, names), or None if the file is not a valid packed file
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        offset = len(PACKED_MAGIC)
+        if mm[:offset] != PACKED_MAGIC:
+            return None
+
+        (n,) = _COUNT.unpack_from(mm, offset)
+        offset += _COUNT.size
+        ciks = array("q")
+        ciks.frombytes(mm[offset : offset + 8 * n])
+        if sys.byteorder != "little":
+            ciks.byteswap()
+        offset += 8 * n
+
+        columns: List[List[str]] = []
+        for _ in range(2):
+            (length,) = _COUNT.unpack_from(mm, offset)
+            offset += _COUNT.size
+            text = mm[offset : offset + length].decode("utf-8")
+            offset += length
+            columns.append(text.split("\0") if n else [])
+
+    tickers, names = columns
+    if len(tickers) != n or len(names) != n:
+        return None
+    return ciks, tickers, names
+
+
+def load_packed_from_cache() -> Tuple[Optional[PackedColumns], float]:
+    """
+    Load the packed column cache if available and not expired.
+
+    Returns:
+        Tuple of (columns, last_update_timestamp) or (None, 0) if no valid cache
+    """
+    is_fresh, last_update = check_cache_fresh(PACKED_FILE)
+    if is_fresh:
+        try:
+            columns = load_packed(PACKED_FILE)
+            if columns is not None:
+                logger.info("Loaded data from packed cache")
+                return columns, last_update
+        except (struct.error, UnicodeDecodeError, ValueError, OSError) as e:
+            logger.warning(f"Failed to load from packed cache file: {e}")
+
+    return None, 0
+
+
+def save_packed_to_cache(
+    ciks: Sequence[int],
+    tickers: Sequence[str],
+    names: Sequence[str],
+    last_update: Optional[float] = None,
+) -> None:
+    """
+    Write the packed column cache, logging rather than raising on failure.
+
+    Args:
+        ciks: CIK column
+        tickers: Ticker column (same length as ciks)
+        names: Company name column (same length as ciks)
+        last_update: When the data was downloaded; stamped on the file so its
+            age (read from the mtime) is not reset by the conversion
+    """
+    try:
+        ensure_cache_dir()
+        save_packed(PACKED_FILE, ciks, tickers, names)
+        if last_update:
+            os.utime(PACKED_FILE, (last_update, last_update))
+    except OSError as e:
+        logger.warning(f"Failed to write packed cache file: {e}")
+
+
 def normalize_cik(cik_raw: Any) -> Optional[int]:
     """
     Normalize CIK to integer format.
@@ -116,18 +351,60 @@ def normalize_cik(cik_raw: Any) -> Optional[int]:
     if isinstance(cik_raw, int):
         return cik_raw
     elif isinstance(cik_raw, str):
-        cik = cik_raw.lstrip("0")
-        return int(cik) if cik.isdigit() else None
+        # int() drops leading zeros itself; isdigit() only keeps out signs,
+        # whitespace and underscores, which int() would otherwise accept
+        if not cik_raw.isdigit():
+            return None
+        try:
+            cik = int(cik_raw)
+        except ValueError:  # non-decimal digits such as superscripts
+            return None
+        # All-zero strings are not valid CIKs
+        return cik or None
     else:
         return None
 
 
+def normalize_ciks(ciks: Iterable[Any]) -> List[Optional[int]]:
+    """
+    Normalize several CIKs to integer format in one call.
+
+    Args:
+        ciks: CIK values (strings or ints)
+
+    Returns:
+        List of normalized CIKs in input order, with None for invalid values
+    """
+    return list(map(normalize_cik, ciks))
+
+
 def clear_cache_files() -> None:
     """Remove cache files from disk."""
-    from ..db.db import DB_PATH
+    from ..db.db import DB_PATH, close_db_connections
+
+    # Pooled connections would otherwise keep using the deleted database
+    close_db_connections()
 
     if DATA_FILE.exists():
         DATA_FILE.unlink()
+    # Download interrupted before it could replace the cache
+    try:
+        DATA_FILE.with_suffix(DATA_FILE.suffix + ".tmp").unlink()
+    except FileNotFoundError:
+        pass
+    # Uncompressed JSON cache written by earlier versions
+    legacy_data_file = DATA_FILE.with_suffix("")
+    if legacy_data_file.exists():
+        legacy_data_file.unlink()
+    if PACKED_FILE.exists():
+        PACKED_FILE.unlink()
+    # Journal side files go before the database itself: a leftover WAL next
+    # to a freshly created database could otherwise be replayed into it
+    for suffix in ("-wal", "-shm", "-journal"):
+        try:
+            DB_PATH.with_name(DB_PATH.name + suffix).unlink()
+        except FileNotFoundError:
+            pass
     if DB_PATH.exists():
         DB_PATH.unlink()
 
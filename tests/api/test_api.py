@@ -0,0 +1,229 @@
+"""
+Tests for the sec_company_lookup public API layer.
+"""
+
+# pyright: reportPrivateUsage=false, reportUnknownParameterType=false
+# pyright: reportUnknownArgumentType=false, reportUnknownMemberType=false
+# pyright: reportMissingParameterType=false
+
+import pytest
+from unittest.mock import patch
+
+# Configure email for tests
+from sec_company_lookup.config import set_user_email
+
+set_user_email("test@example.com")
+
+import sec_company_lookup.sec_company_lookup as sec_module
+import sec_company_lookup.api.api as api_module
+from sec_company_lookup.sec_company_lookup import clear_cache_impl
+from sec_company_lookup.db.db import load_data_to_db
+from sec_company_lookup.api.api import (
+    get_company,
+    get_companies,
+    get_cache_info,
+    clear_cache,
+    _classify,
+)
+
+from ..test_data import SAMPLE_SEC_DATA
+
+
+class TestSmartLookup:
+    """Test get_company identifier classification and dispatch."""
+
+    def setup_method(self):
+        """Set up test data for each test."""
+        clear_cache_impl()
+        sec_module._load_data_to_memory(SAMPLE_SEC_DATA)
+
+    def teardown_method(self):
+        """Clean up after each test."""
+        clear_cache_impl()
+
+    def test_classify(self):
+        """Test identifier classification rules."""
+        assert _classify("320193") == ("cik", "320193")
+        assert _classify(" 0000320193\n") == ("cik", "0000320193")
+        assert _classify("AAPL") == ("ticker", "AAPL")
+        assert _classify(" aapl ") == ("ticker", "aapl")
+        assert _classify("AAPL-WT") == ("name", "AAPL-WT")
+        assert _classify("Apple Inc.") == ("name", "Apple Inc.")
+        assert _classify("  Apple\nInc.  ") == ("name", "Apple\nInc.")
+        assert _classify("123 456") == ("name", "123 456")
+        assert _classify("") is None
+        assert _classify(" \t ") is None
+
+    @patch("sec_company_lookup.api.api.get_company_by_name_single")
+    @patch("sec_company_lookup.api.api.find_company_by_ticker")
+    def test_get_company_cik_skips_other_lookups(self, mock_tickers, mock_names):
+        """Test digit strings only perform a CIK lookup."""
+        results = get_company("320193")
+
+        assert len(results) == 2
+        mock_tickers.assert_not_called()
+        mock_names.assert_not_called()
+
+    @patch("sec_company_lookup.api.api.find_company_by_ticker")
+    def test_get_company_unknown_cik_leaves_lookup_caches_alone(self, mock_tickers):
+        """Test digit-string misses neither probe tickers nor fill the name cache."""
+        before = sec_module._name_cache.stats()
+
+        assert get_company(" 9999999 ") == []
+        assert get_company("0") == []
+
+        mock_tickers.assert_not_called()
+        assert sec_module._name_cache.stats() == before
+
+    @patch("sec_company_lookup.api.api.find_company_by_ticker")
+    def test_get_company_name_skips_ticker_lookup(self, mock_tickers):
+        """Test multi-word names go straight to the name lookup."""
+        results = get_company("Microsoft Corporation")
+
+        assert results[0]["ticker"] == "MSFT"
+        mock_tickers.assert_not_called()
+
+    def test_get_company_ticker(self):
+        """Test ticker-shaped input resolves by ticker."""
+        assert get_company("msft")[0]["ticker"] == "MSFT"
+        assert get_company("AAPL-WT")[0]["ticker"] == "AAPL-WT"
+
+    def test_get_company_dispatches_subclasses_to_base_type(self):
+        """Test int and str subclasses resolve like their base types."""
+
+        class Cik(int):
+            pass
+
+        class Ticker(str):
+            pass
+
+        assert get_company(Cik(789019))[0]["ticker"] == "MSFT"
+        assert get_company(Ticker(" msft "))[0]["ticker"] == "MSFT"
+        assert get_company(789019.0) == []
+        assert get_company(None) == []
+
+
+class TestSmartBatchLookup:
+    """Test get_companies smart batch lookup."""
+
+    def setup_method(self):
+        """Set up test data for each test."""
+        clear_cache_impl()
+        sec_module._load_data_to_memory(SAMPLE_SEC_DATA)
+
+    def teardown_method(self):
+        """Clean up after each test."""
+        clear_cache_impl()
+
+    @patch("sec_company_lookup.sec_company_lookup.get_companies_by_company_names_db")
+    def test_get_companies_mixed_identifiers(self, mock_names):
+        """Test that each identifier type is resolved from the memory cache."""
+        results = get_companies(["AAPL", 789019, "Alphabet Inc.", None])
+
+        assert list(results) == ["AAPL", 789019, "Alphabet Inc.", None]
+        assert results["AAPL"][0]["ticker"] == "AAPL"
+        assert results[789019][0]["ticker"] == "MSFT"
+        assert results["Alphabet Inc."][0]["ticker"] == "GOOGL"
+        assert results[None] == []
+        mock_names.assert_not_called()
+
+    @patch("sec_company_lookup.sec_company_lookup.get_companies_by_company_names_db")
+    def test_get_companies_fills_every_spelling(self, mock_names):
+        """Test identifiers that strip to the same query all get the result."""
+        identifiers = [
+            "AAPL",
+            " AAPL",
+            "AAPL\t",
+            320193,
+            "320193",
+            " 320193 ",
+            "Alphabet Inc.",
+            "  Alphabet Inc. ",
+        ]
+
+        results = get_companies(identifiers)
+
+        assert list(results) == identifiers
+        for identifier in identifiers[:3]:
+            assert [r["ticker"] for r in results[identifier]] == ["AAPL"]
+        for identifier in identifiers[3:6]:
+            tickers = sorted(r["ticker"] for r in results[identifier])
+            assert tickers == ["AAPL", "AAPL-WT"]
+        for identifier in identifiers[6:]:
+            assert results[identifier][0]["ticker"] == "GOOGL"
+        mock_names.assert_not_called()
+
+    def test_get_companies_not_found(self):
+        """Test that unresolved identifiers map to empty lists."""
+        results = get_companies(["INVALID", "", "   "])
+
+        assert results == {"INVALID": [], "": [], "   ": []}
+
+    def test_get_companies_matches_get_company(self, tmp_path):
+        """Test every identifier resolves exactly as get_company() would."""
+        identifiers = [
+            "AAPL",
+            " msft ",
+            "AAPL-WT",
+            320193,
+            "1652044",
+            "alphabet",
+            "Alphabet Inc.",
+            "inc",
+            "apple",
+            "Microsoft",
+            "amazon.com",
+            "XYZ",
+            "No Such Company",
+            "",
+        ]
+
+        with patch("sec_company_lookup.db.db.DB_PATH", tmp_path / "test.db"):
+            load_data_to_db(SAMPLE_SEC_DATA)
+            results = get_companies(identifiers)
+
+            for identifier in identifiers:
+                assert results[identifier] == get_company(identifier), identifier
+
+    def test_get_companies_empty_input(self):
+        """Test empty input returns empty dict."""
+        assert get_companies([]) == {}
+
+
+class TestCacheInfo:
+    """Test get_cache_info memoization."""
+
+    def setup_method(self):
+        """Reset the cache info memo before each test."""
+        api_module._cache_info_cache["v"] = None
+
+    def teardown_method(self):
+        """Clean up after each test."""
+        api_module._cache_info_cache["v"] = None
+
+    @patch("sec_company_lookup.api.api.get_cache_info_impl")
+    def test_get_cache_info_memoized(self, mock_impl):
+        """Test repeated calls within the TTL reuse the previous result."""
+        mock_impl.return_value = {"companies_cached": 6}
+
+        first = get_cache_info()
+        second = get_cache_info()
+
+        assert first == second == {"companies_cached": 6}
+        mock_impl.assert_called_once()
+
+    @patch("sec_company_lookup.api.api.clear_cache_impl")
+    @patch("sec_company_lookup.api.api.get_cache_info_impl")
+    def test_get_cache_info_invalidated_by_clear_cache(self, mock_impl, _mock_clear):
+        """Test clear_cache invalidates the memoized result."""
+        mock_impl.return_value = {"companies_cached": 6}
+
+        get_cache_info()
+        clear_cache()
+        get_cache_info()
+
+        assert mock_impl.call_count == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,149 @@
+"""
+Tests for the sec_company_lookup lookup cache.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from sec_company_lookup.cache.cache import LRUKCache, TTLCache, estimate_size
+
+
+class TestLRUKCache:
+    """Test LRU-k cache behavior."""
+
+    def test_get_put(self):
+        """Test basic insert and lookup with hit/miss counters."""
+        cache = LRUKCache(max_bytes=1024 * 1024)
+        cache.put("AAPL", {"cik": 320193})
+
+        assert cache.get("AAPL") == {"cik": 320193}
+        assert cache.get("MSFT") is None
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["entries"] == 1
+        assert stats["protected_entries"] == 1  # put + get promotes the entry
+        assert stats["bytes"] == estimate_size({"cik": 320193})
+        assert stats["max_bytes"] == 1024 * 1024
+        assert "negative" not in stats
+
+    def test_budget_evicts_entries(self):
+        """Test entries are evicted once the memory budget is exceeded."""
+        entry_size = estimate_size("x" * 100)
+        cache = LRUKCache(max_bytes=entry_size * 3)
+
+        for i in range(10):
+            cache.put(i, "x" * 100)
+
+        assert len(cache) == 3
+        assert cache.get(0) is None
+        assert cache.get(9) == "x" * 100
+
+    def test_frequent_entries_survive_scan(self):
+        """Test entries accessed twice are not evicted by one-off entries."""
+        entry_size = estimate_size("x" * 100)
+        cache = LRUKCache(max_bytes=entry_size * 3)
+        cache.put("hot", "x" * 100)
+        cache.get("hot")  # Second access promotes the entry
+
+        for i in range(10):
+            cache.put(i, "x" * 100)
+
+        assert cache.get("hot") == "x" * 100
+
+    def test_new_entries_admitted_when_protected_is_full(self):
+        """Test promotions past the protected cap demote instead of blocking."""
+        entry_size = estimate_size("x" * 100)
+        cache = LRUKCache(max_bytes=entry_size * 4, protected_ratio=0.5)
+
+        for i in range(4):
+            cache.put(i, "x" * 100)
+            cache.get(i)  # Promote every entry
+
+        # A new key can still be cached and promoted
+        cache.put("new", "x" * 100)
+        assert cache.get("new") == "x" * 100
+        assert cache.get("new") == "x" * 100
+        assert len(cache) <= 4
+
+    def test_oversized_value_not_cached(self):
+        """Test values larger than the whole budget are skipped."""
+        cache = LRUKCache(max_bytes=10)
+        cache.put("big", "x" * 100)
+
+        assert len(cache) == 0
+
+    def test_memoize(self):
+        """Test memoize decorator caches by positional arguments."""
+        cache = LRUKCache(max_bytes=1024 * 1024)
+        calls = []
+
+        @cache.memoize
+        def lookup(ticker: str) -> str:
+            calls.append(ticker)
+            return ticker.upper()
+
+        assert lookup("aapl") == "AAPL"
+        assert lookup("aapl") == "AAPL"
+        assert calls == ["aapl"]
+
+        cache.clear()
+        lookup("aapl")
+        assert calls == ["aapl", "aapl"]
+
+    def test_memoize_negative_results(self):
+        """Test negative results bypass the main cache and expire."""
+        cache = LRUKCache(
+            max_bytes=1024 * 1024, is_negative=lambda r: r is None, negative_ttl=60
+        )
+        calls = []
+
+        @cache.memoize
+        def lookup(ticker: str):
+            calls.append(ticker)
+            return "AAPL" if ticker == "aapl" else None
+
+        assert lookup("invalid") is None
+        assert lookup("invalid") is None
+        assert calls == ["invalid"]
+        assert len(cache) == 0
+        assert cache.negative is not None and len(cache.negative) == 1
+
+        assert lookup("aapl") == "AAPL"
+        assert len(cache) == 1
+
+        # Expired negative results are recomputed
+        with patch("sec_company_lookup.cache.cache.time.monotonic") as mock_time:
+            mock_time.return_value = 10**9
+            lookup("invalid")
+        assert calls == ["invalid", "aapl", "invalid"]
+        assert cache.stats()["negative"]["hits"] == 1
+
+
+class TestTTLCache:
+    """Test TTL cache behavior."""
+
+    def test_expiry_and_limit(self):
+        """Test entries expire after the TTL and the oldest are dropped first."""
+        cache = TTLCache(ttl=60, max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.put("c", 3)
+
+        assert cache.get("a") is None
+        assert cache.get("c") == 3
+
+        with patch("sec_company_lookup.cache.cache.time.monotonic") as mock_time:
+            mock_time.return_value = 10**9
+            assert cache.get("b") is None
+        assert cache.stats() == {
+            "hits": 1,
+            "misses": 2,
+            "hit_rate": 1 / 3,
+            "entries": 1,
+        }
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -4,6 +4,9 @@ Tests for the sec_company_lookup database functionality.
 
 import pytest
 import sqlite3
+import threading
+from typing import List
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, MagicMock
 
 # Configure email for tests
@@ -12,11 +15,23 @@ from sec_company_lookup.config import set_user_email
 set_user_email("test@example.com")
 
 from sec_company_lookup.db.db import (
+    MAX_SQL_VARIABLES,
+    _in_list,
+    close_db_connections,
+    get_db_connection,
     init_database,
+    load_data_to_db,
+    load_columns_to_db,
     get_db_stats,
     search_companies_db,
+    get_companies_by_ciks_db,
+    get_companies_by_tickers_db,
+    get_companies_by_company_names_db,
+    search_companies_by_company_name_db,
 )
 
+from ..test_data import SAMPLE_SEC_DATA
+
 
 class TestDatabaseFunctions:
     """Test database functionality."""
@@ -58,6 +73,501 @@ class TestDatabaseFunctions:
         assert stats["db_fts_enabled"] is False
         assert "cache_dir" in stats
 
+    def test_batch_lookups(self, tmp_path):
+        """Test batch lookups against a populated database."""
+        with patch("sec_company_lookup.db.db.DB_PATH", tmp_path / "test.db"):
+            load_data_to_db(SAMPLE_SEC_DATA)
+
+            tickers = get_companies_by_tickers_db(["AAPL", "INVALID"])
+            assert [c["cik"] for c in tickers["AAPL"]] == [320193]
+            assert tickers["INVALID"] == []
+
+            ciks = get_companies_by_ciks_db([320193, 999999])
+            assert [c["ticker"] for c in ciks[320193]] == ["AAPL", "AAPL-WT"]
+            assert ciks[999999] == []
+
+            names = get_companies_by_company_names_db(
+                ["APPLE INC.", "Microsoft", "Nonexistent", ""], fuzzy=False
+            )
+            assert [c["ticker"] for c in names["APPLE INC."]] == ["AAPL", "AAPL-WT"]
+            assert names["Microsoft"] == []
+            assert names["Nonexistent"] == []
+            assert names[""] == []
+
+            fuzzy_names = get_companies_by_company_names_db(
+                ["Apple Inc.", "Microsoft", "inc", "zzz"], fuzzy=True
+            )
+            assert [c["ticker"] for c in fuzzy_names["Apple Inc."]] == [
+                "AAPL",
+                "AAPL-WT",
+            ]
+            assert fuzzy_names["Microsoft"][0]["ticker"] == "MSFT"
+            # "Inc" prefix matches would rank first; every "inc" title matches
+            assert [c["ticker"] for c in fuzzy_names["inc"]] == [
+                "AAPL",
+                "AAPL-WT",
+                "AMZN",
+                "GOOG",
+                "GOOGL",
+            ]
+            assert fuzzy_names["zzz"] == []
+
+    def test_batch_name_lookup_shares_normalized_keys(self, tmp_path):
+        """Test names differing in case or whitespace are matched once."""
+        with patch("sec_company_lookup.db.db.DB_PATH", tmp_path / "test.db"):
+            load_data_to_db(SAMPLE_SEC_DATA)
+            statements: List[str] = []
+
+            with get_db_connection(row_factory=False, read_only=True) as conn:
+                conn.set_trace_callback(statements.append)
+                try:
+                    names = get_companies_by_company_names_db(
+                        ["micro", " MICRO ", "Micro"], fuzzy=True
+                    )
+                finally:
+                    conn.set_trace_callback(None)
+
+            assert names["micro"] == names[" MICRO "] == names["Micro"]
+            assert names["micro"][0]["ticker"] == "MSFT"
+            fuzzy_sql = [sql for sql in statements if "VALUES" in sql]
+            assert len(fuzzy_sql) == 1
+            # Traced SQL has its parameters expanded on newer SQLite versions
+            sql = fuzzy_sql[0]
+            assert sql.count("(?, ?, ?)") + sql.count("'%micro%'") == 1
+
+    def test_connection_pragmas(self, tmp_path):
+        """Test writable connections use WAL and read-only ones cannot write."""
+        with patch("sec_company_lookup.db.db.DB_PATH", tmp_path / "test.db"):
+            init_database()
+
+            with get_db_connection(row_factory=False) as conn:
+                assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+                assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+                assert conn.execute("PRAGMA page_size").fetchone()[0] == 8192
+
+            # The bulk load runs with synchronous=OFF and restores it after
+            load_data_to_db(SAMPLE_SEC_DATA)
+            with get_db_connection(row_factory=False) as conn:
+                assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+            with get_db_connection(read_only=True) as conn:
+                with pytest.raises(sqlite3.OperationalError):
+                    conn.execute("DELETE FROM companies")
+
+    def test_connections_are_pooled(self, tmp_path):
+        """Test connections are reused until close_db_connections is called."""
+        with patch("sec_company_lookup.db.db.DB_PATH", tmp_path / "test.db"):
+            with get_db_connection() as first:
+                pass
+            with get_db_connection(row_factory=False) as second:
+                assert second is first
+                assert second.row_factory is None
+
+            close_db_connections()
+
+            with pytest.raises(sqlite3.ProgrammingError):
+                first.execute("SELECT 1")
+            with get_db_connection() as third:
+                assert third is not first
+
+    def test_read_functions_reuse_pooled_connection(self, tmp_path):
+        """Test repeated reads never open another connection."""
+        from sec_company_lookup.db import db as db_module
+
+        with patch("sec_company_lookup.db.db.DB_PATH", tmp_path / "test.db"):
+            load_data_to_db(SAMPLE_SEC_DATA)
+            search_companies_db("apple")
+
+            with patch.object(
+                db_module, "_connect", wraps=db_module._connect
+            ) as mock_connect:
+                for _ in range(3):
+                    get_db_stats()
+                    search_companies_db("apple")
+                    get_companies_by_ciks_db([320193])
+                    get_companies_by_company_names_db(["Apple Inc."])
+                    search_companies_by_company_name_db("apple")
+                mock_connect.assert_not_called()
+
+    def test_read_only_connection_missing_db(self, tmp_path):
+        """Test read-only connections do not create a missing database."""
+        db_path = tmp_path / "missing.db"
+        with patch("sec_company_lookup.db.db.DB_PATH", db_path):
+            with pytest.raises(sqlite3.Error):
+                with get_db_connection(read_only=True):
+                    pass
+
+        assert not db_path.exists()
+
+    def test_load_data_to_db_reload(self, tmp_path):
+        """Test reloading replaces rows and keeps the FTS index in sync."""
+        with patch("sec_company_lookup.db.db.DB_PATH", tmp_path / "test.db"):
+            load_data_to_db(SAMPLE_SEC_DATA)
+            load_data_to_db(
+                {
+                    "0": {
+                        "cik_str": "0000320193",
+                        "ticker": "aapl",
+                        "title": "Apple Inc.",
+                    }
+                }
+            )
+
+            with get_db_connection(row_factory=False) as conn:
+                assert conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0] == 1
+                fts_hits = conn.execute(
+                    "SELECT ticker FROM companies_fts WHERE companies_fts MATCH 'apple'"
+                ).fetchall()
+                assert fts_hits == [("AAPL",)]
+                stale = conn.execute(
+                    "SELECT COUNT(*) FROM companies_fts "
+                    "WHERE companies_fts MATCH 'microsoft'"
+                ).fetchone()[0]
+                assert stale == 0
+                # The recreated FTS table keeps the custom rank function
+                rank = conn.execute(
+                    "SELECT v FROM companies_fts_config WHERE k = 'rank'"
+                ).fetchone()
+                assert rank == ("bm25(0.0, 10.0, 1.0)",)
+                indexes = {
+                    row[0]
+                    for row in conn.execute(
+                        "SELECT name FROM sqlite_master "
+                        "WHERE type='index' AND tbl_name='companies'"
+                    )
+                }
+                # Only droppable indexes, so bulk loads never update one per row
+                assert indexes == {"idx_ticker", "idx_title_lc", "idx_cik"}
+
+    def test_load_columns_to_db(self, tmp_path):
+        """Test loading parsed columns matches loading the raw SEC data."""
+        select = "SELECT cik, ticker, title, title_lc FROM companies ORDER BY id"
+        with patch("sec_company_lookup.db.db.DB_PATH", tmp_path / "test.db"):
+            load_data_to_db(SAMPLE_SEC_DATA)
+            with get_db_connection(row_factory=False) as conn:
+                expected = conn.execute(select).fetchall()
+
+            ciks, tickers, names, names_lower = zip(*expected)
+            load_columns_to_db(ciks, tickers, names, names_lower)
+
+            with get_db_connection(row_factory=False) as conn:
+                assert conn.execute(select).fetchall() == expected
+            assert get_companies_by_ciks_db([320193])[320193][0]["ticker"] == "AAPL"
+
+    def test_db_rows_have_company_shape(self, tmp_path):
+        """Test rows from the database paths in use match the CompanyData shape."""
+        with patch("sec_company_lookup.db.db.DB_PATH", tmp_path / "test.db"):
+            load_data_to_db(SAMPLE_SEC_DATA)
+            rows = [
+                *get_companies_by_company_names_db(["Alphabet Inc."])["Alphabet Inc."],
+                *get_companies_by_company_names_db(["micro"], fuzzy=True)["micro"],
+                *search_companies_db("apple", limit=5),
+            ]
+
+        assert rows
+        for row in rows:
+            assert type(row) is dict
+            assert list(row) == ["cik", "ticker", "name"]
+            assert type(row["cik"]) is int
+        assert rows[0] == {"cik": 1652044, "ticker": "GOOG", "name": "Alphabet Inc."}
+
+    def test_get_db_stats_after_load(self, tmp_path):
+        """Test stats report the row count recorded at load time."""
+        with patch("sec_company_lookup.db.db.DB_PATH", tmp_path / "test.db"):
+            load_data_to_db(SAMPLE_SEC_DATA)
+            stats = get_db_stats()
+
+            with get_db_connection(row_factory=False) as conn:
+                conn.execute("DELETE FROM meta")
+                conn.commit()
+            fallback_stats = get_db_stats()
+
+        assert stats["db_companies_count"] == len(SAMPLE_SEC_DATA)
+        assert stats["db_fts_enabled"] is True
+        assert fallback_stats["db_companies_count"] == len(SAMPLE_SEC_DATA)
+
+    def test_outdated_schema_is_rebuilt(self, tmp_path):
+        """Test databases without title_lc are recreated with the current schema."""
+        db_path = tmp_path / "test.db"
+        old = sqlite3.connect(db_path)
+        old.execute("CREATE TABLE companies (id INTEGER PRIMARY KEY, title TEXT)")
+        old.commit()
+        old.close()
+
+        with patch("sec_company_lookup.db.db.DB_PATH", db_path):
+            load_data_to_db(SAMPLE_SEC_DATA)
+
+            results = search_companies_by_company_name_db("APPLE INC.", fuzzy=False)
+            assert [c["ticker"] for c in results] == ["AAPL", "AAPL-WT"]
+
+            with get_db_connection(row_factory=False) as conn:
+                assert conn.execute("PRAGMA user_version").fetchone()[0] >= 1
+                query = "SELECT * FROM companies WHERE title_lc = ?"
+                plan = " ".join(
+                    str(row[-1])
+                    for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", ("x",))
+                )
+                assert "idx_title_lc" in plan
+
+    def test_exact_search_uses_normalized_columns(self, tmp_path):
+        """Test exact search matches stored case-normalized keys via indexes."""
+        data = {
+            "0": {"cik_str": "320193", "ticker": "aapl", "title": "Apple Inc."},
+        }
+
+        with patch("sec_company_lookup.db.db.DB_PATH", tmp_path / "test.db"):
+            load_data_to_db(data)
+
+            # Tickers are stored upper-cased, titles alongside a lower-cased copy
+            for query in ("aApL", "APPLE inc."):
+                results = search_companies_db(query, fuzzy=False)
+                assert [c["ticker"] for c in results] == ["AAPL"]
+
+            with get_db_connection(row_factory=False) as conn:
+                query = "SELECT * FROM companies WHERE ticker = ? OR title_lc = ?"
+                plan = " ".join(
+                    str(row[-1])
+                    for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", ("A", "a"))
+                )
+                assert "idx_ticker" in plan
+                assert "idx_title_lc" in plan
+
+    def test_load_data_to_db_multiple_insert_batches(self, tmp_path):
+        """Test loads larger than one multi-row INSERT keep every row."""
+        data = {
+            str(i): {"cik_str": str(i + 1), "ticker": f"T{i}", "title": f"Company {i}"}
+            for i in range(1000)
+        }
+
+        with patch("sec_company_lookup.db.db.DB_PATH", tmp_path / "test.db"):
+            load_data_to_db(data)
+
+            with get_db_connection(row_factory=False) as conn:
+                rows = conn.execute(
+                    "SELECT cik, ticker, title FROM companies ORDER BY id"
+                ).fetchall()
+
+        assert len(rows) == 1000
+        assert rows[0] == (1, "T0", "Company 0")
+        assert rows[-1] == (1000, "T999", "Company 999")
+
+    def test_reload_applies_only_changed_rows(self, tmp_path):
+        """Test small reloads keep unchanged rows and their FTS entries."""
+        data = {
+            str(i): {"cik_str": str(i + 1), "ticker": f"T{i}", "title": f"Company {i}"}
+            for i in range(20)
+        }
+        select = "SELECT id, cik, ticker, title FROM companies ORDER BY id"
+
+        with patch("sec_company_lookup.db.db.DB_PATH", tmp_path / "test.db"):
+            load_data_to_db(data)
+            with get_db_connection(row_factory=False) as conn:
+                before = conn.execute(select).fetchall()
+
+            # One renamed company, one delisted, one new (3 of 20 rows change)
+            data["0"]["title"] = "Renamed Holdings"
+            del data["1"]
+            data["20"] = {"cik_str": "99", "ticker": "NEW", "title": "Newco"}
+            load_data_to_db(data)
+
+            with get_db_connection(row_factory=False) as conn:
+                after = conn.execute(select).fetchall()
+                fts_rows = conn.execute(
+                    "SELECT rowid, cik, ticker, title FROM companies_fts ORDER BY rowid"
+                ).fetchall()
+
+            assert after[:18] == before[2:]
+            assert {row[1:] for row in after[18:]} == {
+                (1, "T0", "Renamed Holdings"),
+                (99, "NEW", "Newco"),
+            }
+            assert fts_rows == after
+            assert get_db_stats()["db_companies_count"] == 20
+            assert search_companies_db("renamed")[0]["ticker"] == "T0"
+            assert get_companies_by_tickers_db(["T1"])["T1"] == []
+
+            # Replacing most rows rebuilds instead (every id changes)
+            load_data_to_db(SAMPLE_SEC_DATA)
+            with get_db_connection(row_factory=False) as conn:
+                ids = [row[0] for row in conn.execute(select)]
+            assert len(ids) == len(SAMPLE_SEC_DATA)
+            assert min(ids) > max(row[0] for row in after)
+
+    def test_search_after_same_data_reload(self, tmp_path):
+        """Test pooled connections keep searching across an unchanged reload."""
+        with patch("sec_company_lookup.db.db.DB_PATH", tmp_path / "test.db"):
+            load_data_to_db(SAMPLE_SEC_DATA)
+            before = search_companies_db("Apple")
+
+            load_data_to_db(SAMPLE_SEC_DATA)
+            assert search_companies_db("Apple") == before
+
+    def test_in_list_pads_to_shared_sizes(self):
+        """Test IN lists of similar length bind the same statement text."""
+        assert _in_list([5]) == (",".join("?" * 8), [5] * 8)
+        placeholders, params = _in_list([1, 2, 3, 4, 5, 6, 7, 8, 9])
+        assert placeholders.count("?") == 16
+        assert params == [1, 2, 3, 4, 5, 6, 7, 8] + [9] * 8
+        assert _in_list(list(range(12)))[0] == _in_list(list(range(16)))[0]
+
+        # Never more placeholders than SQLite allows
+        placeholders, params = _in_list(list(range(MAX_SQL_VARIABLES)))
+        assert placeholders.count("?") == len(params) == MAX_SQL_VARIABLES
+
+    def test_batch_lookup_beyond_variable_limit(self, tmp_path):
+        """Test batches larger than SQLite's bound parameter limit."""
+        tickers = ["AAPL"] + [f"X{i}" for i in range(2000)]
+
+        with patch("sec_company_lookup.db.db.DB_PATH", tmp_path / "test.db"):
+            load_data_to_db(SAMPLE_SEC_DATA)
+
+            results = get_companies_by_tickers_db(tickers)
+            cik_results = get_companies_by_ciks_db([320193] + list(range(1, 2000)))
+
+            # The temp key table is emptied and no transaction is left open
+            with get_db_connection(row_factory=False, read_only=True) as conn:
+                assert not conn.in_transaction
+                assert conn.execute("SELECT COUNT(*) FROM _batch_cik").fetchone() == (
+                    0,
+                )
+                # Key tables are plain B-trees with no separate autoindex
+                temp_indexes = conn.execute(
+                    "SELECT name FROM sqlite_temp_master WHERE type = 'index'"
+                ).fetchall()
+                assert temp_indexes == []
+
+        assert len(results) == len(tickers)
+        assert results["AAPL"][0]["cik"] == 320193
+        assert len(cik_results) == 2000
+        assert [c["ticker"] for c in cik_results[320193]] == ["AAPL", "AAPL-WT"]
+        assert cik_results[1] == []
+
+    def test_concurrent_batch_lookups(self, tmp_path):
+        """Test batch lookups from several threads each use their own connection."""
+        ciks = [320193, 789019] + list(range(1, 500))
+        # Every worker waits for the others, so all four lookups overlap
+        barrier = threading.Barrier(4)
+
+        def lookup(_):
+            barrier.wait(timeout=10)
+            results = get_companies_by_ciks_db(ciks)
+            with get_db_connection(row_factory=False, read_only=True) as conn:
+                return results, id(conn)
+
+        with patch("sec_company_lookup.db.db.DB_PATH", tmp_path / "test.db"):
+            load_data_to_db(SAMPLE_SEC_DATA)
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                outcomes = list(pool.map(lookup, range(4)))
+            close_db_connections()
+
+        expected = outcomes[0][0]
+        assert [c["ticker"] for c in expected[789019]] == ["MSFT"]
+        assert all(results == expected for results, _ in outcomes)
+        assert len({conn_id for _, conn_id in outcomes}) == 4
+
+    def test_search_companies_db_prefix_and_substring(self, tmp_path):
+        """Test fuzzy search falls back to FTS prefix, then substring matches."""
+        with patch("sec_company_lookup.db.db.DB_PATH", tmp_path / "test.db"):
+            load_data_to_db(SAMPLE_SEC_DATA)
+
+            # Word prefixes are answered by the FTS index
+            assert [c["ticker"] for c in search_companies_db("micro")] == ["MSFT"]
+            assert {c["ticker"] for c in search_companies_db("goo")} == {
+                "GOOG",
+                "GOOGL",
+            }
+            # Substrings inside a word still match via the LIKE scan
+            assert [c["ticker"] for c in search_companies_db("soft")] == ["MSFT"]
+            # Surrounding whitespace is ignored by every search path
+            assert [c["ticker"] for c in search_companies_db(" soft ")] == ["MSFT"]
+            exact = search_companies_db(" aapl ", fuzzy=False)
+            assert [c["ticker"] for c in exact] == ["AAPL"]
+            # Companies found by several sources are returned once
+            assert [c["ticker"] for c in search_companies_db("apple")] == [
+                "AAPL",
+                "AAPL-WT",
+            ]
+            assert len(search_companies_db("inc", limit=2)) == 2
+            # FTS syntax characters in the query are treated as separators
+            assert search_companies_db("AT&T") == []
+            assert search_companies_db('"') == []
+            assert [c["ticker"] for c in search_companies_db("microsoft-corp")] == [
+                "MSFT"
+            ]
+            # Single characters list tickers starting with them
+            assert [c["ticker"] for c in search_companies_db("a", limit=3)] == [
+                "AAPL",
+                "AAPL-WT",
+                "AMZN",
+            ]
+
+    def test_search_companies_db_fts_ranking(self, tmp_path):
+        """Test FTS ranking favours ticker hits and short queries sort by ticker."""
+        data = {
+            "0": {"cik_str": "1", "ticker": "ZETA", "title": "Acme Holdings"},
+            "1": {"cik_str": "2", "ticker": "ACME", "title": "Zeta Corp"},
+            "2": {"cik_str": "3", "ticker": "XY", "title": "Xy Group"},
+            "3": {"cik_str": "4", "ticker": "BXY", "title": "Xy Partners"},
+        }
+
+        with patch("sec_company_lookup.db.db.DB_PATH", tmp_path / "test.db"):
+            load_data_to_db(data)
+
+            assert [c["ticker"] for c in search_companies_db("acme")] == [
+                "ACME",
+                "ZETA",
+            ]
+            assert [c["ticker"] for c in search_companies_db("xy")] == ["BXY", "XY"]
+
+    def test_search_companies_by_company_name_db_ranking(self, tmp_path):
+        """Test fuzzy name search ranks exact, then prefix, then substring."""
+        data = {
+            "0": {"cik_str": "1", "ticker": "SUB", "title": "The Apple Store"},
+            "1": {"cik_str": "2", "ticker": "PRE", "title": "Apple Hospitality"},
+            "2": {"cik_str": "3", "ticker": "EXA", "title": "Apple"},
+            "3": {"cik_str": "4", "ticker": "NO", "title": "Banana Co"},
+        }
+
+        with patch("sec_company_lookup.db.db.DB_PATH", tmp_path / "test.db"):
+            load_data_to_db(data)
+
+            results = search_companies_by_company_name_db("APPLE")
+            assert [c["ticker"] for c in results] == ["EXA", "PRE", "SUB"]
+            limited = search_companies_by_company_name_db("apple", limit=2)
+            assert [c["ticker"] for c in limited] == ["EXA", "PRE"]
+
+            with get_db_connection(row_factory=False) as conn:
+                query = "SELECT * FROM companies WHERE title_lc LIKE ?"
+                plan = " ".join(
+                    str(row[-1])
+                    for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", ("app%",))
+                )
+                assert "idx_title_lc" in plan
+
+    def test_search_companies_by_company_name_db_skips_substring_scan(self, tmp_path):
+        """Test the substring scan only runs when prefix matches fall short."""
+        data = {
+            "0": {"cik_str": "1", "ticker": "SUB", "title": "The Apple Store"},
+            "1": {"cik_str": "2", "ticker": "PRE", "title": "Apple Hospitality"},
+            "2": {"cik_str": "3", "ticker": "EXA", "title": "Apple"},
+        }
+
+        with patch("sec_company_lookup.db.db.DB_PATH", tmp_path / "test.db"):
+            load_data_to_db(data)
+            statements: List[str] = []
+
+            with get_db_connection(row_factory=False, read_only=True) as conn:
+                conn.set_trace_callback(statements.append)
+                try:
+                    search_companies_by_company_name_db("apple", limit=2)
+                    assert not any("NOT LIKE" in sql for sql in statements)
+
+                    results = search_companies_by_company_name_db("apple", limit=3)
+                    assert any("NOT LIKE" in sql for sql in statements)
+                    assert [c["ticker"] for c in results] == ["EXA", "PRE", "SUB"]
+                finally:
+                    conn.set_trace_callback(None)
+
     def test_database_error_handling(self):
         """Test database error handling in search functions."""
         # Test search with invalid database path
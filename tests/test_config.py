@@ -0,0 +1,70 @@
+"""
+Tests for the sec_company_lookup configuration module.
+"""
+
+# pyright: reportPrivateUsage=false
+
+import pytest
+from unittest.mock import patch
+
+from sec_company_lookup import config
+from sec_company_lookup.config import (
+    set_user_email,
+    get_user_email,
+    get_user_agent,
+    clear_user_email,
+)
+
+
+class TestUserEmail:
+    """Test user email configuration."""
+
+    def setup_method(self):
+        """Start each test without a configured email."""
+        clear_user_email()
+
+    def teardown_method(self):
+        """Restore the email the rest of the test suite relies on."""
+        set_user_email("test@example.com")
+
+    def test_set_user_email_invalid(self):
+        """Test invalid emails are rejected."""
+        with pytest.raises(ValueError, match="'@'"):
+            set_user_email("not-an-email")
+        with pytest.raises(ValueError, match="format"):
+            set_user_email("user@localhost")
+
+    def test_env_email_read_once(self, monkeypatch):
+        """Test a valid environment email is validated once and reused."""
+        monkeypatch.setenv("SECCOMPANYLOOKUP_USER_EMAIL", "env@example.com")
+
+        with patch.object(config.os, "getenv", wraps=config.os.getenv) as getenv:
+            assert get_user_email() == "env@example.com"
+            assert get_user_email() == "env@example.com"
+
+        getenv.assert_called_once()
+
+    def test_set_user_email_overrides_env(self, monkeypatch):
+        """Test an explicitly set email takes priority and resets derived values."""
+        monkeypatch.setenv("SECCOMPANYLOOKUP_USER_EMAIL", "env@example.com")
+        assert get_user_agent() == "sec-company-lookup/0.1.0 (env@example.com)"
+
+        set_user_email("user@example.com")
+
+        assert get_user_email() == "user@example.com"
+        assert get_user_agent() == "sec-company-lookup/0.1.0 (user@example.com)"
+
+    def test_get_user_agent_requires_email(self, monkeypatch):
+        """Test a missing email raises instead of returning a cached agent."""
+        monkeypatch.delenv("SECCOMPANYLOOKUP_USER_EMAIL", raising=False)
+        set_user_email("user@example.com")
+        get_user_agent()
+
+        clear_user_email()
+
+        with pytest.raises(ValueError, match="User email is required"):
+            get_user_agent()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -5,6 +5,7 @@ This module provides consistent test data structures that match the actual
 SEC API format and the expected memory cache structure.
 """
 
+from array import array
 from typing import Dict, Any
 
 # Sample test data mimicking SEC API structure (company_tickers.json format)
@@ -19,33 +20,64 @@ SAMPLE_SEC_DATA: Dict[str, Dict[str, str]] = {
 
 # Sample memory cache structure that matches the actual cache structure used by the application
 SAMPLE_MEMORY_CACHE: Dict[str, Any] = {
-    "companies": {
-        "0": {"cik": 320193, "ticker": "AAPL", "name": "Apple Inc."},
-        "1": {"cik": 789019, "ticker": "MSFT", "name": "Microsoft Corporation"},
-        "2": {"cik": 1652044, "ticker": "GOOGL", "name": "Alphabet Inc."},
-        "3": {"cik": 1018724, "ticker": "AMZN", "name": "Amazon.com, Inc."},
-        "4": {"cik": 320193, "ticker": "AAPL-WT", "name": "Apple Inc."},
-        "5": {"cik": 1652044, "ticker": "GOOG", "name": "Alphabet Inc."},
-    },
+    "ciks": array("q", [320193, 789019, 1652044, 1018724, 320193, 1652044]),
+    "tickers": ["AAPL", "MSFT", "GOOGL", "AMZN", "AAPL-WT", "GOOG"],
+    "tickers_blob": "AAPL\0MSFT\0GOOGL\0AMZN\0AAPL-WT\0GOOG",
+    "tickers_starts": array("q", [0, 5, 10, 16, 21, 29, 34]),
+    "names": [
+        "Apple Inc.",
+        "Microsoft Corporation",
+        "Alphabet Inc.",
+        "Amazon.com, Inc.",
+        "Apple Inc.",
+        "Alphabet Inc.",
+    ],
+    "names_lower": [
+        "apple inc.",
+        "microsoft corporation",
+        "alphabet inc.",
+        "amazon.com, inc.",
+        "apple inc.",
+        "alphabet inc.",
+    ],
+    "names_blob": "apple inc.\0microsoft corporation\0alphabet inc.\0"
+    "amazon.com, inc.\0apple inc.\0alphabet inc.",
+    "names_starts": array("q", [0, 11, 33, 47, 64, 75, 89]),
+    "names_sorted": [
+        "alphabet inc.",
+        "amazon.com, inc.",
+        "apple inc.",
+        "microsoft corporation",
+    ],
+    "rows": [None] * 6,
     "by_ticker": {
-        "AAPL": "0",
-        "MSFT": "1",
-        "GOOGL": "2",
-        "AMZN": "3",
-        "AAPL-WT": "4",
-        "GOOG": "5",
+        "AAPL": 0,
+        "MSFT": 1,
+        "GOOGL": 2,
+        "AMZN": 3,
+        "AAPL-WT": 4,
+        "GOOG": 5,
     },
     "by_cik": {
-        320193: ["0", "4"],  # AAPL and AAPL-WT share same CIK
-        789019: ["1"],  # MSFT
-        1652044: ["2", "5"],  # GOOGL and GOOG share same CIK
-        1018724: ["3"],  # AMZN
+        320193: [0, 4],  # AAPL and AAPL-WT share same CIK
+        789019: [1],  # MSFT
+        1652044: [2, 5],  # GOOGL and GOOG share same CIK
+        1018724: [3],  # AMZN
     },
     "by_name": {
-        "apple inc.": ["0", "4"],  # Both AAPL entries
-        "microsoft corporation": ["1"],
-        "alphabet inc.": ["2", "5"],  # Both Google entries
-        "amazon.com, inc.": ["3"],
+        "apple inc.": [0, 4],  # Both AAPL entries
+        "microsoft corporation": [1],
+        "alphabet inc.": [2, 5],  # Both Google entries
+        "amazon.com, inc.": [3],
+    },
+    "by_word": {
+        "apple": [0, 4],
+        "inc": [0, 2, 3, 4, 5],
+        "microsoft": [1],
+        "corporation": [1],
+        "alphabet": [2, 5],
+        "amazon": [3],
+        "com": [3],
     },
 }
 
@@ -22,7 +22,10 @@ Note: Type checking warnings in this file are expected for test files that:
 # pyright: reportTypedDictNotRequiredAccess=false, reportUnknownArgumentType=false
 # pyright: reportUnknownMemberType=false, reportMissingParameterType=false
 
+import json
 import pytest
+import sys
+from array import array
 from unittest.mock import patch
 import time
 
@@ -36,12 +39,15 @@ from sec_company_lookup.sec_company_lookup import (
     ensure_data_loaded,
     update_data_impl,
     get_company_by_ticker_single,
+    find_company_by_ticker,
+    find_companies_by_cik,
     get_companies_by_tickers_batch,
     get_company_by_cik_single,
     get_companies_by_ciks_batch,
     get_company_by_name_single,
     get_companies_by_names_batch,
     search_companies_impl,
+    search_companies_multi_impl,
     search_companies_by_company_name_impl,
     clear_cache_impl,
     get_cache_info_impl,
@@ -65,7 +71,7 @@ class TestDataLoading:
         sec_module._load_data_to_memory(SAMPLE_SEC_DATA)
 
         # Check that data is loaded
-        assert len(sec_module._memory_cache["companies"]) == 6
+        assert len(sec_module._memory_cache["ciks"]) == 6
         assert len(sec_module._memory_cache["by_ticker"]) == 6
         assert len(sec_module._memory_cache["by_cik"]) == 4  # 4 unique CIKs
         assert len(sec_module._memory_cache["by_name"]) == 4  # 4 unique names
@@ -74,21 +80,145 @@ class TestDataLoading:
         assert 320193 in sec_module._memory_cache["by_cik"]
         assert len(sec_module._memory_cache["by_cik"][320193]) == 2  # AAPL and AAPL-WT
 
+    def test_load_data_to_memory_columns(self):
+        """Test that company rows are stored as parallel columns."""
+        sec_module._load_data_to_memory(SAMPLE_SEC_DATA)
+
+        cache = sec_module._memory_cache
+        aapl_id = cache["by_ticker"]["AAPL"]
+
+        assert len(cache["ciks"]) == len(cache["tickers"]) == len(cache["names"])
+        assert cache["ciks"][aapl_id] == 320193
+        assert cache["tickers"][aapl_id] == "AAPL"
+        assert cache["names_lower"][aapl_id] == "apple inc."
+
+    def test_load_data_to_memory_integer_ids(self):
+        """Test every index points at integer row positions into the columns."""
+        sec_module._load_data_to_memory(SAMPLE_SEC_DATA)
+
+        cache = sec_module._memory_cache
+        ids = list(cache["by_ticker"].values())
+        for index in ("by_cik", "by_name"):
+            ids.extend(i for group in cache[index].values() for i in group)
+
+        assert all(type(i) is int for i in ids)
+        assert sorted(set(ids)) == list(range(len(cache["tickers"])))
+        assert len(cache["rows"]) == len(cache["tickers"])
+
+    def test_load_data_to_memory_interns_tickers(self):
+        """Test tickers are interned and shared with returned rows."""
+        sec_module._load_data_to_memory(SAMPLE_SEC_DATA)
+
+        aapl_id = sec_module._memory_cache["by_ticker"]["AAPL"]
+        ticker = sec_module._memory_cache["tickers"][aapl_id]
+
+        assert ticker is sys.intern("AAPL")
+        assert sec_module._company(aapl_id)["ticker"] is ticker
+
+    def test_load_data_to_memory_indexes_share_column_strings(self):
+        """Test index keys are the column strings, not separate copies."""
+        sec_module._load_data_to_memory(SAMPLE_SEC_DATA)
+        cache = sec_module._memory_cache
+
+        for ticker, company_id in cache["by_ticker"].items():
+            assert ticker is cache["tickers"][company_id]
+        for name_lower, company_ids in cache["by_name"].items():
+            assert name_lower is cache["names_lower"][company_ids[0]]
+
+    def test_rows_are_built_only_on_access(self):
+        """Test loading keeps parallel columns and builds no per-company dicts."""
+        sec_module._load_data_to_memory(SAMPLE_SEC_DATA)
+        rows = sec_module._memory_cache["rows"]
+        assert rows == [None] * len(rows)
+
+        get_company_by_ticker_single("MSFT")
+        search_companies_impl("zzzz-no-match")
+
+        built = [row for row in rows if row is not None]
+        assert [row["ticker"] for row in built] == ["MSFT"]
+
+    def test_reloading_unchanged_data_keeps_memory_cache(self):
+        """Test a refresh with identical rows keeps indexes, rows and memos."""
+        sec_module._load_data_to_memory(SAMPLE_SEC_DATA)
+        cache = sec_module._memory_cache
+        msft = sec_module._company(1)
+        get_company_by_name_single("Apple Inc.")
+        sec_module._last_update = 1.0
+
+        sec_module._load_data_to_memory(SAMPLE_SEC_DATA)
+
+        assert sec_module._memory_cache is cache
+        assert sec_module._company(1) is msft
+        assert len(sec_module._name_cache) == 1
+        assert sec_module._last_update > 1.0
+
+        changed = dict(SAMPLE_SEC_DATA)
+        del changed["5"]
+        sec_module._load_data_to_memory(changed)
+
+        assert sec_module._memory_cache is not cache
+        assert "GOOG" not in sec_module._memory_cache["by_ticker"]
+        assert len(sec_module._name_cache) == 0
+
+    def test_grouped_indexes_are_plain_dicts(self):
+        """Test grouped indexes are frozen so probing a missing key inserts nothing."""
+        sec_module._load_data_to_memory(SAMPLE_SEC_DATA)
+        cache = sec_module._memory_cache
+
+        for index in ("by_cik", "by_name", "by_word"):
+            assert type(cache[index]) is dict
+        assert cache["by_cik"][1652044] == [2, 5]
+        assert cache["by_word"]["inc"] == [0, 2, 3, 4, 5]
+
+        sizes = [len(cache[index]) for index in ("by_cik", "by_name", "by_word")]
+        get_company_by_cik_single(1234567)
+        get_company_by_name_single("no such company")
+
+        assert [len(cache[i]) for i in ("by_cik", "by_name", "by_word")] == sizes
+
+    def test_companies_shares_rows(self):
+        """Test batch row access builds rows once and shares them with _company."""
+        sec_module._load_data_to_memory(SAMPLE_SEC_DATA)
+
+        rows = sec_module._companies([4, 0, 4])
+
+        assert [r["ticker"] for r in rows] == ["AAPL-WT", "AAPL", "AAPL-WT"]
+        assert rows[0] is rows[2] is sec_module._company(4)
+
+    def test_shared_rows_are_read_only(self):
+        """Test callers cannot change rows that later lookups return."""
+        sec_module._load_data_to_memory(SAMPLE_SEC_DATA)
+        row = get_company_by_ticker_single("AAPL")["data"]
+
+        with pytest.raises(TypeError):
+            row["name"] = "Changed"  # type: ignore[index]
+        with pytest.raises(TypeError):
+            row.update(name="Changed")  # type: ignore[call-arg]
+        with pytest.raises(TypeError):
+            del row["ticker"]  # type: ignore[misc]
+
+        assert get_company_by_ticker_single("AAPL")["data"]["name"] == "Apple Inc."
+        assert json.loads(json.dumps(row)) == row
+        copied = dict(row)
+        copied["name"] = "Changed"
+        assert copied != row
+
     def test_load_data_to_memory_structure(self):
         """Test that loaded data has correct structure."""
         sec_module._load_data_to_memory(SAMPLE_SEC_DATA)
 
         # Check a specific company
         aapl_id = sec_module._memory_cache["by_ticker"]["AAPL"]
-        aapl_data = sec_module._memory_cache["companies"][aapl_id]
+        aapl_data = sec_module._company(aapl_id)
 
         assert aapl_data["cik"] == 320193
         assert aapl_data["ticker"] == "AAPL"
         assert aapl_data["name"] == "Apple Inc."
 
+    @patch("sec_company_lookup.sec_company_lookup.save_packed_to_cache")
     @patch("sec_company_lookup.sec_company_lookup.download_sec_data")
-    @patch("sec_company_lookup.sec_company_lookup.load_data_to_db")
-    def test_update_data_impl_success(self, mock_load_db, mock_download):
+    @patch("sec_company_lookup.sec_company_lookup.load_columns_to_db")
+    def test_update_data_impl_success(self, mock_load_db, mock_download, mock_save):
         """Test successful data update."""
         mock_download.return_value = SAMPLE_SEC_DATA
 
@@ -96,8 +226,13 @@ class TestDataLoading:
 
         assert result is True
         mock_download.assert_called_once()
-        mock_load_db.assert_called_once()
-        assert len(sec_module._memory_cache["companies"]) > 0
+        mock_save.assert_called_once()
+        cache = sec_module._memory_cache
+        assert len(cache["ciks"]) > 0
+        # The database is fed the in-memory columns rather than re-parsing
+        mock_load_db.assert_called_once_with(
+            cache["ciks"], cache["tickers"], cache["names"], cache["names_lower"]
+        )
 
     @patch("sec_company_lookup.sec_company_lookup.download_sec_data")
     def test_update_data_impl_failure(self, mock_download):
@@ -116,30 +251,92 @@ class TestDataLoading:
         with pytest.raises(ValueError, match="Missing User-Agent"):
             update_data_impl()
 
+    @patch("sec_company_lookup.sec_company_lookup.save_packed_to_cache")
+    @patch("sec_company_lookup.sec_company_lookup.load_packed_from_cache")
     @patch("sec_company_lookup.sec_company_lookup.is_cache_expired")
     @patch("sec_company_lookup.sec_company_lookup.load_from_cache")
     @patch("sec_company_lookup.sec_company_lookup.update_data_impl")
-    def test_ensure_data_loaded_from_cache(self, mock_update, mock_load, mock_expired):
+    def test_ensure_data_loaded_from_cache(
+        self, mock_update, mock_load, mock_expired, mock_load_packed, mock_save
+    ):
         """Test loading data from cache."""
         # Test when cache is empty (not _memory_cache evaluates to True)
         mock_expired.return_value = True  # Trigger loading
-        mock_load.return_value = (SAMPLE_SEC_DATA, time.time())
+        mock_load_packed.return_value = (None, 0)
+        cached_timestamp = time.time() - 3600
+        mock_load.return_value = (SAMPLE_SEC_DATA, cached_timestamp)
 
         ensure_data_loaded()
 
         mock_load.assert_called_once()
         # update_data_impl should not be called since cached_data is available
         mock_update.assert_not_called()
-        assert len(sec_module._memory_cache["companies"]) > 0
+        assert len(sec_module._memory_cache["ciks"]) > 0
+        # The JSON cache is converted to the packed format for the next start,
+        # keeping the age of the data it came from
+        mock_save.assert_called_once()
+        assert mock_save.call_args[0][3] == cached_timestamp
 
     @patch("sec_company_lookup.sec_company_lookup.is_cache_expired")
+    @patch("sec_company_lookup.sec_company_lookup.load_packed_from_cache")
+    @patch("sec_company_lookup.sec_company_lookup.load_from_cache")
+    @patch("sec_company_lookup.sec_company_lookup.update_data_impl")
+    def test_ensure_data_loaded_from_packed_cache(
+        self, mock_update, mock_load, mock_load_packed, mock_expired
+    ):
+        """Test the packed column cache is preferred over the JSON cache."""
+        mock_expired.return_value = True
+        mock_load_packed.return_value = (
+            (array("q", [320193]), ["AAPL"], ["Apple Inc."]),
+            time.time(),
+        )
+
+        ensure_data_loaded()
+
+        mock_load.assert_not_called()
+        mock_update.assert_not_called()
+        assert sec_module._memory_cache["by_ticker"] == {"AAPL": 0}
+        assert sec_module._memory_cache["names_lower"] == ["apple inc."]
+
+    @patch("sec_company_lookup.sec_company_lookup.load_from_cache")
+    @patch(
+        "sec_company_lookup.db.db.get_db_connection",
+        side_effect=AssertionError("point lookups must not use the database"),
+    )
+    def test_point_lookups_from_packed_file_skip_database(
+        self, mock_connection, mock_load, tmp_path
+    ):
+        """Test a packed-file cold start serves point lookups without SQLite."""
+        from sec_company_lookup.utils.utils import save_packed
+
+        packed_file = tmp_path / "company_data.bin"
+        save_packed(
+            packed_file,
+            [320193, 320193, 789019],
+            ["AAPL", "AAPL-WT", "MSFT"],
+            ["Apple Inc.", "Apple Inc.", "Microsoft Corp"],
+        )
+
+        with patch("sec_company_lookup.utils.utils.PACKED_FILE", packed_file):
+            ensure_data_loaded()
+
+            assert get_company_by_ticker_single("msft")["data"]["cik"] == 789019
+            assert len(get_company_by_cik_single("0000320193")["data"]) == 2
+            response = get_company_by_name_single("microsoft corp")
+            assert response["data"]["ticker"] == "MSFT"
+        mock_connection.assert_not_called()
+        mock_load.assert_not_called()
+
+    @patch("sec_company_lookup.sec_company_lookup.is_cache_expired")
+    @patch("sec_company_lookup.sec_company_lookup.load_packed_from_cache")
     @patch("sec_company_lookup.sec_company_lookup.load_from_cache")
     @patch("sec_company_lookup.sec_company_lookup.update_data_impl")
     def test_ensure_data_loaded_expired_cache(
-        self, mock_update, mock_load, mock_expired
+        self, mock_update, mock_load, mock_load_packed, mock_expired
     ):
         """Test loading data when cache is expired."""
         mock_expired.return_value = True
+        mock_load_packed.return_value = (None, 0)
         mock_load.return_value = (None, 0)
         mock_update.return_value = True
 
@@ -148,6 +345,62 @@ class TestDataLoading:
         mock_load.assert_called_once()
         mock_update.assert_called_once()
 
+    @patch("sec_company_lookup.sec_company_lookup.load_from_cache")
+    def test_ensure_data_loaded_already_loaded(self, mock_load):
+        """Test no loading work is done once fresh data is in memory."""
+        sec_module._load_data_to_memory(SAMPLE_SEC_DATA)
+
+        ensure_data_loaded()
+
+        mock_load.assert_not_called()
+
+    @patch("sec_company_lookup.sec_company_lookup.is_cache_expired")
+    @patch("sec_company_lookup.sec_company_lookup._load_data")
+    def test_ensure_data_loaded_uses_monotonic_deadline(
+        self, mock_load_data, mock_expired
+    ):
+        """Test freshness is decided by the deadline set when data was loaded."""
+        mock_expired.return_value = True
+        sec_module._load_data_to_memory(SAMPLE_SEC_DATA)
+        assert sec_module._expiry_deadline > time.monotonic()
+
+        ensure_data_loaded()
+        mock_load_data.assert_not_called()
+
+        # Once the deadline passes the wall-clock expiry check is consulted
+        sec_module._expiry_deadline = time.monotonic() - 1
+        ensure_data_loaded()
+        mock_load_data.assert_called_once()
+
+    @patch("sec_company_lookup.sec_company_lookup._load_data")
+    def test_expiry_deadline_rechecks_wall_clock(self, mock_load_data):
+        """Test the deadline is re-derived from the wall clock at least per minute."""
+        sec_module._load_data_to_memory(SAMPLE_SEC_DATA)
+        recheck = sec_module._EXPIRY_RECHECK_SECONDS
+        assert sec_module._expiry_deadline <= time.monotonic() + recheck
+
+        # Fresh data: the lapsed deadline is renewed without reloading
+        sec_module._expiry_deadline = time.monotonic() - 1
+        ensure_data_loaded()
+        assert sec_module._expiry_deadline > time.monotonic()
+        mock_load_data.assert_not_called()
+
+        # Data that aged past expiry while the deadline stood still is reloaded
+        sec_module._last_update = time.time() - sec_module.CACHE_EXPIRY_HOURS * 3600 - 1
+        sec_module._expiry_deadline = time.monotonic() - 1
+        ensure_data_loaded()
+        mock_load_data.assert_called_once()
+
+    def test_clear_cache_resets_expiry_deadline(self):
+        """Test clearing the cache forces the next lookup down the load path."""
+        sec_module._load_data_to_memory(SAMPLE_SEC_DATA)
+
+        with patch("sec_company_lookup.sec_company_lookup.clear_cache_files"):
+            clear_cache_impl()
+
+        assert sec_module._expiry_deadline == 0.0
+        assert sec_module._last_update == 0
+
 
 class TestTickerLookups:
     """Test ticker lookup functionality."""
@@ -171,6 +424,16 @@ class TestTickerLookups:
         assert response["data"]["cik"] == 320193
         assert response["data"]["name"] == "Apple Inc."
 
+    def test_find_company_by_ticker(self):
+        """Test the bare ticker lookup returns the shared row or None."""
+        company = find_company_by_ticker(" aapl ")
+
+        assert company == {"cik": 320193, "ticker": "AAPL", "name": "Apple Inc."}
+        # Rows are built once and reused across lookups
+        assert find_company_by_ticker("AAPL") is company
+        assert find_company_by_ticker("INVALID") is None
+        assert find_company_by_ticker("  ") is None
+
     def test_get_company_by_ticker_single_case_insensitive(self):
         """Test ticker lookup is case insensitive."""
         response_upper = get_company_by_ticker_single("AAPL")
@@ -208,16 +471,8 @@ class TestTickerLookups:
         assert response["success"] is False
         assert response["error_code"] == "INVALID_INPUT"
 
-    @patch("sec_company_lookup.sec_company_lookup.get_companies_by_tickers_db")
-    def test_get_companies_by_tickers_batch_success(self, mock_db):
+    def test_get_companies_by_tickers_batch_success(self):
         """Test successful batch ticker lookup."""
-        mock_db.return_value = {
-            "AAPL": [{"cik": 320193, "ticker": "AAPL", "name": "Apple Inc."}],
-            "MSFT": [
-                {"cik": 789019, "ticker": "MSFT", "name": "Microsoft Corporation"}
-            ],
-        }
-
         results = get_companies_by_tickers_batch(["AAPL", "MSFT"])
 
         assert len(results) == 2
@@ -226,14 +481,8 @@ class TestTickerLookups:
         assert results["MSFT"]["success"] is True
         assert results["MSFT"]["data"]["ticker"] == "MSFT"
 
-    @patch("sec_company_lookup.sec_company_lookup.get_companies_by_tickers_db")
-    def test_get_companies_by_tickers_batch_mixed_results(self, mock_db):
+    def test_get_companies_by_tickers_batch_mixed_results(self):
         """Test batch lookup with mixed valid/invalid tickers."""
-        mock_db.return_value = {
-            "AAPL": [{"cik": 320193, "ticker": "AAPL", "name": "Apple Inc."}],
-            "INVALID": [],
-        }
-
         results = get_companies_by_tickers_batch(["AAPL", "INVALID"])
 
         assert len(results) == 2
@@ -241,21 +490,14 @@ class TestTickerLookups:
         assert results["INVALID"]["success"] is False
         assert results["INVALID"]["error_code"] == "NOT_FOUND"
 
-    @patch("sec_company_lookup.sec_company_lookup.get_companies_by_tickers_db")
-    def test_get_companies_by_tickers_batch_empty_input(self, mock_db):
+    def test_get_companies_by_tickers_batch_empty_input(self):
         """Test batch lookup with empty input."""
         results = get_companies_by_tickers_batch([])
 
         assert len(results) == 0
-        mock_db.assert_not_called()
 
-    @patch("sec_company_lookup.sec_company_lookup.get_companies_by_tickers_db")
-    def test_get_companies_by_tickers_batch_with_whitespace(self, mock_db):
+    def test_get_companies_by_tickers_batch_with_whitespace(self):
         """Test batch lookup handles whitespace."""
-        mock_db.return_value = {
-            "AAPL": [{"cik": 320193, "ticker": "AAPL", "name": "Apple Inc."}],
-        }
-
         results = get_companies_by_tickers_batch(["  AAPL  ", "", "  "])
 
         # Should have results for all three inputs
@@ -266,17 +508,17 @@ class TestTickerLookups:
         assert results["  "]["success"] is False
         assert results["  "]["error_code"] == "INVALID_INPUT"
 
-    @patch("sec_company_lookup.sec_company_lookup.get_companies_by_tickers_db")
-    def test_get_companies_by_tickers_batch_database_error(self, mock_db):
-        """Test batch lookup falls back to memory on database error."""
-        mock_db.side_effect = Exception("Database error")
+    @patch(
+        "sec_company_lookup.db.db.get_db_connection",
+        side_effect=AssertionError("batch lookups must not use the database"),
+    )
+    def test_get_companies_by_tickers_batch_memory_only(self, mock_connection):
+        """Test batch lookup answers from memory, once per original spelling."""
+        results = get_companies_by_tickers_batch(["aapl", "AAPL"])
 
-        results = get_companies_by_tickers_batch(["AAPL", "MSFT"])
-
-        # Should fall back to memory cache
-        assert len(results) == 2
-        assert results["AAPL"]["success"] is True
-        assert results["MSFT"]["success"] is True
+        assert results["aapl"]["data"] is results["AAPL"]["data"]
+        assert results["aapl"]["data"] is sec_module._company(0)
+        mock_connection.assert_not_called()
 
 
 class TestCIKLookups:
@@ -291,6 +533,15 @@ class TestCIKLookups:
         """Clean up after each test."""
         clear_cache_impl()
 
+    def test_find_companies_by_cik(self):
+        """Test the bare CIK lookup returns all shared rows for the CIK."""
+        companies = find_companies_by_cik("0000320193")
+
+        assert [c["ticker"] for c in companies] == ["AAPL", "AAPL-WT"]
+        assert find_companies_by_cik(320193)[0] is companies[0]
+        assert find_companies_by_cik(999999999) == []
+        assert find_companies_by_cik("invalid") == []
+
     def test_get_company_by_cik_single_success(self):
         """Test successful single CIK lookup."""
         response = get_company_by_cik_single(320193)
@@ -339,16 +590,8 @@ class TestCIKLookups:
         tickers = {c["ticker"] for c in response["data"]}
         assert tickers == {"GOOGL", "GOOG"}
 
-    @patch("sec_company_lookup.sec_company_lookup.get_companies_by_ciks_db")
-    def test_get_companies_by_ciks_batch_success(self, mock_db):
+    def test_get_companies_by_ciks_batch_success(self):
         """Test successful batch CIK lookup."""
-        mock_db.return_value = {
-            320193: [{"cik": 320193, "ticker": "AAPL", "name": "Apple Inc."}],
-            789019: [
-                {"cik": 789019, "ticker": "MSFT", "name": "Microsoft Corporation"}
-            ],
-        }
-
         results = get_companies_by_ciks_batch([320193, 789019])
 
         assert len(results) == 2
@@ -356,29 +599,16 @@ class TestCIKLookups:
         assert len(results[320193]["data"]) >= 1
         assert results[789019]["success"] is True
 
-    @patch("sec_company_lookup.sec_company_lookup.get_companies_by_ciks_db")
-    def test_get_companies_by_ciks_batch_mixed_types(self, mock_db):
+    def test_get_companies_by_ciks_batch_mixed_types(self):
         """Test batch CIK lookup with mixed int/string types."""
-        mock_db.return_value = {
-            320193: [{"cik": 320193, "ticker": "AAPL", "name": "Apple Inc."}],
-            789019: [
-                {"cik": 789019, "ticker": "MSFT", "name": "Microsoft Corporation"}
-            ],
-        }
-
         results = get_companies_by_ciks_batch([320193, "789019"])
 
         assert len(results) == 2
         assert results[320193]["success"] is True
         assert results["789019"]["success"] is True
 
-    @patch("sec_company_lookup.sec_company_lookup.get_companies_by_ciks_db")
-    def test_get_companies_by_ciks_batch_invalid_ciks(self, mock_db):
+    def test_get_companies_by_ciks_batch_invalid_ciks(self):
         """Test batch CIK lookup with invalid CIKs."""
-        mock_db.return_value = {
-            320193: [{"cik": 320193, "ticker": "AAPL", "name": "Apple Inc."}],
-        }
-
         # Test with invalid CIKs - type: ignore is needed for intentionally passing None
         results = get_companies_by_ciks_batch([320193, "invalid", None])  # type: ignore
 
@@ -389,25 +619,35 @@ class TestCIKLookups:
         assert results[None]["success"] is False  # type: ignore
         assert results[None]["error_code"] == "INVALID_INPUT"  # type: ignore
 
-    @patch("sec_company_lookup.sec_company_lookup.get_companies_by_ciks_db")
-    def test_get_companies_by_ciks_batch_empty_input(self, mock_db):
+    def test_get_companies_by_ciks_batch_not_found(self):
+        """Test unknown CIKs are reported not found, in input order."""
+        results = get_companies_by_ciks_batch([320193, "0000789019", 1234567])
+
+        assert list(results) == [320193, "0000789019", 1234567]
+        assert results[320193]["success"] is True
+        assert results["0000789019"]["success"] is True
+        assert results[1234567]["error"] == "CIK '1234567' not found"
+        assert results[1234567]["error_code"] == "NOT_FOUND"
+
+    def test_get_companies_by_ciks_batch_empty_input(self):
         """Test batch CIK lookup with empty input."""
         results = get_companies_by_ciks_batch([])
 
         assert len(results) == 0
-        mock_db.assert_not_called()
 
-    @patch("sec_company_lookup.sec_company_lookup.get_companies_by_ciks_db")
-    def test_get_companies_by_ciks_batch_database_error(self, mock_db):
-        """Test batch CIK lookup falls back to memory on database error."""
-        mock_db.side_effect = Exception("Database error")
+    @patch(
+        "sec_company_lookup.db.db.get_db_connection",
+        side_effect=AssertionError("batch lookups must not use the database"),
+    )
+    def test_get_companies_by_ciks_batch_memory_only(self, mock_connection):
+        """Test batch lookup answers from memory, once per original spelling."""
+        results = get_companies_by_ciks_batch([320193, "0000320193", "320193"])
 
-        results = get_companies_by_ciks_batch([320193, 789019])
-
-        # Should fall back to memory cache
-        assert len(results) == 2
-        assert results[320193]["success"] is True
-        assert results[789019]["success"] is True
+        assert list(results) == [320193, "0000320193", "320193"]
+        assert results[320193]["data"] == results["0000320193"]["data"]
+        assert results[320193]["data"] is not results["320193"]["data"]
+        assert results[320193]["data"][0] is sec_module._company(0)
+        mock_connection.assert_not_called()
 
 
 class TestNameLookups:
@@ -448,6 +688,29 @@ class TestNameLookups:
         assert response["success"] is True
         assert "Microsoft" in response["data"]["name"]
 
+    def test_get_company_by_name_single_fuzzy_shortening(self):
+        """Test fuzzy matching drops trailing words until one row matches."""
+        response = get_company_by_name_single("Amazon.com Holdings", fuzzy=True)
+        assert response["success"] is True
+        assert response["data"]["ticker"] == "AMZN"
+
+        # A name shared by several rows is ambiguous
+        response = get_company_by_name_single("Alphabet Holdings", fuzzy=True)
+        assert response["success"] is False
+
+    def test_fuzzy_name_matching_stays_in_memory(self):
+        """Test fuzzy name matching never queries SQLite (substrings, not tokens)."""
+        with patch(
+            "sec_company_lookup.db.db.get_db_connection",
+            side_effect=AssertionError("fuzzy name matching must not use SQLite"),
+        ):
+            # "rosof" is inside a word, which an FTS token match would miss
+            response = get_company_by_name_single("rosof", fuzzy=True)
+            assert response["data"]["ticker"] == "MSFT"
+
+            results = sec_module._search_companies_memory("rosof", 5, True)
+            assert [c["ticker"] for c in results] == ["MSFT"]
+
     def test_get_company_by_name_single_not_found(self):
         """Test name not found."""
         response = get_company_by_name_single("NonExistent Company", fuzzy=False)
@@ -455,6 +718,43 @@ class TestNameLookups:
         assert response["success"] is False
         assert response["error_code"] == "NOT_FOUND"
 
+    def test_get_company_by_name_single_memoizes_normalized_name(self):
+        """Test case and whitespace variants of a name share one cache entry."""
+        stats = sec_module._name_cache.stats
+
+        get_company_by_name_single("Apple Inc.")
+        response = get_company_by_name_single("  APPLE INC. ")
+
+        assert response["data"]["ticker"] == "AAPL"
+        assert stats()["entries"] == 1
+        assert stats()["hits"] >= 1
+
+        # Misses are cached too, but the error still echoes the caller's input
+        get_company_by_name_single("Nowhere Corp", fuzzy=True)
+        response = get_company_by_name_single("NOWHERE CORP", fuzzy=True)
+        assert response["error"] == (
+            "Company name 'NOWHERE CORP' does not match any name"
+        )
+        assert stats()["negative"]["hits"] >= 1
+
+    def test_single_ticker_and_cik_lookups_are_not_memoized(self):
+        """Test ticker and CIK lookups probe the indexes directly every time."""
+        for ticker in ("AAPL", "aapl", " Aapl "):
+            assert get_company_by_ticker_single(ticker)["data"]["cik"] == 320193
+        for cik in (320193, "320193", "0000320193"):
+            assert len(get_company_by_cik_single(cik)["data"]) == 2
+
+        # Rows come straight from the memory cache, so reloaded data is
+        # visible immediately and errors echo the caller's input
+        response = get_company_by_ticker_single("ZZZZ")
+        assert response["error"] == "Ticker 'ZZZZ' not found"
+        response = get_company_by_cik_single("0000999999")
+        assert response["error"] == "CIK '0000999999' not found"
+        assert get_company_by_ticker_single("MSFT")["data"] is sec_module._company(
+            sec_module._memory_cache["by_ticker"]["MSFT"]
+        )
+        assert set(sec_module.get_cache_info_impl()["lookup_caches"]) == {"name"}
+
     def test_get_company_by_name_single_empty_input(self):
         """Test empty name input."""
         response = get_company_by_name_single("")
@@ -579,6 +879,19 @@ class TestSearchFunctions:
         assert len(results) >= 1
         assert results[0]["ticker"] == "AAPL"
 
+    @patch("sec_company_lookup.sec_company_lookup.search_companies_db")
+    def test_search_companies_impl_deduplicates_db_results(self, mock_db):
+        """Test database rows already found in memory are not repeated."""
+        mock_db.return_value = [
+            {"cik": 320193, "ticker": "AAPL", "name": "Apple Inc."},
+            {"cik": 320193, "ticker": "AAPL-WT", "name": "Apple Inc."},
+            {"cik": 320193, "ticker": "AAPL-WT", "name": "Apple Inc."},
+        ]
+
+        results = search_companies_impl("AAPL", limit=10)
+
+        assert [r["ticker"] for r in results] == ["AAPL", "AAPL-WT"]
+
     @patch("sec_company_lookup.sec_company_lookup.search_companies_db")
     def test_search_companies_impl_limit(self, mock_db):
         """Test search respects limit."""
@@ -592,6 +905,27 @@ class TestSearchFunctions:
 
         assert len(results) <= 2
 
+    def test_search_companies_multi_impl(self):
+        """Test several queries are searched in one call."""
+        results = search_companies_multi_impl(["aapl", "Inc", "zzzz", ""], limit=2)
+
+        assert list(results) == ["aapl", "Inc", "zzzz", ""]
+        assert results["aapl"][0]["ticker"] == "AAPL"
+        assert 0 < len(results["Inc"]) <= 2
+        assert all("inc" in r["name"].lower() for r in results["Inc"])
+        assert results["zzzz"] == []
+        assert results[""] == []
+
+    def test_search_companies_multi_impl_shares_scans(self):
+        """Test queries differing only in case or whitespace share one scan."""
+        with patch.object(
+            sec_module, "_search_ids_memory", wraps=sec_module._search_ids_memory
+        ) as mock_search:
+            results = search_companies_multi_impl(["Apple", " apple ", "APPLE"])
+
+        mock_search.assert_called_once()
+        assert results["Apple"] == results[" apple "] == results["APPLE"]
+
     @patch("sec_company_lookup.sec_company_lookup.search_companies_db")
     def test_search_companies_impl_database_fallback(self, mock_db):
         """Test search falls back to memory on database error."""
@@ -604,6 +938,106 @@ class TestSearchFunctions:
         # Should have results from memory cache fallback
         assert len(results) >= 1
 
+    def test_search_companies_memory_fuzzy(self):
+        """Test the in-memory scan matches tickers first, then names."""
+        results = sec_module._search_companies_memory("goog", limit=10, fuzzy=True)
+
+        assert [r["ticker"] for r in results] == ["GOOGL", "GOOG"]
+
+        results = sec_module._search_companies_memory("inc", limit=3, fuzzy=True)
+
+        assert len(results) == 3
+        assert all("inc" in r["name"].lower() for r in results)
+
+    def test_search_companies_memory_fuzzy_reads_precomputed_case(self):
+        """Test fuzzy scans never re-case the stored tickers and names."""
+
+        class NoCasing(str):
+            def lower(self):
+                raise AssertionError("name lowered during scan")
+
+            def upper(self):
+                raise AssertionError("ticker uppercased during scan")
+
+        cache = sec_module._memory_cache
+        cache["names"] = [NoCasing(name) for name in cache["names"]]
+        cache["tickers"] = [NoCasing(ticker) for ticker in cache["tickers"]]
+
+        results = sec_module._search_companies_memory("goog", limit=10, fuzzy=True)
+
+        assert [r["ticker"] for r in results] == ["GOOGL", "GOOG"]
+
+        results = sec_module._search_companies_memory("Inc", limit=3, fuzzy=True)
+
+        assert len(results) == 3
+
+    def test_search_companies_memory_fuzzy_prefers_name_prefixes(self):
+        """Test names starting with the query rank before other name matches."""
+        sec_module._load_data_to_memory(
+            {
+                "0": {"cik_str": "1", "ticker": "BNC", "title": "Banco Apple"},
+                "1": {"cik_str": "2", "ticker": "AAPL", "title": "Apple Inc."},
+            }
+        )
+
+        with patch(
+            "sec_company_lookup.sec_company_lookup._scan_names",
+            side_effect=AssertionError("prefix matches filled the limit"),
+        ):
+            results = sec_module._search_companies_memory("appl", limit=1)
+
+        assert [r["ticker"] for r in results] == ["AAPL"]
+
+        results = sec_module._search_companies_memory("appl", limit=10)
+
+        assert [r["ticker"] for r in results] == ["AAPL", "BNC"]
+
+    def test_scan_column(self):
+        """Test column scan returns matching row ids up to the limit."""
+        column = ["apple inc.", "microsoft", "pineapple co"]
+
+        assert sec_module._scan_column(column, "apple", 10) == [0, 2]
+        assert sec_module._scan_column(column, "apple", 1) == [0]
+        assert sec_module._scan_column(column, "zzz", 10) == []
+
+    def test_scan_names(self):
+        """Test name buffer scan matches the per-row column scan."""
+        names_lower = sec_module._memory_cache["names_lower"]
+
+        for needle in ["inc", "apple inc.", "a", ".", "zzz", "inc.\0amazon", ""]:
+            assert sec_module._scan_names(needle, 10) == sec_module._scan_column(
+                names_lower, needle, 10
+            )
+        # A row matching the needle several times is reported once
+        assert sec_module._scan_names("o", 3) == [1, 3]
+
+    def test_scan_tickers(self):
+        """Test ticker buffer scan matches the per-row column scan."""
+        tickers = sec_module._memory_cache["tickers"]
+
+        for needle in ["AAPL", "A", "G", "-", "L\0M", "ZZZ", ""]:
+            assert sec_module._scan_tickers(needle, 10) == sec_module._scan_column(
+                tickers, needle, 10
+            )
+        assert sec_module._scan_tickers("A", 2) == [0, 3]
+
+    def test_scan_names_word_index(self):
+        """Test whole words inside the needle narrow the scan to indexed rows."""
+        names_lower = sec_module._memory_cache["names_lower"]
+        scans_before = sec_module._scan_counts["word_index"]
+
+        # "com" and "inc" sit between separators, so they must be whole words
+        for needle in ["on.com, inc.", "n.com, i", "zzz inc zzz", " microsoft "]:
+            assert sec_module._scan_names(needle, 10) == sec_module._scan_column(
+                names_lower, needle, 10
+            )
+        assert sec_module._scan_counts["word_index"] == scans_before + 4
+
+        # Fragments at either end may be parts of longer words
+        assert sec_module._word_candidates("soft") is None
+        assert sec_module._word_candidates("pple inc") is None
+        assert sec_module._word_candidates("a.com, i") == {3}
+
     @patch("sec_company_lookup.sec_company_lookup.search_companies_by_company_name_db")
     def test_search_companies_by_company_name_impl_success(self, mock_db):
         """Test successful company name search."""
@@ -634,6 +1068,24 @@ class TestSearchFunctions:
         assert len(results) >= 1
         assert results[0]["name"] == "Apple Inc."
 
+    @patch("sec_company_lookup.sec_company_lookup.search_companies_by_company_name_db")
+    def test_search_companies_by_company_name_impl_deduplicates_db_results(
+        self, mock_db
+    ):
+        """Test database rows already matched by name in memory are not repeated."""
+        mock_db.return_value = [
+            {"cik": 1652044, "ticker": "GOOGL", "name": "Alphabet Inc."},
+            {"cik": 1652044, "ticker": "GOOG", "name": "Alphabet Inc."},
+            {"cik": 1, "ticker": "ALPH", "name": "Alphabet Inc. Holdings"},
+            {"cik": 1, "ticker": "ALPH", "name": "Alphabet Inc. Holdings"},
+        ]
+
+        results = search_companies_by_company_name_impl("Alphabet Inc.", limit=10)
+
+        tickers = [r["ticker"] for r in results]
+        assert sorted(tickers[:2]) == ["GOOG", "GOOGL"]
+        assert tickers[2:] == ["ALPH"]
+
     @patch("sec_company_lookup.sec_company_lookup.search_companies_by_company_name_db")
     def test_search_companies_by_company_name_impl_fuzzy(self, mock_db):
         """Test fuzzy name search."""
@@ -645,6 +1097,26 @@ class TestSearchFunctions:
 
         assert len(results) >= 1
 
+    @patch("sec_company_lookup.sec_company_lookup.search_companies_by_company_name_db")
+    def test_search_companies_by_company_name_impl_prefix_in_memory(self, mock_db):
+        """Test prefix matches filling the limit are served without the database."""
+        results = search_companies_by_company_name_impl("a", limit=3, fuzzy=True)
+
+        # Prefix matches are ordered by ticker, like the database query
+        assert [r["ticker"] for r in results] == ["AAPL", "AAPL-WT", "AMZN"]
+        mock_db.assert_not_called()
+
+        # Too few prefix matches still consult the database for substrings
+        mock_db.return_value = []
+        search_companies_by_company_name_impl("alpha", limit=5, fuzzy=True)
+        mock_db.assert_called_once_with("alpha", 5, True)
+
+    def test_prefix_name_ids(self):
+        """Test prefix search over the sorted distinct names."""
+        assert list(sec_module._prefix_name_ids("a")) == [[2, 5], [3], [0, 4]]
+        assert list(sec_module._prefix_name_ids("apple")) == [[0, 4]]
+        assert list(sec_module._prefix_name_ids("zzz")) == []
+
     @patch("sec_company_lookup.sec_company_lookup.search_companies_by_company_name_db")
     def test_search_companies_by_company_name_impl_database_fallback(self, mock_db):
         """Test name search falls back to memory on database error."""
@@ -676,12 +1148,12 @@ class TestCacheManagement:
     def test_clear_cache_impl(self):
         """Test cache clearing."""
         # Ensure cache has data
-        assert len(sec_module._memory_cache["companies"]) > 0
+        assert len(sec_module._memory_cache["ciks"]) > 0
 
         clear_cache_impl()
 
         # Verify cache is empty
-        assert len(sec_module._memory_cache["companies"]) == 0
+        assert len(sec_module._memory_cache["ciks"]) == 0
         assert len(sec_module._memory_cache["by_ticker"]) == 0
         assert len(sec_module._memory_cache["by_cik"]) == 0
         assert len(sec_module._memory_cache["by_name"]) == 0
@@ -725,6 +1197,29 @@ class TestCacheManagement:
         assert "ciks_indexed" in struct
         assert "names_indexed" in struct
 
+    @patch("sec_company_lookup.sec_company_lookup.get_db_stats")
+    def test_get_cache_info_impl_lookup_metrics(self, mock_db_stats):
+        """Test cache info reports lookup cache and scan metrics."""
+        mock_db_stats.return_value = {}
+        get_company_by_name_single("Apple Inc.")
+        get_company_by_name_single("Apple Inc.")
+        get_company_by_name_single("Invalid Corp")
+        scans_before = dict(sec_module._scan_counts)
+        sec_module._search_companies_memory("zzz", limit=5)
+
+        info = get_cache_info_impl()
+
+        name_stats = info["lookup_caches"]["name"]
+        assert name_stats["entries"] == 1
+        assert name_stats["bytes"] > 0
+        assert name_stats["hits"] >= 1
+        assert 0.0 <= name_stats["hit_rate"] <= 1.0
+        assert name_stats["negative"]["entries"] == 1
+        assert (
+            info["search_scans"]["ticker_buffer"] == scans_before["ticker_buffer"] + 1
+        )
+        assert info["search_scans"]["name_buffer"] == scans_before["name_buffer"] + 1
+
 
 class TestEdgeCases:
     """Test edge cases and error handling."""
@@ -3,7 +3,9 @@ Tests for the sec_company_lookup utilities functionality.
 """
 
 import pytest
+import gzip
 import json
+import os
 import time
 from typing import Any
 from unittest.mock import patch, MagicMock, mock_open
@@ -14,10 +16,18 @@ from sec_company_lookup.config import set_user_email
 set_user_email("test@example.com")
 
 from sec_company_lookup.utils.utils import (
+    _RateLimiter,
+    _json_loads,
     download_sec_data,
     is_cache_expired,
     load_from_cache,
+    load_packed,
+    load_packed_from_cache,
+    save_packed,
+    save_packed_to_cache,
     normalize_cik,
+    normalize_ciks,
+    check_cache_fresh,
     clear_cache_files,
     ensure_cache_dir,
 )
@@ -54,6 +64,19 @@ class TestUtilityFunctions:
         assert normalize_cik("0") is None  # "0" becomes empty string after lstrip('0')
         assert normalize_cik("0000000001") == 1  # Leading zeros stripped, becomes "1"
         assert normalize_cik(0) == 0  # Integer input passes through
+        assert normalize_cik("0000") is None
+
+        # Forms int() would accept are still rejected
+        for raw in ("-5", "+5", " 5", "5 ", "1_000", "\u00b2"):
+            assert normalize_cik(raw) is None
+
+    def test_normalize_ciks(self):
+        """Test bulk CIK normalization keeps input order and marks invalid values."""
+        ciks = [320193, "0000789019", "invalid", None, "0"]
+
+        assert normalize_ciks(ciks) == [320193, 789019, None, None, None]
+        assert normalize_ciks(ciks) == [normalize_cik(c) for c in ciks]
+        assert normalize_ciks([]) == []
 
     def test_is_cache_expired(self):
         """Test cache expiration logic."""
@@ -75,6 +98,51 @@ class TestUtilityFunctions:
         future_time = current_time + 3600
         assert is_cache_expired(future_time) is False
 
+    def test_check_cache_fresh(self, tmp_path: Any) -> None:
+        """Test cache freshness comes from the file's mtime alone."""
+        path = tmp_path / "company_data.json"
+        assert check_cache_fresh(path) == (False, 0)
+
+        path.write_bytes(b"{}")
+        is_fresh, last_update = check_cache_fresh(path)
+        assert is_fresh is True
+        assert last_update == path.stat().st_mtime
+
+        old = time.time() - 25 * 3600
+        os.utime(path, (old, old))
+        assert check_cache_fresh(path) == (False, old)
+
+    def test_json_loads_without_orjson(self):
+        """Test JSON parsing falls back to the stdlib when orjson is missing."""
+        raw = json.dumps(SAMPLE_SEC_DATA).encode()
+
+        with patch("sec_company_lookup.utils.utils.orjson", None):
+            assert _json_loads(raw) == SAMPLE_SEC_DATA
+            # The streamed download hands over its growing bytearray directly
+            assert _json_loads(bytearray(raw)) == SAMPLE_SEC_DATA
+
+    def test_json_loads_prefers_orjson(self):
+        """Test JSON parsing goes through orjson when it is installed."""
+        mock_orjson = MagicMock()
+        mock_orjson.loads.return_value = SAMPLE_SEC_DATA
+
+        with patch("sec_company_lookup.utils.utils.orjson", mock_orjson):
+            assert _json_loads(b"{}") == SAMPLE_SEC_DATA
+
+        mock_orjson.loads.assert_called_once_with(b"{}")
+
+    def test_rate_limiter(self):
+        """Test the rate limiter allows a burst up to its rate, then waits."""
+        limiter = _RateLimiter(rate=5)
+
+        with patch("sec_company_lookup.utils.utils.time.sleep") as mock_sleep:
+            for _ in range(5):
+                limiter.acquire()
+            mock_sleep.assert_not_called()
+
+            limiter.acquire()
+            mock_sleep.assert_called_once()
+
     def test_ensure_cache_dir(self):
         """Test cache directory creation."""
         with patch("sec_company_lookup.utils.utils.CACHE_DIR") as mock_cache_dir:
@@ -85,51 +153,134 @@ class TestUtilityFunctions:
             ensure_cache_dir()
             mock_cache_dir.mkdir.assert_called_once_with(exist_ok=True)
 
-    @patch("sec_company_lookup.utils.utils.requests.get")
-    @patch("sec_company_lookup.utils.utils.open", new_callable=mock_open)
+    @patch("sec_company_lookup.utils.utils._get_session")
+    @patch("sec_company_lookup.utils.utils.DATA_FILE")
+    @patch("sec_company_lookup.utils.utils.gzip.open", new_callable=mock_open)
     @patch("sec_company_lookup.utils.utils.ensure_cache_dir")
     def test_download_sec_data_success(
-        self, mock_ensure_dir: Any, mock_file: Any, mock_get: Any
+        self,
+        mock_ensure_dir: Any,
+        mock_file: Any,
+        mock_data_file: Any,
+        mock_session: Any,
     ) -> None:
         """Test successful SEC data download."""
-        # Mock successful HTTP response
+        # Mock successful HTTP response, streamed in two chunks
+        body = json.dumps(SAMPLE_SEC_DATA).encode()
         mock_response = MagicMock()
-        mock_response.json.return_value = SAMPLE_SEC_DATA
+        mock_response.iter_content.return_value = [body[:100], body[100:]]
         mock_response.raise_for_status.return_value = None
+        mock_get = mock_session.return_value.get
         mock_get.return_value = mock_response
 
         result = download_sec_data()
 
         assert result == SAMPLE_SEC_DATA
         mock_get.assert_called_once()
+        assert mock_get.call_args[1]["stream"] is True
         mock_ensure_dir.assert_called_once()
-        mock_file.assert_called_once()
+        # The raw body is parsed once and written as-is, never decoded via .json()/.text
+        mock_response.json.assert_not_called()
+        tmp_path = mock_data_file.with_suffix.return_value
+        mock_file.assert_called_once_with(tmp_path, "wb", compresslevel=1)
+        assert b"".join(c.args[0] for c in mock_file().write.call_args_list) == body
+        # The complete file replaces the cache, and the connection is released
+        tmp_path.replace.assert_called_once_with(mock_data_file)
+        mock_response.close.assert_called_once()
+
+    @patch("sec_company_lookup.utils.utils._get_session")
+    def test_download_sec_data_keeps_cache_on_bad_body(
+        self, mock_session: Any, tmp_path: Any
+    ) -> None:
+        """Test a body that fails to parse falls back to the cache file."""
+        data_file = tmp_path / "company_data.json.gz"
+        data_file.write_bytes(gzip.compress(json.dumps(SAMPLE_SEC_DATA).encode()))
+        mock_response = MagicMock()
+        mock_response.iter_content.return_value = [b"<html>Maintenance</html>"]
+        mock_session.return_value.get.return_value = mock_response
+
+        with patch("sec_company_lookup.utils.utils.DATA_FILE", data_file):
+            with patch("sec_company_lookup.utils.utils.CACHE_DIR", tmp_path):
+                assert download_sec_data() == SAMPLE_SEC_DATA
+
+        assert json.loads(gzip.decompress(data_file.read_bytes())) == SAMPLE_SEC_DATA
+        assert list(tmp_path.iterdir()) == [data_file]
+        mock_response.close.assert_called_once()
+
+    @patch("sec_company_lookup.utils.utils._get_session")
+    def test_update_data_bad_body_without_cache(
+        self, mock_session: Any, tmp_path: Any
+    ) -> None:
+        """Test a non-JSON body with no cache makes update_data return False."""
+        from sec_company_lookup.sec_company_lookup import update_data_impl
+
+        mock_response = MagicMock()
+        mock_response.iter_content.return_value = [b"<html>Maintenance</html>"]
+        mock_session.return_value.get.return_value = mock_response
+
+        data_file = tmp_path / "company_data.json.gz"
+        with patch("sec_company_lookup.utils.utils.DATA_FILE", data_file):
+            with patch("sec_company_lookup.utils.utils.CACHE_DIR", tmp_path):
+                assert update_data_impl() is False
+
+        assert list(tmp_path.iterdir()) == []
 
-    @patch("sec_company_lookup.utils.utils.requests.get")
+    @patch("sec_company_lookup.utils.utils._get_session")
+    def test_download_sec_data_writes_gzipped_cache(
+        self, mock_session: Any, tmp_path: Any
+    ) -> None:
+        """Test the downloaded body is stored gzipped and read back by the cache."""
+        data_file = tmp_path / "company_data.json.gz"
+        body = json.dumps(SAMPLE_SEC_DATA).encode()
+        mock_response = MagicMock()
+        mock_response.iter_content.return_value = [body[:100], body[100:]]
+        mock_session.return_value.get.return_value = mock_response
+
+        with patch("sec_company_lookup.utils.utils.DATA_FILE", data_file):
+            with patch("sec_company_lookup.utils.utils.CACHE_DIR", tmp_path):
+                assert download_sec_data() == SAMPLE_SEC_DATA
+                data, timestamp = load_from_cache()
+
+        assert gzip.decompress(data_file.read_bytes()) == body
+        assert list(tmp_path.iterdir()) == [data_file]
+        assert data == SAMPLE_SEC_DATA
+        assert timestamp == data_file.stat().st_mtime
+
+    def test_load_from_cache_truncated_file(self, tmp_path: Any) -> None:
+        """Test a truncated gzip cache is treated as missing."""
+        data_file = tmp_path / "company_data.json.gz"
+        data_file.write_bytes(gzip.compress(json.dumps(SAMPLE_SEC_DATA).encode())[:40])
+
+        with patch("sec_company_lookup.utils.utils.DATA_FILE", data_file):
+            assert load_from_cache() == (None, 0)
+
+    @patch("sec_company_lookup.utils.utils._get_session")
     @patch("sec_company_lookup.utils.utils.DATA_FILE")
     def test_download_sec_data_failure_with_cache(
-        self, mock_data_file: Any, mock_get: Any
+        self, mock_data_file: Any, mock_session: Any
     ) -> None:
         """Test SEC data download failure with cache fallback."""
         # Mock the requests module properly
         import requests
 
-        mock_get.side_effect = requests.RequestException("Network error")
+        mock_session.return_value.get.side_effect = requests.RequestException(
+            "Network error"
+        )
 
         # Mock cache file exists and can be read
         mock_data_file.exists.return_value = True
-        with patch("builtins.open", mock_open(read_data=json.dumps(SAMPLE_SEC_DATA))):
+        with patch("gzip.open", mock_open(read_data=json.dumps(SAMPLE_SEC_DATA))):
             result = download_sec_data()
             assert result == SAMPLE_SEC_DATA
 
-    @patch("sec_company_lookup.utils.utils.requests.get")
+    @patch("sec_company_lookup.utils.utils._get_session")
     @patch("sec_company_lookup.utils.utils.DATA_FILE")
     def test_download_sec_data_failure_no_cache(
-        self, mock_data_file: Any, mock_get: Any
+        self, mock_data_file: Any, mock_session: Any
     ) -> None:
         """Test SEC data download failure without cache."""
         # Mock failed HTTP response
-        mock_get.side_effect = Exception("Network error")
+        mock_session.return_value.get.side_effect = Exception("Network error")
 
         # Mock no cache file
         mock_data_file.exists.return_value = False
@@ -143,10 +294,9 @@ class TestUtilityFunctions:
         # Mock file exists and is not expired
         mock_stat = MagicMock()
         mock_stat.st_mtime = time.time() - 1800  # 30 minutes ago
-        mock_data_file.exists.return_value = True
         mock_data_file.stat.return_value = mock_stat
 
-        with patch("builtins.open", mock_open(read_data=json.dumps(SAMPLE_SEC_DATA))):
+        with patch("gzip.open", mock_open(read_data=json.dumps(SAMPLE_SEC_DATA))):
             data, timestamp = load_from_cache()
             assert data == SAMPLE_SEC_DATA
             assert timestamp == mock_stat.st_mtime
@@ -157,34 +307,119 @@ class TestUtilityFunctions:
         # Mock file exists but is expired (25 hours old)
         mock_stat = MagicMock()
         mock_stat.st_mtime = time.time() - (25 * 3600)
-        mock_data_file.exists.return_value = True
         mock_data_file.stat.return_value = mock_stat
 
-        data, timestamp = load_from_cache()
+        with patch("gzip.open") as mock_file:
+            data, timestamp = load_from_cache()
+        # The expired file is never read
+        mock_file.assert_not_called()
         assert data is None
         assert timestamp == 0
 
     @patch("sec_company_lookup.utils.utils.DATA_FILE")
     def test_load_from_cache_no_file(self, mock_data_file: Any) -> None:
         """Test cache loading with no cache file."""
-        mock_data_file.exists.return_value = False
+        mock_data_file.stat.side_effect = FileNotFoundError
 
         data, timestamp = load_from_cache()
         assert data is None
         assert timestamp == 0
 
+    def test_packed_round_trip(self, tmp_path: Any) -> None:
+        """Test columns survive a save/load through the packed file."""
+        path = tmp_path / "company_data.bin"
+        ciks = [320193, 1018724, 1018724]
+        tickers = ["AAPL", "AMZN", "AMZN-P"]
+        names = ["Apple Inc.", "Amazon.com, Inc.", "Société Générale"]
+
+        save_packed(path, ciks, tickers, names)
+        loaded = load_packed(path)
+
+        assert loaded is not None
+        loaded_ciks, loaded_tickers, loaded_names = loaded
+        assert list(loaded_ciks) == ciks
+        assert loaded_tickers == tickers
+        assert loaded_names == names
+
+    def test_packed_empty(self, tmp_path: Any) -> None:
+        """Test an empty directory round-trips through the packed file."""
+        path = tmp_path / "company_data.bin"
+        save_packed(path, [], [], [])
+
+        loaded = load_packed(path)
+
+        assert loaded is not None
+        assert list(loaded[0]) == [] and loaded[1] == [] and loaded[2] == []
+
+    def test_save_packed_to_cache_keeps_data_age(self, tmp_path: Any) -> None:
+        """Test a converted cache keeps the age of the data it was built from."""
+        path = tmp_path / "company_data.bin"
+        last_update = time.time() - 23 * 3600
+
+        with patch("sec_company_lookup.utils.utils.PACKED_FILE", path):
+            with patch("sec_company_lookup.utils.utils.CACHE_DIR", tmp_path):
+                save_packed_to_cache([320193], ["AAPL"], ["Apple Inc."], last_update)
+                columns, timestamp = load_packed_from_cache()
+
+        assert columns is not None
+        assert timestamp == pytest.approx(last_update)
+
+    def test_load_packed_bad_magic(self, tmp_path: Any) -> None:
+        """Test files without the packed header are rejected."""
+        path = tmp_path / "company_data.bin"
+        path.write_bytes(b"not a packed file")
+
+        assert load_packed(path) is None
+
+    @patch("sec_company_lookup.utils.utils.PACKED_FILE")
     @patch("sec_company_lookup.utils.utils.DATA_FILE")
     @patch("sec_company_lookup.db.db.DB_PATH")
-    def test_clear_cache_files(self, mock_db_path: Any, mock_data_file: Any) -> None:
+    def test_clear_cache_files(
+        self, mock_db_path: Any, mock_data_file: Any, mock_packed_file: Any
+    ) -> None:
         """Test cache file clearing."""
         mock_data_file.exists.return_value = True
+        mock_packed_file.exists.return_value = True
         mock_db_path.exists.return_value = True
 
         clear_cache_files()
 
         mock_data_file.unlink.assert_called_once()
+        mock_data_file.with_suffix.assert_any_call("")
+        # The legacy JSON file and an interrupted download's temporary file
+        assert mock_data_file.with_suffix.return_value.unlink.call_count == 2
+        mock_packed_file.unlink.assert_called_once()
         mock_db_path.unlink.assert_called_once()
 
+    def test_clear_cache_files_removes_journal_files(self, tmp_path: Any) -> None:
+        """Test the database and all of its journal side files are removed."""
+        from sec_company_lookup.db.db import (
+            close_db_connections,
+            get_db_connection,
+            init_database,
+        )
+
+        db_path = tmp_path / "companies.db"
+        cache_files = patch.multiple(
+            "sec_company_lookup.utils.utils",
+            DATA_FILE=tmp_path / "data.json.gz",
+            PACKED_FILE=tmp_path / "data.bin",
+        )
+        with patch("sec_company_lookup.db.db.DB_PATH", db_path), cache_files:
+            init_database()
+            (tmp_path / "companies.db-journal").touch()
+            (tmp_path / "data.json.gz.tmp").touch()
+            assert (tmp_path / "companies.db-wal").exists()
+
+            clear_cache_files()
+            assert list(tmp_path.iterdir()) == []
+
+            # A new pooled connection starts from an empty database
+            with get_db_connection(row_factory=False) as conn:
+                tables = conn.execute("SELECT name FROM sqlite_master").fetchall()
+                assert tables == []
+            close_db_connections()
+
 
 if __name__ == "__main__":
     pytest.main([__file__])